@@ -1,12 +1,23 @@
+import argparse
+import functools
+import json
+import re
 import time
 import statistics as stats
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Callable, Dict, List, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
 
+import numpy as np
 import pandas as pd
 from neo4j import GraphDatabase
 import mysql.connector
 
+import insert_generate
+from insert_generate import build_dataset
+from inproc_engine import InprocGraph, INPROC_QUERIES, INPROC_MATERIALIZED
+from embedded_backends import open_embedded, run_query, translate_queries
+from neo4j_cli import FANOUT_QUERIES, fanout_recall as recall_vs_exact
 
 # ---------- CONFIG ----------
 NEO4J_URI = "bolt://localhost:7687"
@@ -22,6 +33,9 @@ MYSQL_DB = "graph_project"
 WARMUP = 8
 RUNS = 30
 
+BFS_MAX_HOPS = 10        # ca shortestPath((a)-[:FRIEND*..10]->(b)) din Cypher
+BFS_IN_CHUNK = 5000      # max id-uri intr-un singur IN (...) - peste asta nivelul se sparge in mai multe query-uri
+
 @dataclass
 class BenchResult:
     db: str
@@ -30,6 +44,15 @@ class BenchResult:
     ms: float
     records: int          # câte rânduri / records
     nodes_returned: int   # câte "noduri" în payload (estimare)
+    uid: int = 0
+    uid2: int = 0
+    param_class: str = ""
+    # timp raportat de server (ms): Neo4j = available_after + consumed_after, MySQL = performance_schema
+    server_ms: float = float("nan")
+    server_first_ms: float = float("nan")   # Neo4j result_available_after (primul record gata)
+    client_ms: float = float("nan")         # ms - server_ms: retea + driver + hidratare recorduri
+    first_row_ms: float = float("nan")      # client: de la trimitere pana la primul rand decodat
+    recall: float = float("nan")            # doar variantele fan-out: recall@10 fata de query-ul exact
 
 
 def time_it(fn: Callable[[], Tuple[int, Any]]) -> Tuple[float, int]:
@@ -40,8 +63,8 @@ def time_it(fn: Callable[[], Tuple[int, Any]]) -> Tuple[float, int]:
     return (t1 - t0) * 1000.0, rows
 
 
-def summarize(df: pd.DataFrame) -> pd.DataFrame:
-    g = df.groupby(["db", "query_id"])
+def summarize(df: pd.DataFrame, by: Tuple[str, ...] = ("db", "query_id")) -> pd.DataFrame:
+    g = df.groupby(list(by))
 
     out = g.agg(
         median_ms=("ms", "median"),
@@ -56,17 +79,25 @@ def summarize(df: pd.DataFrame) -> pd.DataFrame:
         mean_records=("records", "mean"),
         median_nodes_returned=("nodes_returned", "median"),
         mean_nodes_returned=("nodes_returned", "mean"),
+
+        # server vs client
+        median_server_ms=("server_ms", "median"),
+        median_server_first_ms=("server_first_ms", "median"),
+        median_client_ms=("client_ms", "median"),
+        median_first_row_ms=("first_row_ms", "median"),
+        mean_recall=("recall", "mean"),
     ).reset_index()
 
     # NOU: metri utili pt raport
     out["median_ms_per_record"] = out["median_ms"] / out["median_records"].replace(0, pd.NA)
     out["median_ms_per_node"] = out["median_ms"] / out["median_nodes_returned"].replace(0, pd.NA)
+    out["server_share"] = out["median_server_ms"] / out["median_ms"]
 
-    return out.sort_values(["query_id", "db"])
+    return out.sort_values(["query_id"] + [c for c in by if c != "query_id"])
 
 
 # ---------- QUERIES ----------
-# Parametri comuni
+# Parametri comuni (workload-ul "fixed"; celelalte workload-uri esantioneaza uid/uid2)
 params = {"uid": 1, "uid2": 5}
 
 # Neo4j Cypher (corelate cu ce ai in proiect)
@@ -275,21 +306,295 @@ MYSQL_QUERIES: Dict[str, str] = {
     """
 }
 
+# Q4 / Q7 pe datele precalculate la load (UserGenreMask, CoActors / genreMask, :CO_ACTED;
+# vezi insert_generate.py). Cypher nu are AND pe biti -> testam bitii userului unul cate unul.
+NEO4J_MATERIALIZED: Dict[str, str] = {
+    "Q4_GENRE_SIM": """
+    MATCH (u:User {userId: $uid})
+    WITH u, [b IN [i IN range(0, 62) | toInteger(2 ^ i)] WHERE (u.genreMask / b) % 2 = 1] AS myBits
+    MATCH (v:User)
+    WHERE v <> u
+    WITH v, size([b IN myBits WHERE (v.genreMask / b) % 2 = 1]) AS commonGenres
+    WHERE commonGenres > 0
+    RETURN v.userId AS id, v.name AS name, commonGenres
+    ORDER BY commonGenres DESC
+    LIMIT 10
+    """,
+
+    "Q7_COACTORS": """
+    MATCH (p1:Person)-[c:CO_ACTED]->(p2:Person)
+    RETURN p1.name AS actor1, p2.name AS actor2, c.together AS together
+    ORDER BY together DESC, actor1, actor2
+    LIMIT 20
+    """
+}
+
+MYSQL_MATERIALIZED: Dict[str, str] = {
+    "Q4_GENRE_SIM": """
+    SELECT v.userId AS id, v.name, BIT_COUNT(m.genreMask & me.genreMask) AS commonGenres
+    FROM UserGenreMask me
+    JOIN UserGenreMask m ON m.userId <> me.userId AND (m.genreMask & me.genreMask) <> 0
+    JOIN Users v ON v.userId = m.userId
+    WHERE me.userId = %(uid)s
+    ORDER BY commonGenres DESC
+    LIMIT 10;
+    """,
+
+    "Q7_COACTORS": """
+    SELECT p1.name AS actor1, p2.name AS actor2, c.together
+    FROM CoActors c
+    JOIN People p1 ON p1.personId = c.personId1
+    JOIN People p2 ON p2.personId = c.personId2
+    ORDER BY c.together DESC, actor1, actor2
+    LIMIT 20;
+    """
+}
+
+
+# ---------- Q3 / Q6 cu fan-out limitat ----------
+# Q3/Q6 exacte expandeaza toate ratingurile tuturor vecinilor: pe graful powerlaw un hub sau un film
+# popular inseamna zeci de mii de randuri intermediare. Variantele pastreaza cel mult $cap vecini:
+#   topn   - vecinii cu cele mai multe legaturi comune (Q3: prieteni comuni, Q6: filme comune)
+#   sample - cel mult $cap vecini per nod si hop, alesi dupa un hash al userId cu $seed;
+#            aceeasi formula in Cypher si SQL -> acelasi esantion pe ambele baze
+# Rezultatul e aproximativ; recall-ul fata de Q3/Q6 exacte e in coloana recall (fanout_recall).
+FANOUT_CAP = 20
+FANOUT_SEED = 1
+FANOUT_MODES = ("topn", "sample")
+
+# Cypher-ul e definit o singura data, in neo4j_cli.py (parametrizat: $minRating / $minCommon / $limit)
+NEO4J_FANOUT: Dict[str, Dict[str, str]] = FANOUT_QUERIES
+FANOUT_PARAMS = {"minRating": 4.0, "minCommon": 1, "limit": 10}   # aceleasi constante ca Q3/Q6 exacte
+
+# MOD(...) si nu %: un % liber s-ar amesteca cu parametrii %(name)s ai connectorului
+MYSQL_FANOUT: Dict[str, Dict[str, str]] = {
+    "topn": {
+        "Q3_FOF_RECS": """
+        WITH fof AS (
+          SELECT f2.userId2 AS x_id, COUNT(*) AS paths
+          FROM Friends f1
+          JOIN Friends f2 ON f1.userId2 = f2.userId1
+          WHERE f1.userId1 = %(uid)s
+            AND f2.userId2 <> %(uid)s
+          GROUP BY f2.userId2
+          ORDER BY paths DESC, x_id
+          LIMIT %(cap)s
+        )
+        SELECT
+          m.title,
+          m.year,
+          SUM(r.rating * x.paths) / SUM(x.paths) AS score,
+          SUM(x.paths) AS votes
+        FROM fof x
+        JOIN Ratings r ON r.userId = x.x_id
+        JOIN Movies m ON m.movieId = r.movieId
+        LEFT JOIN Ratings my
+          ON my.userId = %(uid)s AND my.movieId = r.movieId
+        WHERE r.rating >= 4
+          AND my.movieId IS NULL
+        GROUP BY m.movieId, m.title, m.year
+        ORDER BY score DESC, votes DESC
+        LIMIT 10;
+        """,
+        "Q6_COLLAB_RECS": """
+        WITH neighbors AS (
+          SELECT r2.userId AS neighbor_id, COUNT(DISTINCT r2.movieId) AS commonCount
+          FROM Ratings r1
+          JOIN Ratings r2 ON r1.movieId = r2.movieId
+          WHERE r1.userId = %(uid)s
+            AND r2.userId <> %(uid)s
+          GROUP BY r2.userId
+          ORDER BY commonCount DESC, neighbor_id
+          LIMIT %(cap)s
+        )
+        SELECT
+          m.title,
+          m.year,
+          AVG(r.rating) AS score,
+          COUNT(*) AS votes
+        FROM neighbors n
+        JOIN Ratings r ON r.userId = n.neighbor_id
+        JOIN Movies m ON m.movieId = r.movieId
+        LEFT JOIN Ratings my
+          ON my.userId = %(uid)s AND my.movieId = r.movieId
+        WHERE r.rating >= 4
+          AND my.movieId IS NULL
+        GROUP BY m.movieId, m.title, m.year
+        ORDER BY score DESC, votes DESC
+        LIMIT 10;
+        """,
+    },
+    "sample": {
+        "Q3_FOF_RECS": """
+        WITH hop1 AS (
+          SELECT f1.userId2 AS friend_id
+          FROM Friends f1
+          WHERE f1.userId1 = %(uid)s
+          ORDER BY MOD((f1.userId2 + %(seed)s) * 2654435761, 4294967291), f1.userId2
+          LIMIT %(cap)s
+        ),
+        hop2 AS (
+          SELECT f2.userId2 AS x_id,
+                 ROW_NUMBER() OVER (
+                   PARTITION BY f2.userId1
+                   ORDER BY MOD((f2.userId2 + %(seed)s) * 2654435761, 4294967291), f2.userId2
+                 ) AS rn
+          FROM hop1 h
+          JOIN Friends f2 ON f2.userId1 = h.friend_id
+          WHERE f2.userId2 <> %(uid)s
+        )
+        SELECT
+          m.title,
+          m.year,
+          AVG(r.rating) AS score,
+          COUNT(*) AS votes
+        FROM hop2 x
+        JOIN Ratings r ON r.userId = x.x_id
+        JOIN Movies m ON m.movieId = r.movieId
+        LEFT JOIN Ratings my
+          ON my.userId = %(uid)s AND my.movieId = r.movieId
+        WHERE x.rn <= %(cap)s
+          AND r.rating >= 4
+          AND my.movieId IS NULL
+        GROUP BY m.movieId, m.title, m.year
+        ORDER BY score DESC, votes DESC
+        LIMIT 10;
+        """,
+        "Q6_COLLAB_RECS": """
+        WITH raters AS (
+          SELECT r2.userId,
+                 ROW_NUMBER() OVER (
+                   PARTITION BY r2.movieId
+                   ORDER BY MOD((r2.userId + %(seed)s) * 2654435761, 4294967291), r2.userId
+                 ) AS rn
+          FROM Ratings r1
+          JOIN Ratings r2 ON r1.movieId = r2.movieId
+          WHERE r1.userId = %(uid)s
+            AND r2.userId <> %(uid)s
+        ),
+        neighbors AS (
+          SELECT DISTINCT userId AS neighbor_id
+          FROM raters
+          WHERE rn <= %(cap)s
+        )
+        SELECT
+          m.title,
+          m.year,
+          AVG(r.rating) AS score,
+          COUNT(*) AS votes
+        FROM neighbors n
+        JOIN Ratings r ON r.userId = n.neighbor_id
+        JOIN Movies m ON m.movieId = r.movieId
+        LEFT JOIN Ratings my
+          ON my.userId = %(uid)s AND my.movieId = r.movieId
+        WHERE r.rating >= 4
+          AND my.movieId IS NULL
+        GROUP BY m.movieId, m.title, m.year
+        ORDER BY score DESC, votes DESC
+        LIMIT 10;
+        """,
+    },
+}
+
+
+# ---------- WORKLOAD: uid/uid2 esantionate ----------
+# Aceeasi secventa (seed fix) pentru toate backend-urile; primele WARMUP intrari sunt pentru warmup.
+WORKLOAD_DIST = "fixed"        # fixed (params, ca rezultatele de baza) | uniform | zipf | degree
+WORKLOAD_SEED = 7
+ZIPF_S = 1.1
+DEGREE_CLASSES = (50, 90)      # percentile: <= p50 low_degree, >= p90 high_degree, restul mid_degree
+BENCH_GENERATOR = "python"     # python | numpy -- acelasi --generator ca la incarcare (--pipeline = numpy)
+
+
+def bench_dataset():
+    # acelasi seed + generator + model de graf ca la incarcare -> exact datele din MySQL/Neo4j
+    return _bench_dataset(BENCH_GENERATOR, insert_generate.GRAPH_MODEL)
+
+
+@functools.lru_cache(maxsize=1)
+def _bench_dataset(generator: str, graph: str):
+    return build_dataset(generator)
+
+
+def user_degrees() -> np.ndarray:
+    data = bench_dataset()
+    src = data.friends.cols[0]
+    return np.bincount(src, minlength=len(data.users) + 1)
+
+
+def make_workload(n: int, dist: str = WORKLOAD_DIST, seed: int = WORKLOAD_SEED) -> List[Dict[str, Any]]:
+    if dist == "fixed":
+        return [dict(params, param_class="fixed") for _ in range(n)]
+
+    deg = user_degrees()
+    users = np.arange(1, deg.size)
+    rng = np.random.default_rng(seed)
+    if dist == "uniform":
+        w = np.ones(users.size)
+    elif dist == "zipf":
+        # rang aleator (seeded) per user, probabilitate ~ 1 / rang^s -> cativa useri "fierbinti"
+        w = 1.0 / (rng.permutation(users.size) + 1.0) ** ZIPF_S
+    elif dist == "degree":
+        w = deg[users].astype(float)
+    else:
+        raise ValueError(f"unknown workload distribution: {dist}")
+    w /= w.sum()
+
+    uid = rng.choice(users, size=n, p=w)
+    uid2 = rng.choice(users, size=n, p=w)
+    same = uid2 == uid
+    uid2[same] = uid[same] % users.size + 1
+
+    low, high = np.percentile(deg[users], DEGREE_CLASSES)
+    out = []
+    for a, b in zip(uid.tolist(), uid2.tolist()):
+        d = deg[a]
+        cls = "high_degree" if d >= high else "low_degree" if d <= low else "mid_degree"
+        out.append({"uid": a, "uid2": b, "param_class": cls})
+    return out
+
+
+def default_workload() -> List[Dict[str, Any]]:
+    return make_workload(WARMUP + RUNS)
+
+
+@functools.lru_cache(maxsize=1)
+def bench_graph() -> InprocGraph:
+    return InprocGraph(bench_dataset())
+
+
+def fanout_recall(qid: str, p: Dict[str, Any], titles: List[str], k: int = 10) -> float:
+    """Recall@k al unei variante fan-out fata de Q3/Q6 exacte, calculate pe graful in-process.
 
-def bench_neo4j() -> List[BenchResult]:
+    ORDER BY score DESC, votes DESC nu are tie-break, deci un titlu e corect daca (score, votes)
+    exacte ale filmului sunt cel putin cele ale celui de-al k-lea rezultat exact.
+    """
+    g = bench_graph()
+    if qid == "Q3_FOF_RECS":
+        exact = g.q3_fof_recs(p["uid"], limit=g.n_movies)
+    else:
+        exact = g.q6_collab_recs(p["uid"], limit=g.n_movies)
+    return recall_vs_exact(titles, exact, k)
+
+
+def bench_neo4j(workload: Optional[List[Dict[str, Any]]] = None,
+                queries: Optional[Dict[str, str]] = None, db: str = "neo4j",
+                recall: Optional[Callable[[str, Dict[str, Any], List[str]], float]] = None) -> List[BenchResult]:
+    workload = workload or default_workload()
+    queries = queries or NEO4J_QUERIES
     results: List[BenchResult] = []
     driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
 
     with driver.session() as session:
-        for qid, cypher in NEO4J_QUERIES.items():
+        for qid, cypher in queries.items():
             # warmup
-            for _ in range(WARMUP):
-                session.run(cypher, params).consume()
+            for p in workload[:WARMUP]:
+                session.run(cypher, p).consume()
 
             # measured
-            for i in range(1, RUNS + 1):
+            for i, p in enumerate(workload[WARMUP:], start=1):
                 def run_once():
-                    res = session.run(cypher, params)
+                    res = session.run(cypher, p)
                     records_list = list(res)   # consumăm
                     summary = res.consume()
 
@@ -303,23 +608,30 @@ def bench_neo4j() -> List[BenchResult]:
                     else:
                         nodes_returned = records_count
 
-                    return records_count, nodes_returned, summary
+                    return records_count, nodes_returned, summary, records_list
 
 
                 t0 = time.perf_counter()
-                records_count, nodes_returned, _ = run_once()
+                records_count, nodes_returned, summary, records_list = run_once()
                 t1 = time.perf_counter()
                 ms = (t1 - t0) * 1000.0
-                results.append(BenchResult("neo4j", qid, i, ms, records_count, nodes_returned))
+                rec = float("nan") if recall is None else recall(qid, p, [r["title"] for r in records_list])
+
+                # ResultSummary: ms pana la primul record + ms pana la consumarea tuturor, pe server
+                first = summary.result_available_after
+                consumed = summary.result_consumed_after
+                server_ms = float("nan") if first is None else float(first + (consumed or 0))
+                results.append(BenchResult(db, qid, i, ms, records_count, nodes_returned,
+                                           p["uid"], p["uid2"], p["param_class"],
+                                           server_ms, float("nan") if first is None else float(first),
+                                           ms - server_ms, recall=rec))
 
     driver.close()
     return results
 
 
-def bench_mysql() -> List[BenchResult]:
-    results: List[BenchResult] = []
-
-    conn = mysql.connector.connect(
+def mysql_connect():
+    return mysql.connector.connect(
         host=MYSQL_HOST,
         port=MYSQL_PORT,
         user=MYSQL_USER,
@@ -328,54 +640,662 @@ def bench_mysql() -> List[BenchResult]:
         autocommit=True,
     )
 
-    cur = conn.cursor(dictionary=True)
-    for qid, sql in MYSQL_QUERIES.items():
-        # warmup
-        for _ in range(WARMUP):
-            cur.execute(sql, params)
+
+class MySQLServerTimer:
+    """Timpul de executie pe server al ultimului statement, din performance_schema.
+
+    Se citeste dupa ce cronometrul s-a oprit; daca performance_schema nu e disponibil
+    (dezactivat / fara drepturi) intoarce NaN.
+    """
+
+    def __init__(self, conn):
+        self.cur = conn.cursor()
+        try:
+            self.cur.execute("SELECT PS_CURRENT_THREAD_ID()")
+            self.thread_id = self.cur.fetchone()[0]
+        except mysql.connector.Error as e:
+            print(f"mysql: performance_schema unavailable ({e}); server_ms = NaN")
+            self.thread_id = None
+
+    def last_ms(self) -> float:
+        if self.thread_id is None:
+            return float("nan")
+        # history = statement-uri terminate; statement-ul asta e inca in events_statements_current
+        self.cur.execute(
+            "SELECT TIMER_WAIT / 1000000000 FROM performance_schema.events_statements_history "
+            "WHERE THREAD_ID = %s ORDER BY EVENT_ID DESC LIMIT 1",
+            (self.thread_id,),
+        )
+        row = self.cur.fetchone()
+        return float("nan") if row is None or row[0] is None else float(row[0])
+
+    def close(self):
+        self.cur.close()
+
+
+# Cursoare MySQL: dict (varianta initiala), randuri tuple, prepared statements (server-side, tuple).
+# Toate sunt nebufferate si citesc primul rand separat -> first_row_ms; diferentele dintre ele
+# separa costul de parsare (prepared) de cel de decodare pe client (dict vs tuple).
+MYSQL_CURSOR_MODES: Dict[str, Dict[str, bool]] = {
+    "dict": {"dictionary": True},
+    "tuple": {},
+    "prepared": {"prepared": True},
+}
+
+
+def positional_sql(sql: str) -> Tuple[str, List[str]]:
+    """%(name)s -> %s (cursorul prepared nu accepta parametri cu nume) + ordinea numelor."""
+    names = re.findall(r"%\((\w+)\)s", sql)
+    return re.sub(r"%\((\w+)\)s", "%s", sql).strip().rstrip(";"), names
+
+
+def bench_mysql(workload: Optional[List[Dict[str, Any]]] = None,
+                queries: Optional[Dict[str, str]] = None, db: str = "mysql",
+                cursor_mode: str = "dict",
+                recall: Optional[Callable[[str, Dict[str, Any], List[str]], float]] = None) -> List[BenchResult]:
+    workload = workload or default_workload()
+    queries = queries or MYSQL_QUERIES
+    results: List[BenchResult] = []
+
+    conn = mysql_connect()
+
+    timer = MySQLServerTimer(conn)
+    prepared = cursor_mode == "prepared"
+    cur = conn.cursor(**MYSQL_CURSOR_MODES[cursor_mode])
+    for qid, sql in queries.items():
+        if prepared:
+            sql, names = positional_sql(sql)
+            args_of = lambda p: tuple(p[n] for n in names)
+        else:
+            args_of = lambda p: p
+
+        # warmup (la prepared: primul execute face si PREPARE, refolosit apoi cat timp SQL-ul e acelasi)
+        for p in workload[:WARMUP]:
+            cur.execute(sql, args_of(p))
             cur.fetchall()
 
         # measured
-        for i in range(1, RUNS + 1):
+        for i, p in enumerate(workload[WARMUP:], start=1):
             def run_once():
-                cur.execute(sql, params)
-                rows = cur.fetchall()
+                cur.execute(sql, args_of(p))
+                first = cur.fetchone()
+                t_first = time.perf_counter()
+                rows = ([] if first is None else [first]) + cur.fetchall()
                 records_count = len(rows)
 
                 if qid == "Q2_SHORTEST" and records_count > 0:
-                    path_str = rows[0].get("path", "")  # ex: "1,2,4,5"
-                    nodes_returned = 0 if not path_str else len(path_str.split(","))
+                    row = rows[0]
+                    path_str = row.get("path", "") if isinstance(row, dict) else row[cur.column_names.index("path")]
+                    if isinstance(path_str, (bytes, bytearray)):
+                        path_str = path_str.decode()
+                    nodes_returned = 0 if not path_str else len(path_str.split(","))  # ex: "1,2,4,5"
                 else:
                     nodes_returned = records_count
 
-                return records_count, nodes_returned
+                return records_count, nodes_returned, t_first, rows
 
 
             t0 = time.perf_counter()
-            records_count, nodes_returned = run_once()
+            records_count, nodes_returned, t_first, rows = run_once()
             t1 = time.perf_counter()
             ms = (t1 - t0) * 1000.0
-            results.append(BenchResult("mysql", qid, i, ms, records_count, nodes_returned))
+            server_ms = timer.last_ms()
+            rec = float("nan") if recall is None else recall(
+                qid, p, [row["title"] if isinstance(row, dict) else row[0] for row in rows])
+            results.append(BenchResult(db, qid, i, ms, records_count, nodes_returned,
+                                       p["uid"], p["uid2"], p["param_class"],
+                                       server_ms, float("nan"), ms - server_ms,
+                                       (t_first - t0) * 1000.0, recall=rec))
+
+    timer.close()
+    cur.close()
+    conn.close()
+    return results
+
+
+# ---------- Q2 in aplicatie: BFS bidirectional peste MySQL ----------
+def _expand_level(cur, frontier: List[int], forward: bool) -> List[Tuple[int, int]]:
+    """Un nivel BFS: (nod_din_frontiera, vecin) printr-un SELECT batch pe Friends."""
+    if forward:
+        sql = "SELECT userId1, userId2 FROM Friends WHERE userId1 IN ({})"
+    else:
+        sql = "SELECT userId2, userId1 FROM Friends WHERE userId2 IN ({})"
+    out: List[Tuple[int, int]] = []
+    for i in range(0, len(frontier), BFS_IN_CHUNK):
+        chunk = frontier[i:i + BFS_IN_CHUNK]
+        cur.execute(sql.format(",".join(["%s"] * len(chunk))), chunk)
+        out.extend(cur.fetchall())
+    return out
+
+
+def mysql_bidirectional_bfs(cur, src: int, dst: int, max_hops: int = BFS_MAX_HOPS) -> Optional[List[int]]:
+    """Shortest path src -> dst pe Friends; extinde mereu frontiera mai mica, se opreste cand se intalnesc."""
+    if src == dst:
+        return [src]
+
+    # nod -> (parinte, distanta) pe fiecare parte
+    seen_f: Dict[int, Tuple[Optional[int], int]] = {src: (None, 0)}
+    seen_b: Dict[int, Tuple[Optional[int], int]] = {dst: (None, 0)}
+    frontier_f, frontier_b = [src], [dst]
+    depth_f = depth_b = 0
+
+    while frontier_f and frontier_b and depth_f + depth_b < max_hops:
+        forward = len(frontier_f) <= len(frontier_b)
+        frontier = frontier_f if forward else frontier_b
+        seen, other = (seen_f, seen_b) if forward else (seen_b, seen_f)
+        depth = (depth_f if forward else depth_b) + 1
+
+        nxt: List[int] = []
+        meet: Optional[int] = None
+        for node, nbr in _expand_level(cur, frontier, forward):
+            if nbr in seen:
+                continue
+            seen[nbr] = (node, depth)
+            nxt.append(nbr)
+            if nbr in other and (meet is None or other[nbr][1] < other[meet][1]):
+                meet = nbr
+
+        if forward:
+            frontier_f, depth_f = nxt, depth
+        else:
+            frontier_b, depth_b = nxt, depth
+
+        if meet is not None:
+            path: List[int] = []
+            node: Optional[int] = meet
+            while node is not None:
+                path.append(node)
+                node = seen_f[node][0]
+            path.reverse()
+            node = seen_b[meet][0]
+            while node is not None:
+                path.append(node)
+                node = seen_b[node][0]
+            return path
+
+    return None
+
+
+def bench_mysql_bfs(workload: Optional[List[Dict[str, Any]]] = None) -> List[BenchResult]:
+    """Q2_SHORTEST cu BFS bidirectional in Python (cate un SELECT batch pe nivel) - varianta `mysql_bfs`."""
+    workload = workload or default_workload()
+    results: List[BenchResult] = []
+    qid = "Q2_SHORTEST"
+
+    conn = mysql_connect()
+    cur = conn.cursor()
+
+    for p in workload[:WARMUP]:
+        mysql_bidirectional_bfs(cur, p["uid"], p["uid2"])
+
+    for i, p in enumerate(workload[WARMUP:], start=1):
+        t0 = time.perf_counter()
+        path = mysql_bidirectional_bfs(cur, p["uid"], p["uid2"])
+        t1 = time.perf_counter()
+        ms = (t1 - t0) * 1000.0
+
+        records_count = 0 if path is None else 1
+        nodes_returned = 0 if path is None else len(path)
+        results.append(BenchResult("mysql_bfs", qid, i, ms, records_count, nodes_returned,
+                                   p["uid"], p["uid2"], p["param_class"]))
 
     cur.close()
     conn.close()
     return results
 
 
+def bench_inproc(workload: Optional[List[Dict[str, Any]]] = None,
+                 queries: Optional[Dict[str, Callable]] = None, db: str = "inproc") -> List[BenchResult]:
+    """Acelasi workload pe graful CSR in-memory (fara retea / driver) - baseline pt overhead-ul DB."""
+    workload = workload or default_workload()
+    queries = queries or INPROC_QUERIES
+    results: List[BenchResult] = []
+
+    t0 = time.perf_counter()
+    graph = InprocGraph(bench_dataset())
+    print(f"{db}: graph built in {(time.perf_counter() - t0):.2f}s")
+
+    for qid, fn in queries.items():
+        # warmup
+        for p in workload[:WARMUP]:
+            fn(graph, p)
+
+        # measured
+        for i, p in enumerate(workload[WARMUP:], start=1):
+            t0 = time.perf_counter()
+            rows = fn(graph, p)
+            t1 = time.perf_counter()
+            ms = (t1 - t0) * 1000.0
+
+            records_count = len(rows)
+            if qid == "Q2_SHORTEST" and records_count > 0:
+                nodes_returned = len(rows[0]["path"])
+            else:
+                nodes_returned = records_count
+            results.append(BenchResult(db, qid, i, ms, records_count, nodes_returned,
+                                       p["uid"], p["uid2"], p["param_class"]))
+
+    return results
+
+
+def bench_embedded(kind: str, workload: Optional[List[Dict[str, Any]]] = None,
+                   queries: Optional[Dict[str, str]] = None, db: Optional[str] = None,
+                   recall: Optional[Callable[[str, Dict[str, Any], List[str]], float]] = None) -> List[BenchResult]:
+    """MYSQL_QUERIES traduse, pe DuckDB / SQLite in memorie (create.sql + acelasi dataset), fara server."""
+    workload = workload or default_workload()
+    queries = queries or MYSQL_QUERIES
+    db = db or kind
+    results: List[BenchResult] = []
+
+    t0 = time.perf_counter()
+    conn = open_embedded(kind, bench_dataset())
+    print(f"{kind}: loaded in {(time.perf_counter() - t0):.2f}s")
+
+    for qid, sql in translate_queries(queries, kind).items():
+        # warmup
+        for p in workload[:WARMUP]:
+            run_query(conn, sql, p)
+
+        # measured
+        for i, p in enumerate(workload[WARMUP:], start=1):
+            t0 = time.perf_counter()
+            rows = run_query(conn, sql, p)
+            t1 = time.perf_counter()
+            ms = (t1 - t0) * 1000.0
+
+            records_count = len(rows)
+            if qid == "Q2_SHORTEST" and records_count > 0:
+                nodes_returned = len(rows[0][2].split(","))
+            else:
+                nodes_returned = records_count
+            rec = float("nan") if recall is None else recall(qid, p, [row[0] for row in rows])
+            results.append(BenchResult(db, qid, i, ms, records_count, nodes_returned,
+                                       p["uid"], p["uid2"], p["param_class"], recall=rec))
+
+    conn.close()
+    return results
+
+
+# ---------- PLANURI: PROFILE (Cypher) / EXPLAIN ANALYZE (SQL) ----------
+PLANS_FILE = "benchmark_plans.json"
+
+_MYSQL_ACTUAL = re.compile(r"actual time=[\d.]+\.\.[\d.]+ rows=([\d.e+]+) loops=(\d+)")
+_MYSQL_USING = re.compile(r"\busing (\w+)")
+
+
+def _walk_profile(node: Dict[str, Any]):
+    yield node
+    for child in node.get("children", []):
+        yield from _walk_profile(child)
+
+
+def neo4j_plan_stats(profile: Dict[str, Any]) -> Dict[str, Any]:
+    nodes = list(_walk_profile(profile))
+    ops = [n.get("operatorType", "").split("@")[0] for n in nodes]
+    # la operatorii de index, "Details" contine indexul folosit (ex. "UNIQUE u:User(userId) WHERE ...")
+    indexes = {
+        str(n.get("args", {}).get("Details", "")).split(" WHERE ")[0]
+        for n, op in zip(nodes, ops) if "Index" in op
+    }
+    return {
+        "plan_db_hits": sum(n.get("dbHits", 0) for n in nodes),
+        "plan_rows_examined": sum(n.get("rows", 0) for n in nodes),
+        "plan_operators": ";".join(sorted(set(ops))),
+        "plan_index_used": bool(indexes),
+        "plan_indexes": ";".join(sorted(indexes)),
+    }
+
+
+def mysql_plan_stats(tree: str) -> Dict[str, Any]:
+    """Din textul EXPLAIN ANALYZE (FORMAT=TREE): operatori, randuri examinate (rows*loops), indexuri."""
+    ops, rows, indexes = set(), 0.0, set()
+    for line in tree.splitlines():
+        line = line.strip()
+        if not line.startswith("->"):
+            continue
+        head = re.split(r"[(:]", line[2:], maxsplit=1)[0].strip()
+        ops.add(re.split(r" on | using ", head, maxsplit=1)[0].strip())
+        m = _MYSQL_ACTUAL.search(line)
+        if m:
+            rows += float(m.group(1)) * int(m.group(2))
+        indexes.update(i for i in _MYSQL_USING.findall(head) if i != "temporary")
+    return {
+        "plan_db_hits": float("nan"),
+        "plan_rows_examined": rows,
+        "plan_operators": ";".join(sorted(ops)),
+        "plan_index_used": bool(indexes) or any("index" in op.lower() for op in ops),
+        "plan_indexes": ";".join(sorted(indexes)),
+    }
+
+
+def capture_plans(workload: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], pd.DataFrame]:
+    """Ruleaza o data PROFILE / EXPLAIN ANALYZE per query (cu primii parametri masurati)."""
+    p = workload[WARMUP] if len(workload) > WARMUP else workload[0]
+    plans: Dict[str, Any] = {"params": p, "neo4j": {}, "mysql": {}}
+    rows: List[Dict[str, Any]] = []
+
+    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
+    with driver.session() as session:
+        for qid, cypher in NEO4J_QUERIES.items():
+            summary = session.run("PROFILE " + cypher, p).consume()
+            profile = summary.profile or {}
+            plans["neo4j"][qid] = profile
+            rows.append({"db": "neo4j", "query_id": qid, **neo4j_plan_stats(profile)})
+    driver.close()
+
+    conn = mysql_connect()
+    cur = conn.cursor()
+    for qid, sql in MYSQL_QUERIES.items():
+        cur.execute("EXPLAIN ANALYZE " + sql.strip(), p)
+        tree = cur.fetchall()[0][0]
+        cur.execute("EXPLAIN FORMAT=JSON " + sql.strip(), p)
+        estimated = json.loads(cur.fetchall()[0][0])
+        plans["mysql"][qid] = {"analyze": tree, "explain": estimated}
+        rows.append({"db": "mysql", "query_id": qid, **mysql_plan_stats(tree)})
+    cur.close()
+    conn.close()
+
+    with open(PLANS_FILE, "w", encoding="utf-8") as f:
+        json.dump(plans, f, indent=2, default=str)
+    return plans, pd.DataFrame(rows)
+
+
+# ---------- LOAD: N clienti concurenti (throughput + latenta) ----------
+LOAD_CLIENTS = [1, 2, 4, 8, 16]
+LOAD_DURATION_S = 10.0
+LOAD_SATURATION_GAIN = 1.10   # sub +10% QPS la dublarea clientilor => saturat
+LOAD_WORKLOAD_SIZE = 10_000
+LOAD_BACKENDS = ("neo4j", "mysql")   # --load are clienti doar pentru serverele reale
+
+
+class Neo4jClient:
+    """O sesiune per worker (driver-ul e thread-safe, sesiunile nu)."""
+
+    def __init__(self, driver):
+        self.session = driver.session()
+
+    def run(self, qid: str, p: Dict[str, Any]) -> int:
+        return len(list(self.session.run(NEO4J_QUERIES[qid], p)))
+
+    def close(self):
+        self.session.close()
+
+
+class MySQLClient:
+    """O conexiune per worker."""
+
+    def __init__(self):
+        self.conn = mysql_connect()
+        self.cur = self.conn.cursor()
+
+    def run(self, qid: str, p: Dict[str, Any]) -> int:
+        self.cur.execute(MYSQL_QUERIES[qid], p)
+        return len(self.cur.fetchall())
+
+    def close(self):
+        self.cur.close()
+        self.conn.close()
+
+
+def _load_worker(client, qid: str, workload: List[Dict[str, Any]], first: int,
+                 t0: float, duration: float, interval: float, offset: float):
+    """Closed-loop daca interval == 0, altfel open-loop la 1/interval QPS.
+
+    In open-loop latenta se masoara de la momentul planificat, nu de la trimitere,
+    ca intarzierile acumulate (coordinated omission) sa apara in p99.
+    """
+    lats: List[float] = []
+    errors = 0
+    stop = t0 + duration
+    next_t = t0 + offset
+    k = first
+    while True:
+        now = time.perf_counter()
+        if interval:
+            if next_t >= stop:
+                break
+            if next_t > now:
+                time.sleep(next_t - now)
+            start = next_t
+            next_t += interval
+        else:
+            if now >= stop:
+                break
+            start = now
+        p = workload[k % len(workload)]
+        k += 1
+        try:
+            client.run(qid, p)
+        except Exception:
+            errors += 1
+            continue
+        lats.append((time.perf_counter() - start) * 1000.0)
+    return lats, errors
+
+
+def _pct(lats: List[float], p: int) -> float:
+    if not lats:
+        return float("nan")
+    if len(lats) < 2:
+        return lats[0]
+    return stats.quantiles(lats, n=100, method="inclusive")[p - 1]
+
+
+def run_load(db: str, make_client: Callable[[], Any], qid: str, clients: int,
+             duration: float = LOAD_DURATION_S, rate: float = 0.0,
+             workload: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    workload = workload or [dict(params, param_class="fixed")]
+    # conexiunile se deschid inainte de start, ca setup-ul sa nu intre in masuratoare
+    pool = [make_client() for _ in range(clients)]
+    interval = clients / rate if rate else 0.0
+    for c in pool:
+        c.run(qid, workload[0])   # warmup per conexiune
+
+    t0 = time.perf_counter() + 0.05
+    with ThreadPoolExecutor(max_workers=clients) as ex:
+        futures = [
+            # fiecare client porneste din alt punct al aceleiasi secvente
+            ex.submit(_load_worker, c, qid, workload, i * len(workload) // clients,
+                      t0, duration, interval, i * interval / clients)
+            for i, c in enumerate(pool)
+        ]
+        parts = [f.result() for f in futures]
+    for c in pool:
+        c.close()
+
+    lats = [x for part, _ in parts for x in part]
+    errors = sum(e for _, e in parts)
+    return {
+        "db": db,
+        "query_id": qid,
+        "clients": clients,
+        "target_qps": rate or None,
+        "duration_s": duration,
+        "requests": len(lats),
+        "errors": errors,
+        "qps": len(lats) / duration,
+        "mean_ms": stats.fmean(lats) if lats else float("nan"),
+        "p50_ms": _pct(lats, 50),
+        "p95_ms": _pct(lats, 95),
+        "p99_ms": _pct(lats, 99),
+    }
+
+
+def mark_saturation(df: pd.DataFrame) -> pd.DataFrame:
+    """saturated = primul nivel de clienti la care QPS nu mai creste cu LOAD_SATURATION_GAIN."""
+    df = df.sort_values(["db", "query_id", "clients"]).copy()
+    prev = df.groupby(["db", "query_id"])["qps"].shift(1)
+    df["qps_gain"] = df["qps"] / prev
+    df["saturated"] = df["qps_gain"] < LOAD_SATURATION_GAIN
+    return df
+
+
+def bench_load(backends: List[str], clients_list: List[int], duration: float, rate: float,
+               queries: Optional[List[str]] = None,
+               workload: Optional[List[Dict[str, Any]]] = None) -> pd.DataFrame:
+    rows: List[Dict[str, Any]] = []
+    driver = None
+    factories: Dict[str, Callable[[], Any]] = {}
+    if "neo4j" in backends:
+        driver = GraphDatabase.driver(
+            NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS), max_connection_pool_size=max(clients_list) + 4
+        )
+        factories["neo4j"] = lambda: Neo4jClient(driver)
+    if "mysql" in backends:
+        factories["mysql"] = MySQLClient
+
+    for db, make_client in factories.items():
+        for qid in queries or list(NEO4J_QUERIES):
+            for n in clients_list:
+                r = run_load(db, make_client, qid, n, duration, rate, workload)
+                print(f"{db:6} {qid:15} clients={n:3} qps={r['qps']:9.1f} "
+                      f"p50={r['p50_ms']:8.2f} p95={r['p95_ms']:8.2f} p99={r['p99_ms']:8.2f} ms"
+                      + (f" errors={r['errors']}" if r["errors"] else ""))
+                rows.append(r)
+
+    if driver is not None:
+        driver.close()
+    return mark_saturation(pd.DataFrame(rows))
+
+
+# backend -> functie de benchmark (ordinea = ordinea din benchmark_runs.csv)
+BENCH_BACKENDS: Dict[str, Callable[[List[Dict[str, Any]]], List[BenchResult]]] = {
+    "neo4j": lambda w: bench_neo4j(w),
+    "mysql": lambda w: bench_mysql(w),
+    "neo4j_mat": lambda w: bench_neo4j(w, NEO4J_MATERIALIZED, "neo4j_mat"),
+    "mysql_tuple": lambda w: bench_mysql(w, db="mysql_tuple", cursor_mode="tuple"),
+    "mysql_prep": lambda w: bench_mysql(w, db="mysql_prep", cursor_mode="prepared"),
+    "mysql_mat": lambda w: bench_mysql(w, MYSQL_MATERIALIZED, "mysql_mat"),
+    "mysql_bfs": lambda w: bench_mysql_bfs(w),
+    "inproc": lambda w: bench_inproc(w),
+    "inproc_mat": lambda w: bench_inproc(w, INPROC_MATERIALIZED, "inproc_mat"),
+    "duckdb": lambda w: bench_embedded("duckdb", w),
+    "sqlite": lambda w: bench_embedded("sqlite", w),
+    # Q3/Q6 cu fan-out limitat (--fanout); recall fata de rezultatul exact
+    "neo4j_topn": lambda w: bench_neo4j(w, NEO4J_FANOUT["topn"], "neo4j_topn", fanout_recall),
+    "neo4j_sample": lambda w: bench_neo4j(w, NEO4J_FANOUT["sample"], "neo4j_sample", fanout_recall),
+    "mysql_topn": lambda w: bench_mysql(w, MYSQL_FANOUT["topn"], "mysql_topn", recall=fanout_recall),
+    "mysql_sample": lambda w: bench_mysql(w, MYSQL_FANOUT["sample"], "mysql_sample", recall=fanout_recall),
+    "duckdb_topn": lambda w: bench_embedded("duckdb", w, MYSQL_FANOUT["topn"], "duckdb_topn", fanout_recall),
+    "duckdb_sample": lambda w: bench_embedded("duckdb", w, MYSQL_FANOUT["sample"], "duckdb_sample", fanout_recall),
+    "sqlite_topn": lambda w: bench_embedded("sqlite", w, MYSQL_FANOUT["topn"], "sqlite_topn", fanout_recall),
+    "sqlite_sample": lambda w: bench_embedded("sqlite", w, MYSQL_FANOUT["sample"], "sqlite_sample", fanout_recall),
+}
+FANOUT_BASES = ("neo4j", "mysql", "duckdb", "sqlite")
+DEFAULT_BACKENDS = ("neo4j", "mysql")   # restul sunt opt-in prin --backends
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Benchmark Q1-Q7 on Neo4j, MySQL and the in-process engine.")
+    ap.add_argument("--load", action="store_true",
+                    help="mod throughput: N clienti concurenti in loc de latenta single-client")
+    ap.add_argument("--backends", default="",
+                    help="subset separat prin virgula; latenta: " + ",".join(BENCH_BACKENDS)
+                         + " (implicit " + ",".join(DEFAULT_BACKENDS) + "); --load: " + ",".join(LOAD_BACKENDS) + " (implicit ambele)")
+    ap.add_argument("--clients", default=",".join(map(str, LOAD_CLIENTS)), help="ex. 1,2,4,8,16")
+    ap.add_argument("--duration", type=float, default=LOAD_DURATION_S, help="secunde per (query, clienti)")
+    ap.add_argument("--rate", type=float, default=0.0, help="QPS tinta total (open-loop); 0 = closed-loop")
+    ap.add_argument("--queries", default="", help="subset de query_id separate prin virgula")
+    ap.add_argument("--workload", choices=["fixed", "uniform", "zipf", "degree"], default=WORKLOAD_DIST,
+                    help="distributia uid/uid2: fixed (implicit) = uid=1/uid2=5, comparabil cu rezultatele de baza")
+    ap.add_argument("--seed", type=int, default=WORKLOAD_SEED)
+    ap.add_argument("--graph", choices=["uniform", "powerlaw"], default=insert_generate.GRAPH_MODEL,
+                    help="acelasi --graph ca la insert_generate.py (datasetul pentru inproc / duckdb / sqlite / workload)")
+    ap.add_argument("--generator", choices=["python", "numpy"], default=BENCH_GENERATOR,
+                    help="acelasi --generator ca la insert_generate.py; dupa --pipeline foloseste numpy")
+    ap.add_argument("--no-plans", action="store_true", help="nu rula PROFILE / EXPLAIN ANALYZE")
+    ap.add_argument("--fanout", choices=("exact",) + FANOUT_MODES, default="exact",
+                    help="adauga Q3/Q6 cu fan-out limitat langa neo4j/mysql/duckdb/sqlite selectate (<db>_<mod>)")
+    ap.add_argument("--fanout-cap", type=int, default=FANOUT_CAP, help="max vecini pastrati per hop")
+    ap.add_argument("--fanout-seed", type=int, default=FANOUT_SEED, help="seed-ul esantionului (--fanout sample)")
+    return ap.parse_args()
+
+
+def main_load(args):
+    backends = [b for b in args.backends.split(",") if b] or list(LOAD_BACKENDS)
+    unsupported = [b for b in backends if b not in LOAD_BACKENDS]
+    if unsupported:
+        raise SystemExit(f"--load supports only {','.join(LOAD_BACKENDS)}, not: {','.join(unsupported)}")
+    df = bench_load(
+        backends=backends,
+        clients_list=[int(c) for c in args.clients.split(",") if c],
+        duration=args.duration,
+        rate=args.rate,
+        queries=[q for q in args.queries.split(",") if q] or None,
+        workload=make_workload(LOAD_WORKLOAD_SIZE, args.workload, args.seed),
+    )
+    df.to_csv("benchmark_load.csv", index=False)
+
+    print("\n=== LOAD (throughput / latency) ===")
+    print(df.to_string(index=False))
+    sat = df[df["saturated"]].groupby(["db", "query_id"])["clients"].min()
+    for (db, qid), n in sat.items():
+        print(f"{db} {qid}: saturates at ~{n} clients")
+    print("\nSaved: benchmark_load.csv")
+
+
 def main():
+    args = parse_args()
+    global BENCH_GENERATOR
+    insert_generate.GRAPH_MODEL = args.graph
+    BENCH_GENERATOR = args.generator
+    if args.load:
+        main_load(args)
+        return
+
+    # aceeasi secventa de parametri pentru toate backend-urile ($cap / $seed / FANOUT_PARAMS doar pentru variantele fan-out)
+    workload = [dict(p, cap=args.fanout_cap, seed=args.fanout_seed, **FANOUT_PARAMS)
+                for p in make_workload(WARMUP + RUNS, args.workload, args.seed)]
+
+    backends = [b for b in args.backends.split(",") if b] or list(DEFAULT_BACKENDS)
+    unknown = [b for b in backends if b not in BENCH_BACKENDS]
+    if unknown:
+        raise SystemExit(f"unknown backends: {','.join(unknown)} (choose from {','.join(BENCH_BACKENDS)})")
+    if args.fanout != "exact":
+        backends += [f"{b}_{args.fanout}" for b in FANOUT_BASES
+                     if b in backends and f"{b}_{args.fanout}" not in backends]
+
+    # un backend care pica (server oprit, dependinta lipsa) nu le pierde pe celelalte:
+    # benchmark_runs.csv e rescris dupa fiecare backend
     all_results: List[BenchResult] = []
-    all_results.extend(bench_neo4j())
-    all_results.extend(bench_mysql())
+    done, failed = [], []
+    for name in backends:
+        try:
+            all_results.extend(BENCH_BACKENDS[name](workload))
+        except Exception as e:
+            print(f"{name}: FAILED ({type(e).__name__}: {e})")
+            failed.append(name)
+            continue
+        done.append(name)
+        pd.DataFrame([r.__dict__ for r in all_results]).to_csv("benchmark_runs.csv", index=False)
+    if not all_results:
+        raise SystemExit(f"all backends failed: {','.join(failed)}")
 
     df = pd.DataFrame([r.__dict__ for r in all_results])
-    df.to_csv("benchmark_runs.csv", index=False)
 
     summary = summarize(df)
+    # planurile cer ambele servere (PROFILE + EXPLAIN ANALYZE)
+    plans = not args.no_plans and {"neo4j", "mysql"} <= set(done)
+    if plans:
+        _, plan_df = capture_plans(workload)
+        summary = summary.merge(plan_df, on=["db", "query_id"], how="left")
     summary.to_csv("benchmark_summary.csv", index=False)
 
-    print("\n=== SUMMARY (ms) ===")
+    by_class = summarize(df, by=("db", "query_id", "param_class"))
+    by_class.to_csv("benchmark_summary_by_class.csv", index=False)
+
+    print(f"\n=== SUMMARY (ms) - workload={args.workload} ===")
     print(summary.to_string(index=False))
-    print("\nSaved: benchmark_runs.csv, benchmark_summary.csv")
+    if summary["mean_recall"].notna().any():
+        fan = summary[summary["query_id"].isin(["Q3_FOF_RECS", "Q6_COLLAB_RECS"])]
+        print(f"\n=== FAN-OUT Q3/Q6 (cap={args.fanout_cap}, seed={args.fanout_seed}): median ms / recall@10 ===")
+        print(fan[["query_id", "db", "median_ms", "p95_ms", "mean_recall"]].to_string(index=False))
+    print("\n=== MEDIAN ms BY PARAM CLASS ===")
+    print(by_class.pivot_table(index=["query_id", "param_class"], columns="db", values="median_ms").to_string())
+    print("\nSaved: benchmark_runs.csv, benchmark_summary.csv, benchmark_summary_by_class.csv"
+          + (f", {PLANS_FILE}" if plans else ""))
+    if failed:
+        print(f"Failed backends (not in the results): {','.join(failed)}")
 
 
 if __name__ == "__main__":
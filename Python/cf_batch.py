@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import argparse
+import functools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from neo4j import GraphDatabase
+
+import insert_generate
+from insert_generate import (
+    BATCH, NEO4J_PASS, NEO4J_URI, NEO4J_USER,
+    build_dataset, chunked, mysql_connect, mysql_ensure_derived_tables, neo4j_bump_data_version,
+)
+from inproc_engine import InprocGraph, top_k
+
+
+# ----------------------------
+# CONFIG
+# ----------------------------
+CF_TOP_K = 10             # LIMIT-ul din Q5 / Q6
+CF_MIN_RATING = 4.0       # r.rating >= 4 din Q6
+CF_BLOCK = 1024           # useri per bloc de produs rar
+CF_WORKERS = os.cpu_count() or 1
+
+
+# ----------------------------
+# MATRICE
+# ----------------------------
+@dataclass
+class RatingsMatrix:
+    rated: sp.csr_matrix      # user x movie, 1 unde exista rating
+    rated_t: sp.csr_matrix    # movie x user
+    liked: sp.csr_matrix      # user x movie, ratingul unde rating >= CF_MIN_RATING
+    liked_bin: sp.csr_matrix  # user x movie, 1 unde rating >= CF_MIN_RATING
+
+    @property
+    def n_users(self) -> int:
+        return self.rated.shape[0]
+
+
+def build_matrix(user: np.ndarray, movie: np.ndarray, rating: np.ndarray) -> RatingsMatrix:
+    shape = (int(user.max()) + 1, int(movie.max()) + 1)
+    rated = sp.csr_matrix((np.ones(user.size, dtype=np.int32), (user, movie)), shape=shape)
+    hi = rating >= CF_MIN_RATING
+    liked = sp.csr_matrix((rating[hi].astype(np.float64), (user[hi], movie[hi])), shape=shape)
+    liked_bin = sp.csr_matrix((np.ones(int(hi.sum()), dtype=np.float32), (user[hi], movie[hi])), shape=shape)
+    return RatingsMatrix(rated, rated.T.tocsr(), liked, liked_bin)
+
+
+def ratings_from_mysql() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    conn = mysql_connect()
+    cur = conn.cursor()
+    cur.execute("SELECT userId, movieId, rating FROM Ratings")
+    rows = np.array(cur.fetchall(), dtype=np.float64).reshape(-1, 3)
+    cur.close()
+    conn.close()
+    return rows[:, 0].astype(np.int64), rows[:, 1].astype(np.int64), rows[:, 2]
+
+
+@functools.lru_cache(maxsize=1)
+def cf_dataset(generator: str, graph: str, seed: int):
+    # aceleasi --generator / --graph ca la incarcare -> aceleasi date ca in MySQL/Neo4j
+    insert_generate.GRAPH_MODEL = graph
+    return build_dataset(generator, seed)
+
+
+def ratings_from_dataset(generator: str, graph: str, seed: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    user, movie, rating = cf_dataset(generator, graph, seed).ratings.cols
+    return user.astype(np.int64), movie.astype(np.int64), rating.astype(np.float64)
+
+
+# ----------------------------
+# SCORING (un bloc de useri)
+# ----------------------------
+_M: Optional[RatingsMatrix] = None
+
+
+def _init_worker(m: RatingsMatrix):
+    global _M
+    _M = m
+
+
+def score_block(users: np.ndarray, k: int = CF_TOP_K):
+    """Q5 + Q6 pentru un bloc de useri, cu produse de matrici rare.
+
+    co = R[B] @ R^T da filmele comune cu fiecare user (Q5); vecinii (co > 0) inmultiti cu
+    matricea de ratinguri >= 4 dau votes / suma ratingurilor per film (Q6). Totul ramane rar:
+    un user are cateva sute de vecini, nu N_USERS.
+    Intoarce (similar, recs) ca liste de tupluri gata de insert.
+    """
+    m = _M
+    block = m.rated[users]
+    co = (block @ m.rated_t).tocsr()
+    row = np.repeat(np.arange(users.size), np.diff(co.indptr))
+    co.data[co.indices == users[row]] = 0          # v <> u
+    co.eliminate_zeros()
+    co.sort_indices()
+
+    neighbors = co.astype(bool).astype(np.float32)
+    votes = (neighbors @ m.liked_bin).tocsr()
+    total = (neighbors.astype(np.float64) @ m.liked).tocsr()
+    votes.sort_indices()
+    total.sort_indices()   # acelasi pattern ca votes (ratinguri > 0, fara anulari)
+
+    similar: List[Tuple[int, int, int]] = []
+    recs: List[Tuple[int, int, float, int]] = []
+    for i, u in enumerate(users):
+        lo, hi = co.indptr[i], co.indptr[i + 1]
+        cand, common = co.indices[lo:hi], co.data[lo:hi]
+        for j in top_k(cand, common, k):
+            similar.append((int(u), int(cand[j]), int(common[j])))
+
+        lo, hi = votes.indptr[i], votes.indptr[i + 1]
+        cand = votes.indices[lo:hi]
+        n = votes.data[lo:hi].astype(np.int64)
+        score = total.data[lo:hi] / n
+        keep = ~np.isin(cand, block.indices[block.indptr[i]:block.indptr[i + 1]])   # fara filmele deja evaluate
+        cand, n, score = cand[keep], n[keep], score[keep]
+        # ORDER BY score DESC, votes DESC (id ca tie-break, ca in inproc_engine)
+        for j in np.lexsort((cand, -n, -score))[:k]:
+            recs.append((int(u), int(cand[j]), float(score[j]), int(n[j])))
+    return similar, recs
+
+
+def run_job(m: RatingsMatrix, workers: int = CF_WORKERS, block: int = CF_BLOCK):
+    blocks = [np.arange(s, min(s + block, m.n_users)) for s in range(0, m.n_users, block)]
+    similar: List[Tuple[int, int, int]] = []
+    recs: List[Tuple[int, int, float, int]] = []
+    if workers <= 1:
+        _init_worker(m)
+        parts = list(map(score_block, blocks))
+    else:
+        # procese, nu thread-uri: produsele scipy.sparse tin GIL-ul
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(m,)) as ex:
+            parts = list(ex.map(score_block, blocks))
+    for s, r in parts:
+        similar.extend(s)
+        recs.extend(r)
+    return similar, recs
+
+
+# ----------------------------
+# OUTPUT
+# ----------------------------
+def write_mysql(similar, recs):
+    conn = mysql_connect()
+    cur = conn.cursor()
+    mysql_ensure_derived_tables(cur)
+    cur.execute("TRUNCATE TABLE SimilarUsers")
+    cur.execute("TRUNCATE TABLE Recommendations")
+    for batch in chunked(similar, BATCH):
+        cur.executemany("INSERT INTO SimilarUsers(userId, otherId, common) VALUES(%s,%s,%s)", batch)
+    for batch in chunked(recs, BATCH):
+        cur.executemany("INSERT INTO Recommendations(userId, movieId, score, votes) VALUES(%s,%s,%s,%s)", batch)
+    conn.commit()
+    cur.close()
+    conn.close()
+
+
+def write_neo4j(similar, recs):
+    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
+    with driver.session() as s:
+        s.run("""
+        MATCH ()-[r:SIMILAR_TO|RECOMMENDED]->()
+        CALL { WITH r DELETE r } IN TRANSACTIONS OF 10000 ROWS
+        """).consume()
+        for batch in chunked(similar, BATCH):
+            s.run("""
+            UNWIND $rows AS r
+            MATCH (u:User {userId: r[0]}), (v:User {userId: r[1]})
+            CREATE (u)-[:SIMILAR_TO {common: r[2]}]->(v)
+            """, rows=batch).consume()
+        for batch in chunked(recs, BATCH):
+            s.run("""
+            UNWIND $rows AS r
+            MATCH (u:User {userId: r[0]}), (m:Movie {movieId: r[1]})
+            CREATE (u)-[:RECOMMENDED {score: r[2], votes: r[3]}]->(m)
+            """, rows=batch).consume()
+        neo4j_bump_data_version(s)
+    driver.close()
+
+
+# ----------------------------
+# VERIFICARE vs query-urile curente
+# ----------------------------
+def check_against_inproc(similar, recs, generator: str, graph_model: str, seed: int, n: int) -> int:
+    """Compara n useri cu INPROC Q5/Q6 (aceleasi rezultate ca SQL/Cypher, cu tie-break pe id)."""
+    graph = InprocGraph(cf_dataset(generator, graph_model, seed))
+    by_user_sim: Dict[int, List[Tuple[int, int]]] = {}
+    for u, v, c in similar:
+        by_user_sim.setdefault(u, []).append((v, c))
+    by_user_rec: Dict[int, List[Tuple[str, int]]] = {}
+    for u, mid, _score, votes in recs:
+        by_user_rec.setdefault(u, []).append((graph.movie_title[mid], votes))
+
+    rng = np.random.default_rng(seed)
+    bad = 0
+    for u in rng.choice(graph.n_users, size=min(n, graph.n_users), replace=False):
+        u = int(u)
+        q5 = [(r["id"], r["common"]) for r in graph.q5_movie_sim(u, limit=CF_TOP_K)]
+        q6 = [(r["title"], r["votes"]) for r in graph.q6_collab_recs(u, min_rating=CF_MIN_RATING, limit=CF_TOP_K)]
+        if q5 != by_user_sim.get(u, []) or q6 != by_user_rec.get(u, []):
+            bad += 1
+            print(f"cf_batch: mismatch for user {u}")
+    return bad
+
+
+# ----------------------------
+# MAIN
+# ----------------------------
+def parse_args():
+    ap = argparse.ArgumentParser(description="Offline Q5/Q6 (similar users + recommendations) for all users.")
+    ap.add_argument("--source", choices=["mysql", "generate"], default="mysql",
+                    help="read Ratings from MySQL or regenerate the seeded dataset")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--generator", choices=["python", "numpy"], default="python",
+                    help="same --generator as insert_generate.py (--source generate / --check)")
+    ap.add_argument("--graph", choices=["uniform", "powerlaw"], default=insert_generate.GRAPH_MODEL,
+                    help="same --graph as insert_generate.py (--source generate / --check)")
+    ap.add_argument("--write", choices=["mysql", "neo4j", "both", "none"], default="mysql")
+    ap.add_argument("--workers", type=int, default=CF_WORKERS)
+    ap.add_argument("--block", type=int, default=CF_BLOCK, help="users per sparse product block")
+    ap.add_argument("--check", type=int, default=0,
+                    help="compare N random users with the in-process Q5/Q6 (needs --source generate)")
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    t0 = time.perf_counter()
+    ratings = ratings_from_mysql() if args.source == "mysql" else ratings_from_dataset(args.generator, args.graph, args.seed)
+    m = build_matrix(*ratings)
+    t_build = time.perf_counter() - t0
+    print(f"cf_batch: {m.n_users} users x {m.rated.shape[1]} movies, {m.rated.nnz} ratings "
+          f"(loaded in {t_build:.2f}s)")
+
+    t0 = time.perf_counter()
+    similar, recs = run_job(m, args.workers, args.block)
+    t_job = time.perf_counter() - t0
+    print(f"cf_batch: scored {m.n_users} users in {t_job:.2f}s "
+          f"({m.n_users / max(t_job, 1e-9):,.0f} users/s, {args.workers} workers, block {args.block})")
+
+    t0 = time.perf_counter()
+    if args.write in ("mysql", "both"):
+        write_mysql(similar, recs)
+    if args.write in ("neo4j", "both"):
+        write_neo4j(similar, recs)
+    t_write = time.perf_counter() - t0
+    if args.write != "none":
+        print(f"cf_batch: wrote {len(similar)} SimilarUsers + {len(recs)} Recommendations rows "
+              f"in {t_write:.2f}s ({(len(similar) + len(recs)) / max(t_write, 1e-9):,.0f} rows/s)")
+
+    total = t_build + t_job + t_write
+    print(f"cf_batch: total {total:.2f}s ({m.n_users / max(total, 1e-9):,.0f} users/s end-to-end)")
+
+    if args.check:
+        if args.source != "generate":
+            print("cf_batch: --check needs --source generate, skipped")
+        else:
+            bad = check_against_inproc(similar, recs, args.generator, args.graph, args.seed, args.check)
+            print(f"cf_batch: check {args.check} users, {bad} mismatches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from insert_generate import MYSQL_COLUMNS, TABLE_ORDER, Dataset, EdgeTable, table_rows
+
+
+# ----------------------------
+# CONFIG
+# ----------------------------
+CREATE_SQL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Scripts", "create.sql")
+EMBEDDED_KINDS = ("duckdb", "sqlite")
+
+
+# ----------------------------
+# SCHEMA (din Scripts/create.sql)
+# ----------------------------
+_FK = re.compile(
+    r",\s*CONSTRAINT\s+\w+\s+FOREIGN\s+KEY\s*\([^)]*\)\s*REFERENCES\s+\w+\s*\([^)]*\)"
+    r"(\s+ON\s+(DELETE|UPDATE)\s+(CASCADE|RESTRICT|SET\s+NULL|NO\s+ACTION))*",
+    re.IGNORECASE,
+)
+
+
+def schema_statements(path: str = CREATE_SQL) -> List[str]:
+    """CREATE TABLE / CREATE INDEX din create.sql, fara particularitatile MySQL.
+
+    Cheile straine sunt scoase (DuckDB nu are ON UPDATE CASCADE, iar copiile embedded sunt
+    doar pentru citire); ENGINE=InnoDB si UNSIGNED dispar.
+    """
+    with open(path, encoding="utf-8") as f:
+        text = re.sub(r"--[^\n]*", "", f.read())
+    out = []
+    for stmt in text.split(";"):
+        start = stmt.upper().find("CREATE")
+        if start < 0:
+            continue
+        stmt = stmt[start:]
+        stmt = _FK.sub("", stmt)
+        stmt = re.sub(r"\s*ENGINE\s*=\s*\w+", "", stmt, flags=re.IGNORECASE)
+        stmt = re.sub(r"\s+UNSIGNED\b", "", stmt, flags=re.IGNORECASE)
+        out.append(stmt.strip())
+    return out
+
+
+# ----------------------------
+# QUERIES (traduse din MYSQL_QUERIES)
+# ----------------------------
+# Q2 foloseste CONCAT / FIND_IN_SET / CHAR(n) -> rescris in SQL standard (|| si instr)
+EMBEDDED_OVERRIDES: Dict[str, str] = {
+    "Q2_SHORTEST": """
+    WITH RECURSIVE bfs AS (
+      SELECT
+        %(uid)s AS start_id,
+        %(uid)s AS node_id,
+        CAST(%(uid)s AS VARCHAR) AS path,
+        0 AS hops
+      UNION ALL
+      SELECT
+        bfs.start_id,
+        f.userId2 AS node_id,
+        bfs.path || ',' || CAST(f.userId2 AS VARCHAR) AS path,
+        bfs.hops + 1 AS hops
+      FROM bfs
+      JOIN Friends f ON f.userId1 = bfs.node_id
+      WHERE bfs.hops < 5
+        AND instr(',' || bfs.path || ',', ',' || CAST(f.userId2 AS VARCHAR) || ',') = 0
+    )
+    SELECT node_id AS target_id, hops, path
+    FROM bfs
+    WHERE node_id = %(uid2)s
+    ORDER BY hops
+    LIMIT 1;
+    """,
+}
+
+
+def translate_queries(mysql_queries: Dict[str, str], kind: str) -> Dict[str, str]:
+    """%(name)s -> $name (DuckDB) / :name (SQLite); restul e SQL comun tuturor."""
+    placeholder = r"$\1" if kind == "duckdb" else r":\1"
+    return {
+        qid: re.sub(r"%\((\w+)\)s", placeholder, EMBEDDED_OVERRIDES.get(qid, sql))
+        for qid, sql in mysql_queries.items()
+    }
+
+
+# ----------------------------
+# CONEXIUNE + LOAD
+# ----------------------------
+def open_embedded(kind: str, data: Dataset):
+    """Baza in memorie cu schema din create.sql, umpluta cu acelasi Dataset ca MySQL/Neo4j."""
+    if kind == "duckdb":
+        import duckdb   # dependinta optionala, doar pentru backend-ul duckdb
+        conn = duckdb.connect(":memory:")
+    elif kind == "sqlite":
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+    else:
+        raise ValueError(f"unknown embedded backend: {kind}")
+
+    for stmt in schema_statements():
+        conn.execute(stmt)
+
+    rows = table_rows(*data.tables())
+    for table in TABLE_ORDER:
+        cols = MYSQL_COLUMNS[table]
+        if kind == "duckdb":
+            # insert vectorizat dintr-un DataFrame (executemany e foarte lent in DuckDB)
+            t = rows[table]
+            df = pd.DataFrame(dict(zip(cols, t.cols)) if isinstance(t, EdgeTable) else t, columns=cols)
+            conn.register("batch_df", df)
+            conn.execute(f"INSERT INTO {table}({','.join(cols)}) SELECT * FROM batch_df")
+            conn.unregister("batch_df")
+        else:
+            conn.executemany(
+                f"INSERT INTO {table}({','.join(cols)}) VALUES({','.join(['?'] * len(cols))})",
+                rows[table],
+            )
+    if kind == "sqlite":
+        conn.commit()
+        conn.execute("ANALYZE")
+    return conn
+
+
+def run_query(conn, sql: str, params: Dict[str, Any]) -> List[tuple]:
+    # DuckDB refuza parametrii in plus (ex. uid2 pentru Q1) -> trimitem doar ce apare in query
+    used = set(re.findall(r"[$:](\w+)", sql))
+    return conn.execute(sql, {k: v for k, v in params.items() if k in used}).fetchall()
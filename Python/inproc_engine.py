@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import functools
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from insert_generate import Dataset
+
+GENRE_MASK_BITS = 64   # genre_mask e uint64: un bit per gen
+
+
+# ----------------------------
+# CSR helpers
+# ----------------------------
+@dataclass
+class CSR:
+    indptr: np.ndarray            # len = n_rows + 1
+    indices: np.ndarray           # vecinii, grupati pe rand
+    data: Optional[np.ndarray]    # greutate pe muchie (ex. rating), optional
+
+    def row(self, i: int) -> np.ndarray:
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def row_data(self, i: int) -> np.ndarray:
+        return self.data[self.indptr[i]:self.indptr[i + 1]]
+
+
+def build_csr(src: np.ndarray, dst: np.ndarray, n_rows: int,
+              data: Optional[np.ndarray] = None) -> CSR:
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n_rows), out=indptr[1:])
+    return CSR(
+        indptr=indptr,
+        indices=dst[order].astype(np.int32),
+        data=None if data is None else data[order],
+    )
+
+
+def gather(csr: CSR, rows: np.ndarray):
+    """Expandeaza randurile `rows`: intoarce (index_in_rows, pozitie_in_indices), vectorizat."""
+    starts = csr.indptr[rows]
+    lens = csr.indptr[rows + 1] - starts
+    total = int(lens.sum())
+    if total == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    shift = starts - (np.cumsum(lens) - lens)
+    pos = np.repeat(shift, lens) + np.arange(total)
+    return np.repeat(np.arange(rows.size), lens), pos
+
+
+def top_k(keys: np.ndarray, score: np.ndarray, k: int) -> np.ndarray:
+    # ORDER BY score DESC, key ASC LIMIT k
+    order = np.lexsort((keys, -score))
+    return order[:k]
+
+
+# ----------------------------
+# GRAPH
+# ----------------------------
+class InprocGraph:
+    """Varianta in-memory (CSR + NumPy) a schemei Users/Movies/Genres/People."""
+
+    def __init__(self, data: Dataset):
+        self.n_users = max(u[0] for u in data.users) + 1
+        self.n_movies = max(m[0] for m in data.movies) + 1
+        self.n_people = max(p[0] for p in data.people) + 1
+        self.genres = list(data.genres)
+        genre_idx = {g: i for i, g in enumerate(self.genres)}
+
+        self.user_name = np.empty(self.n_users, dtype=object)
+        for uid, name, _age, _city in data.users:
+            self.user_name[uid] = name
+        self.movie_title = np.empty(self.n_movies, dtype=object)
+        self.movie_year = np.zeros(self.n_movies, dtype=np.int32)
+        for mid, title, year in data.movies:
+            self.movie_title[mid] = title
+            self.movie_year[mid] = year
+        self.person_name = np.empty(self.n_people, dtype=object)
+        for pid, name in data.people:
+            self.person_name[pid] = name
+
+        f_src, f_dst, _ = (c.astype(np.int64) for c in data.friends.cols)
+        self.friends = build_csr(f_src, f_dst, self.n_users)
+
+        r_user, r_movie = (c.astype(np.int64) for c in data.ratings.cols[:2])
+        r_val = data.ratings.cols[2].astype(np.float32)
+        self.ratings = build_csr(r_user, r_movie, self.n_users, r_val)          # user -> movie
+        self.rated_by = build_csr(r_movie, r_user, self.n_movies, r_val)        # movie -> user
+
+        mg = np.array([(m, genre_idx[g]) for m, g in data.movie_genres], dtype=np.int64).reshape(-1, 2)
+        self.movie_genres = build_csr(mg[:, 0], mg[:, 1], self.n_movies)
+
+        a_person, a_movie = (c.astype(np.int64) for c in data.acted_in.cols)
+        self.cast = build_csr(a_movie, a_person, self.n_movies)                 # movie -> person
+
+    # ---------- Q1 ----------
+    def q1_fof(self, uid: int, limit: int = 20) -> List[Dict[str, Any]]:
+        direct = self.friends.row(uid)
+        _, pos = gather(self.friends, direct.astype(np.int64))
+        fof = np.unique(self.friends.indices[pos])
+        fof = fof[(fof != uid) & ~np.isin(fof, direct)][:limit]
+        return [{"id": int(v), "name": self.user_name[v]} for v in fof]
+
+    # ---------- Q2 ----------
+    def q2_shortest(self, uid: int, uid2: int, max_hops: int = 10) -> List[Dict[str, Any]]:
+        parent = np.full(self.n_users, -1, dtype=np.int64)
+        parent[uid] = uid
+        frontier = np.array([uid], dtype=np.int64)
+        hops = 0
+        while parent[uid2] == -1 and hops < max_hops and frontier.size:
+            src, pos = gather(self.friends, frontier)
+            nbr = self.friends.indices[pos].astype(np.int64)
+            fresh = parent[nbr] == -1
+            nbr, first = np.unique(nbr[fresh], return_index=True)
+            parent[nbr] = frontier[src[fresh][first]]
+            frontier = nbr
+            hops += 1
+        if parent[uid2] == -1:
+            return []
+        path = [uid2]
+        while path[-1] != uid:
+            path.append(int(parent[path[-1]]))
+        path.reverse()
+        return [{"hops": len(path) - 1, "path": path}]
+
+    # ---------- Q3 ----------
+    def q3_fof_recs(self, uid: int, min_rating: float = 4.0, limit: int = 10) -> List[Dict[str, Any]]:
+        direct = self.friends.row(uid).astype(np.int64)
+        _, pos = gather(self.friends, direct)
+        x = self.friends.indices[pos].astype(np.int64)       # cu repetitii, ca count(*) din SQL/Cypher
+        x = x[x != uid]
+        _, rpos = gather(self.ratings, x)
+        movies = self.ratings.indices[rpos]
+        vals = self.ratings.data[rpos]
+        keep = (vals >= min_rating) & ~np.isin(movies, self.ratings.row(uid))
+        return self._movie_agg(movies[keep], vals[keep], limit)
+
+    # ---------- Q4 ----------
+    def q4_genre_sim(self, uid: int, limit: int = 10) -> List[Dict[str, Any]]:
+        n_genres = len(self.genres)
+        _, gpos = gather(self.movie_genres, self.ratings.row(uid).astype(np.int64))
+        my_genres = np.unique(self.movie_genres.indices[gpos])
+
+        # matrice booleana user x genre (DISTINCT gratis), apoi numaram doar genurile mele
+        rating_user = np.repeat(np.arange(self.n_users), np.diff(self.ratings.indptr))
+        e_idx, gpos = gather(self.movie_genres, self.ratings.indices.astype(np.int64))
+        has_genre = np.zeros((self.n_users, n_genres), dtype=bool)
+        has_genre[rating_user[e_idx], self.movie_genres.indices[gpos]] = True
+        common = has_genre[:, my_genres].sum(axis=1)
+        common[uid] = 0
+        return self._user_rank(common, "commonGenres", limit)
+
+    # ---------- Q4 materializat ----------
+    @functools.cached_property
+    def genre_mask(self) -> np.ndarray:
+        """Masca de genuri per user (bit = pozitia genului dupa nume, ca UserGenreMask / u.genreMask)."""
+        if len(self.genres) > GENRE_MASK_BITS:
+            raise ValueError(f"{len(self.genres)} genres do not fit in a {GENRE_MASK_BITS}-bit genre mask")
+        bit = np.argsort(np.argsort(np.array(self.genres, dtype=object)))
+        movie_mask = np.zeros(self.n_movies, dtype=np.uint64)
+        np.bitwise_or.at(movie_mask, np.repeat(np.arange(self.n_movies), np.diff(self.movie_genres.indptr)),
+                         np.left_shift(np.uint64(1), bit[self.movie_genres.indices].astype(np.uint64)))
+        user_mask = np.zeros(self.n_users, dtype=np.uint64)
+        rating_user = np.repeat(np.arange(self.n_users), np.diff(self.ratings.indptr))
+        np.bitwise_or.at(user_mask, rating_user, movie_mask[self.ratings.indices])
+        return user_mask
+
+    def q4_genre_sim_mask(self, uid: int, limit: int = 10) -> List[Dict[str, Any]]:
+        # popcount(AND) pe toti userii deodata
+        common = np.bitwise_count(self.genre_mask & self.genre_mask[uid]).astype(np.int64)
+        common[uid] = 0
+        return self._user_rank(common, "commonGenres", limit)
+
+    # ---------- Q5 ----------
+    def q5_movie_sim(self, uid: int, limit: int = 10) -> List[Dict[str, Any]]:
+        _, pos = gather(self.rated_by, self.ratings.row(uid).astype(np.int64))
+        v = self.rated_by.indices[pos]
+        v = v[v != uid]
+        common = np.bincount(v, minlength=self.n_users)
+        return self._user_rank(common, "common", limit)
+
+    # ---------- Q6 ----------
+    def q6_collab_recs(self, uid: int, min_rating: float = 4.0, min_common: int = 1,
+                       limit: int = 10) -> List[Dict[str, Any]]:
+        my_movies = self.ratings.row(uid)
+        _, pos = gather(self.rated_by, my_movies.astype(np.int64))
+        v = self.rated_by.indices[pos]
+        common = np.bincount(v[v != uid], minlength=self.n_users)
+        neighbors = np.flatnonzero(common >= max(min_common, 1))
+        _, rpos = gather(self.ratings, neighbors)
+        movies = self.ratings.indices[rpos]
+        vals = self.ratings.data[rpos]
+        keep = (vals >= min_rating) & ~np.isin(movies, my_movies)
+        return self._movie_agg(movies[keep], vals[keep], limit)
+
+    # ---------- Q7 ----------
+    def coactor_pairs(self):
+        """Toate perechile (p1 < p2) care au jucat in acelasi film, cu numarul de filme comune."""
+        deg = np.diff(self.cast.indptr)
+        keys = []
+        for k in np.unique(deg[deg >= 2]):
+            mids = np.flatnonzero(deg == k)
+            cast = self.cast.indices[self.cast.indptr[mids][:, None] + np.arange(k)].astype(np.int64)
+            i, j = np.triu_indices(k, 1)
+            a, b = cast[:, i].ravel(), cast[:, j].ravel()
+            keys.append(np.minimum(a, b) * self.n_people + np.maximum(a, b))
+        if not keys:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty
+        pair, together = np.unique(np.concatenate(keys), return_counts=True)
+        return pair // self.n_people, pair % self.n_people, together
+
+    def q7_coactors(self, limit: int = 20) -> List[Dict[str, Any]]:
+        p1, p2, together = self.coactor_pairs()
+        if together.size == 0:
+            return []
+        # doar perechile care pot intra in top; apoi ORDER BY together DESC, actor1, actor2
+        cut = np.partition(together, -min(limit, together.size))[-min(limit, together.size)]
+        cand = np.flatnonzero(together >= cut)
+        n1 = self.person_name[p1[cand]].astype(str)
+        n2 = self.person_name[p2[cand]].astype(str)
+        order = np.lexsort((n2, n1, -together[cand]))[:limit]
+        return [
+            {"actor1": str(n1[i]), "actor2": str(n2[i]), "together": int(together[cand[i]])}
+            for i in order
+        ]
+
+    # ---------- agregari comune ----------
+    def _movie_agg(self, movies: np.ndarray, vals: np.ndarray, limit: int) -> List[Dict[str, Any]]:
+        if movies.size == 0:
+            return []
+        votes = np.bincount(movies, minlength=self.n_movies)
+        total = np.bincount(movies, weights=vals, minlength=self.n_movies)
+        cand = np.flatnonzero(votes)
+        score = total[cand] / votes[cand]
+        # ORDER BY score DESC, votes DESC (id ca tie-break determinist)
+        order = np.lexsort((cand, -votes[cand], -score))[:limit]
+        return [
+            {"title": self.movie_title[m], "year": int(self.movie_year[m]),
+             "score": float(s), "votes": int(votes[m])}
+            for m, s in zip(cand[order], score[order])
+        ]
+
+    def _user_rank(self, counts: np.ndarray, col: str, limit: int) -> List[Dict[str, Any]]:
+        cand = np.flatnonzero(counts)
+        idx = top_k(cand, counts[cand], limit)
+        return [
+            {"id": int(v), "name": self.user_name[v], col: int(counts[v])}
+            for v in cand[idx]
+        ]
+
+
+# ----------------------------
+# QUERIES (aceleasi id-uri ca NEO4J_QUERIES / MYSQL_QUERIES)
+# ----------------------------
+INPROC_QUERIES: Dict[str, Callable[[InprocGraph, Dict[str, Any]], List[Dict[str, Any]]]] = {
+    "Q1_FOF": lambda g, p: g.q1_fof(p["uid"]),
+    "Q2_SHORTEST": lambda g, p: g.q2_shortest(p["uid"], p["uid2"]),
+    "Q3_FOF_RECS": lambda g, p: g.q3_fof_recs(p["uid"]),
+    "Q4_GENRE_SIM": lambda g, p: g.q4_genre_sim(p["uid"]),
+    "Q5_MOVIE_SIM": lambda g, p: g.q5_movie_sim(p["uid"]),
+    "Q6_COLLAB_RECS": lambda g, p: g.q6_collab_recs(p["uid"]),
+    "Q7_COACTORS": lambda g, p: g.q7_coactors(),
+}
+
+# ca mysql_mat / neo4j_mat: Q4 din masca de genuri per user, restul identic
+INPROC_MATERIALIZED = dict(INPROC_QUERIES, Q4_GENRE_SIM=lambda g, p: g.q4_genre_sim_mask(p["uid"]))
@@ -1,8 +1,25 @@
+import argparse
+import csv
+import json
+import os
+import queue
 import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import tracemalloc
+import zlib
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from tqdm import tqdm
 
+import numpy as np
+
 from neo4j import GraphDatabase
 import mysql.connector
 
@@ -20,11 +37,19 @@ RATINGS_PER_USER = 10     # câte filme evaluează în medie un user
 
 
 BATCH = 5000
+GEN_CHUNK = 100_000       # randuri per chunk in generatorul NumPy
 
 N_PEOPLE = 8000
 ACTORS_PER_MOVIE_MIN = 2
 ACTORS_PER_MOVIE_MAX = 6
 
+# Forma grafului: "uniform" = gen_friend_edges / gen_ratings; "powerlaw" = atasare preferentiala
+# cu comunitati + popularitate Zipf a filmelor (vezi gen_friend_edges_powerlaw)
+GRAPH_MODEL = "uniform"
+COMMUNITY_SIZE = 500      # useri per comunitate (in medie)
+P_IN_COMMUNITY = 0.8      # probabilitatea ca o prietenie noua sa ramana in comunitate
+MOVIE_POP_ALPHA = 1.0     # exponentul Zipf al popularitatii filmelor
+
 
 # Neo4j
 NEO4J_URI = "bolt://localhost:7687"
@@ -43,6 +68,73 @@ def chunked(lst, n):
     for i in range(0, len(lst), n):
         yield lst[i:i+n]
 
+
+class EdgeTable:
+    """Tabel de muchii / ratinguri pe coloane NumPy tipate (int32 / float32), nu lista de tuple.
+
+    Un rand ca tuple Python costa ~100 B (tuple + obiectele int/float); aici costa 8-12 B.
+    Randurile pentru drivere se construiesc doar per batch: t[i:i + n] intoarce lista de tuple,
+    deci chunked(), write_tsv() si csv.writer merg la fel ca pe o lista.
+    """
+
+    def __init__(self, *cols: np.ndarray):
+        self.cols = cols
+
+    @classmethod
+    def from_arrays(cls, *arrays: array) -> "EdgeTable":
+        # array('i') / array('f') -> vederi NumPy peste acelasi buffer, fara copie
+        return cls(*(np.frombuffer(a, dtype=np.intc if a.typecode == "i" else np.float32) for a in arrays))
+
+    @classmethod
+    def from_chunks(cls, chunks, dtypes) -> "EdgeTable":
+        # fiecare chunk e convertit la dtype-ul final inainte sa vina urmatorul (int64 -> int32)
+        parts = [[c.astype(dt, copy=False) for c, dt in zip(cols, dtypes)] for cols in chunks]
+        if not parts:
+            return cls(*(np.empty(0, dtype=dt) for dt in dtypes))
+        return cls(*(np.concatenate(col) for col in zip(*parts)))
+
+    def __len__(self) -> int:
+        return len(self.cols[0])
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return list(zip(*(c[i].tolist() for c in self.cols)))
+        return tuple(c[i].item() for c in self.cols)
+
+    def __iter__(self):
+        for start in range(0, len(self), GEN_CHUNK):
+            yield from self[start:start + GEN_CHUNK]
+
+    def take(self, idx: np.ndarray) -> "EdgeTable":
+        return EdgeTable(*(c[idx] for c in self.cols))
+
+
+# ---------------- Memorie per faza (--mem) ----------------
+MB = 1024 * 1024
+
+
+def rss_mb() -> float:
+    try:
+        import psutil   # optional
+        return psutil.Process().memory_info().rss / MB
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / MB
+    except (OSError, ValueError, AttributeError):
+        return float("nan")
+
+
+def report_memory(phase: str):
+    """RSS-ul procesului + memoria Python urmarita de tracemalloc (curenta si varful fazei)."""
+    line = f"Memory after {phase}: rss={rss_mb():.1f} MB"
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        line += f" python={current / MB:.1f} MB (peak {peak / MB:.1f} MB)"
+        tracemalloc.reset_peak()
+    print(line)
+
 # ---------------- Generate synthetic data ----------------
 def gen_users(n: int):
     cities = ["Bucharest", "Cluj", "Iasi", "Brasov", "Timisoara", "Constanta", "Oradea"]
@@ -82,22 +174,25 @@ def gen_friend_edges(n_users: int, avg_friends: int):
             a, b = b, a
         edges.add((a, b))
     # dublare direcțională (exact ca schema SQL Friends bidirecțională și Neo4j FRIEND ambele sensuri)
-    out = []
+    src, dst, years = array("i"), array("i"), array("i")
     for (a, b) in edges:
         since = random.randint(2015, 2025)
-        out.append((a, b, since))
-        out.append((b, a, since))
-    return out
+        src.extend((a, b))
+        dst.extend((b, a))
+        years.extend((since, since))
+    return EdgeTable.from_arrays(src, dst, years)
 
 def gen_ratings(n_users: int, n_movies: int, ratings_per_user: int):
-    out = []
+    users, movies_col, ratings = array("i"), array("i"), array("f")
     for uid in range(1, n_users+1):
         # evităm duplicate (uid, movieId)
         movies = random.sample(range(1, n_movies+1), k=ratings_per_user)
         for mid in movies:
             rating = random.choice([1,2,3,4,5])  # discret, simplu
-            out.append((uid, mid, float(rating)))
-    return out
+            users.append(uid)
+            movies_col.append(mid)
+            ratings.append(rating)
+    return EdgeTable.from_arrays(users, movies_col, ratings)
 
 def gen_people(n: int):
     out = []
@@ -106,23 +201,445 @@ def gen_people(n: int):
     return out
 
 def gen_acted_in(n_movies: int, n_people: int):
-    out = []
+    people, movies = array("i"), array("i")
     for mid in range(1, n_movies + 1):
         k = random.randint(ACTORS_PER_MOVIE_MIN, ACTORS_PER_MOVIE_MAX)
         actors = random.sample(range(1, n_people + 1), k)
         for pid in actors:
-            out.append((pid, mid))
-    return out
+            people.append(pid)
+            movies.append(mid)
+    return EdgeTable.from_arrays(people, movies)
 
 def gen_directed(n_movies: int, n_people: int):
-    out = []
+    people, movies = array("i"), array("i")
     for mid in range(1, n_movies + 1):
         director = random.randint(1, n_people)
-        out.append((director, mid))
+        people.append(director)
+        movies.append(mid)
+    return EdgeTable.from_arrays(people, movies)
+
+
+# ---------------- Generate synthetic data (NumPy, pe chunk-uri) ----------------
+# Aceleasi distributii ca gen_* de mai sus, dar vectorizat: timp/memorie ~liniare in N.
+# Fiecare tabel are propriul RNG derivat din (seed, tabel) -> reproductibil indiferent de ordine.
+# Chunk-urile sunt tuple de coloane NumPy; chunk_rows() le transforma in randuri pt drivere.
+TABLE_ORDER = ["Users", "Movies", "People", "Genres", "MovieGenres", "ActedIn", "Directed", "Friends", "Ratings"]
+# tabelele tinute ca EdgeTable in Dataset (restul raman liste de tuple: putine randuri, string-uri)
+EDGE_DTYPES = {
+    "ActedIn": (np.int32, np.int32),
+    "Directed": (np.int32, np.int32),
+    "Friends": (np.int32, np.int32, np.int32),
+    "Ratings": (np.int32, np.int32, np.float32),
+}
+
+
+def table_rng(seed: int, table: str) -> np.random.Generator:
+    return np.random.default_rng([seed, TABLE_ORDER.index(table)])
+
+
+def chunk_rows(cols) -> list:
+    return list(zip(*(c.tolist() for c in cols)))
+
+
+def _distinct_per_row(rng: np.random.Generator, n_rows: int, k: np.ndarray, low: int, high: int) -> np.ndarray:
+    """Matrice (n_rows, max(k)) cu valori distincte pe primele k[i] coloane (ca random.sample), restul 0."""
+    width = int(k.max()) if k.size else 0
+    if width > high - low + 1:
+        # ca random.sample; altfel bucla de respingere nu s-ar termina niciodata
+        raise ValueError(f"sample of {width} distinct values larger than population {low}..{high}")
+    valid = np.arange(width) < k[:, None]
+    out = rng.integers(low, high + 1, size=(n_rows, width))
+    redo = np.arange(n_rows)
+    while redo.size:
+        block = np.where(valid[redo], out[redo], -np.arange(1, width + 1))  # pozitiile invalide nu se ciocnesc
+        s = np.sort(block, axis=1)
+        dup = (s[:, 1:] == s[:, :-1]).any(axis=1)
+        redo = redo[dup]
+        out[redo] = rng.integers(low, high + 1, size=(redo.size, width))
+    out[~valid] = 0
     return out
 
 
+def gen_users_np(n: int, seed: int = SEED, chunk: int = GEN_CHUNK):
+    cities = np.array(["Bucharest", "Cluj", "Iasi", "Brasov", "Timisoara", "Constanta", "Oradea"])
+    rng = table_rng(seed, "Users")
+    for start in range(1, n + 1, chunk):
+        uid = np.arange(start, min(start + chunk, n + 1), dtype=np.int64)
+        names = np.char.add("User", uid.astype(str))
+        yield uid, names, rng.integers(18, 56, size=uid.size), cities[rng.integers(0, len(cities), size=uid.size)]
+
+
+def gen_movies_np(n: int, seed: int = SEED, chunk: int = GEN_CHUNK):
+    rng = table_rng(seed, "Movies")
+    for start in range(1, n + 1, chunk):
+        mid = np.arange(start, min(start + chunk, n + 1), dtype=np.int64)
+        yield mid, np.char.add("Movie", mid.astype(str)), rng.integers(1980, 2025, size=mid.size)
+
+
+def gen_people_np(n: int, seed: int = SEED, chunk: int = GEN_CHUNK):
+    for start in range(1, n + 1, chunk):
+        pid = np.arange(start, min(start + chunk, n + 1), dtype=np.int64)
+        yield pid, np.char.add("Person", pid.astype(str))
+
+
+def gen_movie_genres_np(n_movies: int, genres: List[str], seed: int = SEED, chunk: int = GEN_CHUNK):
+    rng = table_rng(seed, "MovieGenres")
+    names = np.array(genres)
+    for start in range(1, n_movies + 1, chunk):
+        mid = np.arange(start, min(start + chunk, n_movies + 1), dtype=np.int64)
+        k = rng.integers(1, 4, size=mid.size)                       # 1-3 genuri per film
+        gs = _distinct_per_row(rng, mid.size, k, 0, len(genres) - 1)
+        valid = np.arange(gs.shape[1]) < k[:, None]
+        yield np.repeat(mid, k), names[gs[valid]]
+
+
+def gen_acted_in_np(n_movies: int, n_people: int, seed: int = SEED, chunk: int = GEN_CHUNK):
+    rng = table_rng(seed, "ActedIn")
+    for start in range(1, n_movies + 1, chunk):
+        mid = np.arange(start, min(start + chunk, n_movies + 1), dtype=np.int64)
+        k = rng.integers(ACTORS_PER_MOVIE_MIN, ACTORS_PER_MOVIE_MAX + 1, size=mid.size)
+        actors = _distinct_per_row(rng, mid.size, k, 1, n_people)
+        valid = np.arange(actors.shape[1]) < k[:, None]
+        yield actors[valid], np.repeat(mid, k)
+
+
+def gen_directed_np(n_movies: int, n_people: int, seed: int = SEED, chunk: int = GEN_CHUNK):
+    rng = table_rng(seed, "Directed")
+    for start in range(1, n_movies + 1, chunk):
+        mid = np.arange(start, min(start + chunk, n_movies + 1), dtype=np.int64)
+        yield rng.integers(1, n_people + 1, size=mid.size), mid
+
+
+def gen_friend_edges_np(n_users: int, avg_friends: int, seed: int = SEED, chunk: int = GEN_CHUNK):
+    # perechi (a<b) codate ca a*(n+1)+b in int64; dedup prin sortare (np.unique), nu prin set
+    rng = table_rng(seed, "Friends")
+    target_edges = n_users * avg_friends // 2
+    base = n_users + 1
+    keys = np.empty(0, dtype=np.int64)
+    while keys.size < target_edges:
+        need = target_edges - keys.size
+        draw = int(need * 1.05) + 16
+        a = rng.integers(1, n_users + 1, size=draw)
+        b = rng.integers(1, n_users + 1, size=draw)
+        ok = a != b
+        a, b = a[ok], b[ok]
+        new = np.minimum(a, b) * base + np.maximum(a, b)
+        keys = np.unique(np.concatenate([keys, new]))
+    if keys.size > target_edges:
+        keys = np.sort(rng.choice(keys, size=target_edges, replace=False))
+
+    # dublare directionala: fiecare chunk contine (a,b) si (b,a) cu acelasi since_year
+    half = max(chunk // 2, 1)
+    for start in range(0, target_edges, half):
+        k = keys[start:start + half]
+        a, b = k // base, k % base
+        since = rng.integers(2015, 2026, size=k.size)
+        yield (np.column_stack([a, b]).ravel(),
+               np.column_stack([b, a]).ravel(),
+               np.repeat(since, 2))
+
+
+def gen_ratings_np(n_users: int, n_movies: int, ratings_per_user: int, seed: int = SEED, chunk: int = GEN_CHUNK):
+    rng = table_rng(seed, "Ratings")
+    users_per_chunk = max(chunk // ratings_per_user, 1)
+    for start in range(1, n_users + 1, users_per_chunk):
+        uid = np.arange(start, min(start + users_per_chunk, n_users + 1), dtype=np.int64)
+        k = np.full(uid.size, ratings_per_user)
+        movies = _distinct_per_row(rng, uid.size, k, 1, n_movies)    # fara duplicate (uid, movieId)
+        rating = rng.integers(1, 6, size=movies.size).astype(np.float32)
+        yield np.repeat(uid, ratings_per_user), movies.ravel(), rating
+
+
+# ---------------- Graf social power-law + comunitati ----------------
+# gen_friend_edges trage perechi uniforme -> grade ~Poisson, fara supernoduri. Modul "powerlaw"
+# foloseste atasare preferentiala (Barabasi-Albert) cu comunitati si popularitate Zipf la filme.
+def gen_friend_edges_powerlaw(n_users: int, avg_friends: int, seed: int = SEED, chunk: int = GEN_CHUNK):
+    """Barabasi-Albert cu suprapunere de comunitati, O(E).
+
+    Userii sosesc intr-o ordine aleatoare si fiecare se leaga de m = avg_friends/2 useri deja
+    sositi, alesi proportional cu gradul; cu probabilitatea P_IN_COMMUNITY alegerea se face doar
+    in comunitatea proprie (blocuri de ~COMMUNITY_SIZE useri).
+    """
+    rng = table_rng(seed, "Friends")
+    m = max(1, avg_friends // 2)
+    n_comm = max(1, n_users // COMMUNITY_SIZE)
+    order = rng.permutation(np.arange(1, n_users + 1)).tolist()   # hub-urile nu sunt userii cu id mic
+    comm = rng.integers(0, n_comm, size=n_users + 1).tolist()      # index = userId
+
+    # fiecare capat de muchie apare o data in lista -> alegere uniforma = proportionala cu gradul
+    ends: List[int] = []
+    comm_ends: List[List[int]] = [[] for _ in range(n_comm)]
+    a_out: List[int] = []
+    b_out: List[int] = []
+    block = 65536
+    for start in range(0, n_users, block):
+        picks = rng.random(size=(min(block, n_users - start), 2 * m))
+        local = (rng.random(size=picks.shape) < P_IN_COMMUNITY).tolist()
+        picks = picks.tolist()
+        for i, u in enumerate(order[start:start + block]):
+            cu = comm[u]
+            chosen = set()
+            for t in range(2 * m):                 # cel mult 2m incercari pentru m vecini distincti
+                if len(chosen) == m:
+                    break
+                pool = comm_ends[cu] if local[i][t] and comm_ends[cu] else ends
+                if not pool:
+                    break
+                v = pool[int(picks[i][t] * len(pool))]
+                if v != u:
+                    chosen.add(v)
+            if not chosen and ends:
+                chosen.add(ends[int(picks[i][0] * len(ends))])   # nimeni izolat (poate fi chiar u -> ignorat)
+                chosen.discard(u)
+            for v in chosen:
+                a_out.append(u)
+                b_out.append(v)
+                ends.append(u)
+                ends.append(v)
+                comm_ends[cu].append(u)
+                comm_ends[comm[v]].append(v)
+            if not ends:
+                ends.append(u)                     # primul user: punct de pornire pentru urmatorii
+
+    a = np.array(a_out, dtype=np.int64)
+    b = np.array(b_out, dtype=np.int64)
+    half = max(chunk // 2, 1)
+    for start in range(0, a.size, half):
+        x, y = a[start:start + half], b[start:start + half]
+        since = rng.integers(2015, 2026, size=x.size)
+        yield (np.column_stack([x, y]).ravel(),
+               np.column_stack([y, x]).ravel(),
+               np.repeat(since, 2))
+
+
+def gen_ratings_powerlaw(n_users: int, n_movies: int, ratings_per_user: int, seed: int = SEED,
+                         chunk: int = GEN_CHUNK):
+    """Ca gen_ratings_np, dar filmul de rang r e ales cu probabilitate ~ r^-MOVIE_POP_ALPHA."""
+    rng = table_rng(seed, "Ratings")
+    movie_of_rank = rng.permutation(np.arange(1, n_movies + 1))
+    weights = np.arange(1, n_movies + 1, dtype=np.float64) ** -MOVIE_POP_ALPHA
+    cdf = np.cumsum(weights) / weights.sum()
+    k = ratings_per_user
+    users_per_chunk = max(chunk // k, 1)
+    for start in range(1, n_users + 1, users_per_chunk):
+        uid = np.arange(start, min(start + users_per_chunk, n_users + 1), dtype=np.int64)
+        movies = np.empty((uid.size, k), dtype=np.int64)
+        redo = np.arange(uid.size)
+        while redo.size:                           # redesenam doar randurile cu duplicate
+            ranks = np.minimum(np.searchsorted(cdf, rng.random(size=(redo.size, k))), n_movies - 1)
+            movies[redo] = movie_of_rank[ranks]
+            s = np.sort(movies[redo], axis=1)
+            redo = redo[(s[:, 1:] == s[:, :-1]).any(axis=1)]
+        rating = rng.integers(1, 6, size=movies.size).astype(np.float32)
+        yield np.repeat(uid, k), movies.ravel(), rating
+
+
+def _degree_line(name: str, deg: np.ndarray) -> str:
+    deg = np.sort(deg)[::-1]
+    top = max(1, deg.size // 100)
+    # exponent power-law (MLE, Clauset et al.) pe coada d >= mediana
+    d_min = max(1.0, float(np.median(deg)))
+    tail = deg[deg >= d_min].astype(np.float64)
+    alpha = 1.0 + tail.size / max(np.log(tail / (d_min - 0.5)).sum(), 1e-9)
+    return (f"{name}: n={deg.size} mean={deg.mean():.1f} median={np.median(deg):.0f} "
+            f"p99={np.percentile(deg, 99):.0f} max={deg[0]} top1%_share={deg[:top].sum() / max(deg.sum(), 1):.1%} "
+            f"alpha~{alpha:.2f}")
+
+
+def print_degree_stats(data: "Dataset"):
+    """Distributia gradelor (prieteni per user, ratinguri per film), pt a compara modurile --graph."""
+    friends = data.friends.cols[0]
+    n_users = max(u[0] for u in data.users) + 1
+    print(_degree_line("Friends per user", np.bincount(friends, minlength=n_users)[1:]))
+    rated = data.ratings.cols[1]
+    n_movies = max(m[0] for m in data.movies) + 1
+    print(_degree_line("Ratings per movie", np.bincount(rated, minlength=n_movies)[1:]))
+
+
+def gen_dataset_chunks(seed: int = SEED, chunk: int = GEN_CHUNK):
+    """(tabel, coloane) in ordinea de incarcare din load_mysql; nimic nu e tinut intreg in memorie."""
+    genres = gen_genres(N_GENRES)
+    sources = {
+        "Users": gen_users_np(N_USERS, seed, chunk),
+        "Movies": gen_movies_np(N_MOVIES, seed, chunk),
+        "People": gen_people_np(N_PEOPLE, seed, chunk),
+        "Genres": iter([(np.array(genres),)]),
+        "MovieGenres": gen_movie_genres_np(N_MOVIES, genres, seed, chunk),
+        "ActedIn": gen_acted_in_np(N_MOVIES, N_PEOPLE, seed, chunk),
+        "Directed": gen_directed_np(N_MOVIES, N_PEOPLE, seed, chunk),
+        "Friends": gen_friend_edges_np(N_USERS, AVG_FRIENDS, seed, chunk),
+        "Ratings": gen_ratings_np(N_USERS, N_MOVIES, RATINGS_PER_USER, seed, chunk),
+    }
+    if GRAPH_MODEL == "powerlaw":
+        sources["Friends"] = gen_friend_edges_powerlaw(N_USERS, AVG_FRIENDS, seed, chunk)
+        sources["Ratings"] = gen_ratings_powerlaw(N_USERS, N_MOVIES, RATINGS_PER_USER, seed, chunk)
+    for table in TABLE_ORDER:
+        for cols in sources[table]:
+            yield table, cols
+
+
+# ---------------- Checkpoint-uri (load reluabil) ----------------
+# load_mysql / load_neo4j noteaza dupa fiecare batch comis (tabel, batch-uri terminate) intr-un
+# JSON local, cate un fisier per backend. --resume regenereaza aceleasi date (acelasi seed) si
+# sare peste batch-urile terminate; scrierile sunt idempotente (upsert / MERGE), deci batch-ul
+# comis dar nenotat inainte de crash se poate rescrie fara erori. Un load terminat isi sterge fisierul.
+CHECKPOINT_FILE = "load_checkpoint_{backend}.json"
+
+
+class LoadCheckpoint:
+    """Progresul unui load: reset facut, batch-uri terminate per tabel, post-load facut.
+
+    path=None -> doar in memorie (fara fisier). fingerprint descrie datele (seed, generator,
+    dimensiuni, batch size); la reluare trebuie sa fie identic, altfel indicii de batch nu mai
+    corespund acelorasi randuri.
+    """
+
+    def __init__(self, path: Optional[str], fingerprint: Dict[str, Any], resume: bool = False):
+        self.path = path
+        self.resumed = False
+        self.state: Dict[str, Any] = {"fingerprint": fingerprint, "reset": False, "batches": {}, "post_load": False}
+        if resume and path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved["fingerprint"] != fingerprint:
+                raise SystemExit(f"{path} was written for different data:\n  saved:   {saved['fingerprint']}"
+                                 f"\n  current: {fingerprint}\nrun without --resume to reload from scratch")
+            self.state = saved
+            self.resumed = True
+        self.save()
+
+    def save(self):
+        if self.path is None:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=1)
+        os.replace(tmp, self.path)    # atomic: un crash in timpul scrierii lasa starea veche
+
+    def finish(self):
+        """Load-ul s-a terminat: nu mai e nimic de reluat, fisierul dispare."""
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+
+    @property
+    def reset_done(self) -> bool:
+        return self.state["reset"]
+
+    def mark_reset(self):
+        self.state["reset"] = True
+        self.save()
+
+    def batches_done(self, table: str) -> int:
+        return self.state["batches"].get(table, 0)
+
+    def mark_batch(self, table: str, index: int):
+        self.state["batches"][table] = index + 1
+        self.save()
+
+    @property
+    def post_load_done(self) -> bool:
+        return self.state["post_load"]
+
+    def mark_post_load(self):
+        self.state["post_load"] = True
+        self.save()
+
+    def describe(self) -> str:
+        done = ", ".join(f"{t}={n}" for t, n in self.state["batches"].items()) or "none"
+        return f"reset={self.reset_done} batches: {done} post_load={self.post_load_done}"
+
+
+def load_fingerprint(generator: str) -> Dict[str, Any]:
+    return {
+        "seed": SEED, "generator": generator, "graph": GRAPH_MODEL,
+        "N_USERS": N_USERS, "N_MOVIES": N_MOVIES, "N_GENRES": N_GENRES, "N_PEOPLE": N_PEOPLE,
+        "AVG_FRIENDS": AVG_FRIENDS, "RATINGS_PER_USER": RATINGS_PER_USER,
+        "BATCH": BATCH, "NEO4J_BATCH": {t: size for t, (_, _, size) in NEO4J_MERGE.items()},
+    }
+
+
 # ---------------- MySQL load ----------------
+MYSQL_COLUMNS = {
+    "Users": ["userId", "name", "age", "city"],
+    "Movies": ["movieId", "title", "year"],
+    "People": ["personId", "name"],
+    "Genres": ["name"],
+    "MovieGenres": ["movieId", "genre"],
+    "ActedIn": ["personId", "movieId"],
+    "Directed": ["personId", "movieId"],
+    "Friends": ["userId1", "userId2", "since_year"],
+    "Ratings": ["userId", "movieId", "rating"],
+}
+MYSQL_INSERT = {
+    t: f"INSERT INTO {t}({','.join(cols)}) VALUES({','.join(['%s'] * len(cols))})"
+    for t, cols in MYSQL_COLUMNS.items()
+}
+# la reluare: batch-ul intrerupt poate fi deja comis -> reinsert fara erori de cheie duplicata
+MYSQL_INSERT_IDEMPOTENT = {
+    t: MYSQL_INSERT[t] + " ON DUPLICATE KEY UPDATE " + ", ".join(f"{c}=VALUES({c})" for c in cols)
+    for t, cols in MYSQL_COLUMNS.items()
+}
+
+# indexurile secundare din Scripts/create.sql (tabel, index, coloana)
+MYSQL_SECONDARY_INDEXES = [
+    ("Users", "idx_users_city", "city"),
+    ("Movies", "idx_movies_title", "title"),
+    ("Friends", "idx_friends_u2", "userId2"),
+    ("Ratings", "idx_ratings_movie", "movieId"),
+    ("MovieGenres", "idx_mg_genre", "genre"),
+    ("People", "idx_people_name", "name"),
+]
+
+# tabelele derivate adaugate dupa schema initiala; o baza creata cu un create.sql mai vechi
+# le primeste la primul load / delta (CREATE TABLE IF NOT EXISTS, DDL-ul luat tot din create.sql)
+CREATE_SQL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Scripts", "create.sql")
+MYSQL_DERIVED_TABLES = ("CoActors", "UserGenreMask", "SimilarUsers", "Recommendations")
+
+
+def _create_sql_statements(path: str) -> List[str]:
+    with open(path, encoding="utf-8") as f:
+        text = re.sub(r"--[^\n]*", "", f.read())
+    return [stmt.strip() for stmt in text.split(";") if stmt.strip()]
+
+
+def mysql_derived_ddl(path: str = CREATE_SQL) -> List[str]:
+    out = []
+    for stmt in _create_sql_statements(path):
+        m = re.search(r"CREATE\s+TABLE\s+(\w+)", stmt, re.IGNORECASE)
+        if m and m.group(1) in MYSQL_DERIVED_TABLES:
+            out.append(f"CREATE TABLE IF NOT EXISTS {m.group(1)}" + stmt[m.end():])
+    return out
+
+
+def mysql_derived_indexes(path: str = CREATE_SQL) -> List[Tuple[str, str, str]]:
+    """(tabel, index, CREATE INDEX) pentru indexurile tabelelor derivate din create.sql."""
+    out = []
+    for stmt in _create_sql_statements(path):
+        m = re.search(r"CREATE\s+INDEX\s+(\w+)\s+ON\s+(\w+)", stmt, re.IGNORECASE)
+        if m and m.group(2) in MYSQL_DERIVED_TABLES:
+            out.append((m.group(2), m.group(1), stmt[m.start():]))
+    return out
+
+
+def mysql_ensure_derived_tables(cur):
+    for ddl in mysql_derived_ddl():
+        cur.execute(ddl)
+    # MySQL nu are CREATE INDEX IF NOT EXISTS -> doar indexurile care lipsesc
+    for table, index, ddl in mysql_derived_indexes():
+        if index not in mysql_existing_indexes(cur, table):
+            cur.execute(ddl)
+
+
+def table_rows(users, movies, genres, movie_genres, friends, ratings, people, acted_in, directed):
+    # tabel -> lista de randuri (Genres devine (name,) ca sa aiba aceeasi forma ca restul)
+    return {
+        "Users": users, "Movies": movies, "People": people,
+        "Genres": [(g,) for g in genres],
+        "MovieGenres": movie_genres, "ActedIn": acted_in, "Directed": directed,
+        "Friends": friends, "Ratings": ratings,
+    }
+
+
 def mysql_connect():
     return mysql.connector.connect(
         host=MYSQL_HOST, port=MYSQL_PORT,
@@ -131,206 +648,1225 @@ def mysql_connect():
     )
 
 def mysql_reset(cur):
+    mysql_ensure_derived_tables(cur)
     cur.execute("SET FOREIGN_KEY_CHECKS=0")
-    for t in ["Directed","ActedIn","MovieGenres","Ratings","Friends","People","Genres","Movies","Users"]:
+    for t in ["Recommendations","SimilarUsers","UserGenreMask","CoActors","Directed","ActedIn","MovieGenres","Ratings","Friends","People","Genres","Movies","Users"]:
         cur.execute(f"TRUNCATE TABLE {t}")
     cur.execute("SET FOREIGN_KEY_CHECKS=1")
+    # un load bulk intrerupt (conexiune pierduta) poate lasa tabelele fara indexuri secundare
+    mysql_add_missing_indexes(cur)
 
 
-def load_mysql(users, movies, genres, movie_genres, friends, ratings, people, acted_in, directed):
+def load_mysql(users, movies, genres, movie_genres, friends, ratings, people, acted_in, directed,
+               checkpoint: Optional[LoadCheckpoint] = None):
+    rows = table_rows(users, movies, genres, movie_genres, friends, ratings, people, acted_in, directed)
+    ckpt = checkpoint or LoadCheckpoint(None, {})
+    insert = MYSQL_INSERT_IDEMPOTENT if ckpt.resumed else MYSQL_INSERT
 
     conn = mysql_connect()
     cur = conn.cursor()
 
-    print("MySQL: reset...")
-    mysql_reset(cur)
-    conn.commit()
+    if not ckpt.reset_done:
+        print("MySQL: reset...")
+        mysql_reset(cur)
+        conn.commit()
+        ckpt.mark_reset()
 
-    print("MySQL: insert Users...")
-    for batch in tqdm(list(chunked(users, BATCH))):
-        cur.executemany("INSERT INTO Users(userId,name,age,city) VALUES(%s,%s,%s,%s)", batch)
-    conn.commit()
+    for table in TABLE_ORDER:
+        n_batches = -(-len(rows[table]) // BATCH)
+        done = ckpt.batches_done(table)
+        if done >= n_batches:
+            if ckpt.resumed:
+                print(f"MySQL: {table} already loaded, skipped")
+            continue
+        print(f"MySQL: insert {table}..." + (f" (resuming at batch {done}/{n_batches})" if done else ""))
+        # commit + checkpoint dupa fiecare batch
+        for i in tqdm(range(done, n_batches), initial=done, total=n_batches, desc=f"MySQL {table}"):
+            cur.executemany(insert[table], rows[table][i * BATCH:(i + 1) * BATCH])
+            conn.commit()
+            ckpt.mark_batch(table, i)
 
-    print("MySQL: insert Movies...")
-    for batch in tqdm(list(chunked(movies, BATCH))):
-        cur.executemany("INSERT INTO Movies(movieId,title,year) VALUES(%s,%s,%s)", batch)
-    conn.commit()
-    
-    print("MySQL: insert People...")
-    for batch in tqdm(list(chunked(people, BATCH))):
-        cur.executemany("INSERT INTO People(personId,name) VALUES(%s,%s)", batch)
-    conn.commit()
+    if not ckpt.post_load_done:
+        mysql_post_load(conn)
+        ckpt.mark_post_load()
+    cur.close()
+    conn.close()
+    ckpt.finish()
 
+# ---------------- MySQL bulk load (LOAD DATA + indexuri amanate) ----------------
+def _tsv_field(v) -> str:
+    # formatul implicit LOAD DATA: \N = NULL, backslash ca escape
+    if v is None:
+        return "\\N"
+    if isinstance(v, str):
+        return v.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+    return str(v)
 
-    print("MySQL: insert Genres...")
-    cur.executemany("INSERT INTO Genres(name) VALUES(%s)", [(g,) for g in genres])
-    conn.commit()
 
-    print("MySQL: insert MovieGenres...")
-    for batch in tqdm(list(chunked(movie_genres, BATCH))):
-        cur.executemany("INSERT INTO MovieGenres(movieId,genre) VALUES(%s,%s)", batch)
-    conn.commit()
+def write_tsv(path: str, rows) -> int:
+    n = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        for r in rows:
+            f.write("\t".join(_tsv_field(v) for v in r))
+            f.write("\n")
+            n += 1
+    return n
 
-    print("MySQL: insert ActedIn...")
-    for batch in tqdm(list(chunked(acted_in, BATCH))):
-        cur.executemany("INSERT INTO ActedIn(personId,movieId) VALUES(%s,%s)", batch)
-    conn.commit()
 
-    print("MySQL: insert Directed...")
-    for batch in tqdm(list(chunked(directed, BATCH))):
-        cur.executemany("INSERT INTO Directed(personId,movieId) VALUES(%s,%s)", batch)
-    conn.commit()
+def write_csv(path: str, header: List[str], rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        w.writerows(rows)
 
-    
-    print("MySQL: insert Friends...")
-    for batch in tqdm(list(chunked(friends, BATCH))):
-        cur.executemany("INSERT INTO Friends(userId1,userId2,since_year) VALUES(%s,%s,%s)", batch)
-    conn.commit()
 
-    print("MySQL: insert Ratings...")
-    for batch in tqdm(list(chunked(ratings, BATCH))):
-        cur.executemany("INSERT INTO Ratings(userId,movieId,rating) VALUES(%s,%s,%s)", batch)
+def mysql_existing_indexes(cur, table: str) -> set:
+    cur.execute(
+        "SELECT DISTINCT index_name FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = %s",
+        (table,),
+    )
+    return {r[0] for r in cur.fetchall()}
+
+
+def mysql_add_missing_indexes(cur) -> float:
+    """Reface indexurile secundare care lipsesc (un singur ALTER per tabel); intoarce secundele."""
+    by_table = {}
+    for table, index, col in MYSQL_SECONDARY_INDEXES:
+        if index not in mysql_existing_indexes(cur, table):
+            by_table.setdefault(table, []).append(f"ADD INDEX {index} ({col})")
+    t0 = time.perf_counter()
+    for table, adds in by_table.items():
+        cur.execute(f"ALTER TABLE {table} {', '.join(adds)}")
+    return time.perf_counter() - t0
+
+
+def load_mysql_bulk(users, movies, genres, movie_genres, friends, ratings, people, acted_in, directed):
+    """TSV temporar + LOAD DATA LOCAL INFILE per tabel, fara FK/unique checks si fara indexuri secundare."""
+    rows = table_rows(users, movies, genres, movie_genres, friends, ratings, people, acted_in, directed)
+
+    conn = mysql.connector.connect(
+        host=MYSQL_HOST, port=MYSQL_PORT,
+        user=MYSQL_USER, password=MYSQL_PASS,
+        database=MYSQL_DB, autocommit=False,
+        allow_local_infile=True,
+    )
+    cur = conn.cursor()
+
+    print("MySQL(bulk): reset...")
+    mysql_reset(cur)
     conn.commit()
 
-    cur.close()
-    conn.close()
+    cur.execute("SET FOREIGN_KEY_CHECKS=0")
+    cur.execute("SET UNIQUE_CHECKS=0")
 
-# ---------------- Neo4j load ----------------
-def load_neo4j(users, movies, genres, movie_genres, friends, ratings, people, acted_in, directed):
-    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
-    with driver.session() as s:
-        print("Neo4j: reset...")
-        s.run("""
-        MATCH (n)
-        CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS
-        """).consume()
+    stats = []
+    try:
+        print("MySQL(bulk): drop secondary indexes...")
+        for table, index, _ in MYSQL_SECONDARY_INDEXES:
+            if index in mysql_existing_indexes(cur, table):
+                cur.execute(f"ALTER TABLE {table} DROP INDEX {index}")
 
-        # constraints
-        s.run("CREATE CONSTRAINT user_id IF NOT EXISTS FOR (u:User) REQUIRE u.userId IS UNIQUE").consume()
-        s.run("CREATE CONSTRAINT movie_id IF NOT EXISTS FOR (m:Movie) REQUIRE m.movieId IS UNIQUE").consume()
-        s.run("CREATE CONSTRAINT genre_name IF NOT EXISTS FOR (g:Genre) REQUIRE g.name IS UNIQUE").consume()
-        s.run("CREATE CONSTRAINT person_id IF NOT EXISTS FOR (p:Person) REQUIRE p.personId IS UNIQUE").consume()
+        with tempfile.TemporaryDirectory(prefix="graph_bulk_") as tmp:
+            for table in TABLE_ORDER:
+                path = os.path.join(tmp, f"{table}.tsv").replace("\\", "/")
+                n = write_tsv(path, rows[table])
 
+                t0 = time.perf_counter()
+                cur.execute(
+                    f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} "
+                    f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+                    f"({','.join(MYSQL_COLUMNS[table])})",
+                    (path,),
+                )
+                conn.commit()
+                sec = time.perf_counter() - t0
+                stats.append((table, n, sec))
+                print(f"MySQL(bulk): {table}: {n} rows in {sec:.2f}s ({n / max(sec, 1e-9):,.0f} rows/s)")
+    finally:
+        # si dupa o eroare: indexurile si verificarile revin, altfel benchmark-ul ar rula pe alta schema
+        print("MySQL(bulk): rebuild secondary indexes...")
+        try:
+            print(f"MySQL(bulk): indexes rebuilt in {mysql_add_missing_indexes(cur):.2f}s")
+        finally:
+            cur.execute("SET UNIQUE_CHECKS=1")
+            cur.execute("SET FOREIGN_KEY_CHECKS=1")
+            conn.commit()
+    mysql_post_load(conn)
+    cur.close()
+    conn.close()
+    return stats
 
-        print("Neo4j: insert Users...")
-        q_users = """
+
+# ---------------- Neo4j load ----------------
+# tabel -> (query, campurile din tuple in ordinea din rand, batch size)
+NEO4J_MERGE = {
+    "Users": ("""
         UNWIND $rows AS r
         MERGE (u:User {userId: r.userId})
         SET u.name=r.name, u.age=r.age, u.city=r.city
-        """
-        for batch in tqdm(list(chunked(
-            [{"userId":u[0],"name":u[1],"age":u[2],"city":u[3]} for u in users], 2000
-        ))):
-            s.run(q_users, rows=batch).consume()
-
-        print("Neo4j: insert Movies...")
-        q_movies = """
+        """, ["userId", "name", "age", "city"], 2000),
+    "Movies": ("""
         UNWIND $rows AS r
         MERGE (m:Movie {movieId: r.movieId})
         SET m.title=r.title, m.year=r.year
-        """
-        for batch in tqdm(list(chunked(
-            [{"movieId":m[0],"title":m[1],"year":m[2]} for m in movies], 2000
-        ))):
-            s.run(q_movies, rows=batch).consume()
-            
-        print("Neo4j: insert People...")
-        q_people = """
+        """, ["movieId", "title", "year"], 2000),
+    "People": ("""
         UNWIND $rows AS r
         MERGE (p:Person {personId: r.personId})
         SET p.name = r.name
-        """
-        for batch in tqdm(list(chunked(
-            [{"personId":p[0], "name":p[1]} for p in people], 2000
-        ))):
-            s.run(q_people, rows=batch).consume()
-
-
-        print("Neo4j: insert Genres...")
-        q_genres = "UNWIND $rows AS g MERGE (:Genre {name: g})"
-        for batch in tqdm(list(chunked(genres, 5000))):
-            s.run(q_genres, rows=batch).consume()
-
-        print("Neo4j: insert MovieGenres...")
-        q_mg = """
+        """, ["personId", "name"], 2000),
+    "Genres": ("UNWIND $rows AS r MERGE (:Genre {name: r.name})", ["name"], 5000),
+    "MovieGenres": ("""
         UNWIND $rows AS r
         MATCH (m:Movie {movieId:r.movieId})
         MATCH (g:Genre {name:r.genre})
         MERGE (m)-[:IN_GENRE]->(g)
-        """
-        for batch in tqdm(list(chunked(
-            [{"movieId":mg[0],"genre":mg[1]} for mg in movie_genres], 5000
-        ))):
-            s.run(q_mg, rows=batch).consume()
-
-        print("Neo4j: insert ActedIn...")
-        q_act = """
+        """, ["movieId", "genre"], 5000),
+    "ActedIn": ("""
         UNWIND $rows AS r
         MATCH (p:Person {personId:r.personId})
         MATCH (m:Movie {movieId:r.movieId})
         MERGE (p)-[:ACTED_IN]->(m)
-        """
-        for batch in tqdm(list(chunked(
-            [{"personId":a[0], "movieId":a[1]} for a in acted_in], 5000
-        ))):
-            s.run(q_act, rows=batch).consume()
-
-        print("Neo4j: insert Directed...")
-        q_dir = """
+        """, ["personId", "movieId"], 5000),
+    "Directed": ("""
         UNWIND $rows AS r
         MATCH (p:Person {personId:r.personId})
         MATCH (m:Movie {movieId:r.movieId})
         MERGE (p)-[:DIRECTED]->(m)
-        """
-        for batch in tqdm(list(chunked(
-            [{"personId":d[0], "movieId":d[1]} for d in directed], 5000
-        ))):
-            s.run(q_dir, rows=batch).consume()
-
-
-        print("Neo4j: insert Friends...")
-        q_f = """
+        """, ["personId", "movieId"], 5000),
+    "Friends": ("""
         UNWIND $rows AS r
         MATCH (a:User {userId:r.a})
         MATCH (b:User {userId:r.b})
         MERGE (a)-[rel:FRIEND]->(b)
         SET rel.since_year = r.since
-        """
-        for batch in tqdm(list(chunked(
-            [{"a":f[0],"b":f[1],"since":f[2]} for f in friends], 5000
-        ))):
-            s.run(q_f, rows=batch).consume()
-
-        print("Neo4j: insert Ratings...")
-        q_r = """
+        """, ["a", "b", "since"], 5000),
+    "Ratings": ("""
         UNWIND $rows AS r
         MATCH (u:User {userId:r.userId})
         MATCH (m:Movie {movieId:r.movieId})
         MERGE (u)-[rel:RATED]->(m)
         SET rel.rating = r.rating
-        """
-        for batch in tqdm(list(chunked(
-            [{"userId":r[0],"movieId":r[1],"rating":r[2]} for r in ratings], 5000
-        ))):
-            s.run(q_r, rows=batch).consume()
+        """, ["userId", "movieId", "rating"], 5000),
+}
+
+
+def neo4j_params(table: str, batch):
+    fields = NEO4J_MERGE[table][1]
+    return [dict(zip(fields, r)) for r in batch]
+
+
+def neo4j_reset(s):
+    s.run("""
+    MATCH (n)
+    CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS
+    """).consume()
+
+    # constraints
+    s.run("CREATE CONSTRAINT user_id IF NOT EXISTS FOR (u:User) REQUIRE u.userId IS UNIQUE").consume()
+    s.run("CREATE CONSTRAINT movie_id IF NOT EXISTS FOR (m:Movie) REQUIRE m.movieId IS UNIQUE").consume()
+    s.run("CREATE CONSTRAINT genre_name IF NOT EXISTS FOR (g:Genre) REQUIRE g.name IS UNIQUE").consume()
+    s.run("CREATE CONSTRAINT person_id IF NOT EXISTS FOR (p:Person) REQUIRE p.personId IS UNIQUE").consume()
+
+
+def neo4j_bump_data_version(s):
+    # semnal pentru cache-ul din neo4j_cli.py: orice incarcare schimba :DataVersion -> cache invalidat
+    s.run("MERGE (v:DataVersion {id: 1}) SET v.updatedAt = timestamp()").consume()
+
+
+def load_neo4j(users, movies, genres, movie_genres, friends, ratings, people, acted_in, directed,
+               checkpoint: Optional[LoadCheckpoint] = None):
+    rows = table_rows(users, movies, genres, movie_genres, friends, ratings, people, acted_in, directed)
+    ckpt = checkpoint or LoadCheckpoint(None, {})
+
+    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
+    with driver.session() as s:
+        if not ckpt.reset_done:
+            print("Neo4j: reset...")
+            neo4j_reset(s)
+            ckpt.mark_reset()
+
+        for table in TABLE_ORDER:
+            query, _, size = NEO4J_MERGE[table]
+            n_batches = -(-len(rows[table]) // size)
+            done = ckpt.batches_done(table)
+            if done >= n_batches:
+                if ckpt.resumed:
+                    print(f"Neo4j: {table} already loaded, skipped")
+                continue
+            print(f"Neo4j: insert {table}..." + (f" (resuming at batch {done}/{n_batches})" if done else ""))
+            t0 = time.perf_counter()
+            # dict-urile se construiesc doar pentru batch-ul curent; MERGE -> reluarea e idempotenta
+            for i in tqdm(range(done, n_batches), initial=done, total=n_batches, desc=f"Neo4j {table}"):
+                s.run(query, rows=neo4j_params(table, rows[table][i * size:(i + 1) * size])).consume()
+                ckpt.mark_batch(table, i)
+            if table in NEO4J_REL_TABLES:
+                sec = time.perf_counter() - t0
+                n = len(rows[table]) - done * size
+                print(f"Neo4j: {table}: {n / max(sec, 1e-9):,.0f} rels/s (MERGE)")
+
+        if not ckpt.post_load_done:
+            neo4j_post_load(s)
+            ckpt.mark_post_load()
 
     driver.close()
+    ckpt.finish()
+
+
+# ---------------- Neo4j fast load (CREATE + workeri paraleli) ----------------
+# Dupa reset + constraints datele sunt unice, deci MERGE (lookup + lock) e munca in plus.
+NEO4J_WORKERS = 4
+
+NEO4J_CREATE = {
+    "Users": "UNWIND $rows AS r CREATE (:User {userId: r.userId, name: r.name, age: r.age, city: r.city})",
+    "Movies": "UNWIND $rows AS r CREATE (:Movie {movieId: r.movieId, title: r.title, year: r.year})",
+    "People": "UNWIND $rows AS r CREATE (:Person {personId: r.personId, name: r.name})",
+    "Genres": "UNWIND $rows AS r CREATE (:Genre {name: r.name})",
+    "MovieGenres": """
+        UNWIND $rows AS r
+        MATCH (m:Movie {movieId:r.movieId})
+        MATCH (g:Genre {name:r.genre})
+        CREATE (m)-[:IN_GENRE]->(g)
+        """,
+    "ActedIn": """
+        UNWIND $rows AS r
+        MATCH (p:Person {personId:r.personId})
+        MATCH (m:Movie {movieId:r.movieId})
+        CREATE (p)-[:ACTED_IN]->(m)
+        """,
+    "Directed": """
+        UNWIND $rows AS r
+        MATCH (p:Person {personId:r.personId})
+        MATCH (m:Movie {movieId:r.movieId})
+        CREATE (p)-[:DIRECTED]->(m)
+        """,
+    "Friends": """
+        UNWIND $rows AS r
+        MATCH (a:User {userId:r.a})
+        MATCH (b:User {userId:r.b})
+        CREATE (a)-[:FRIEND {since_year: r.since}]->(b)
+        """,
+    "Ratings": """
+        UNWIND $rows AS r
+        MATCH (u:User {userId:r.userId})
+        MATCH (m:Movie {movieId:r.movieId})
+        CREATE (u)-[:RATED {rating: r.rating}]->(m)
+        """,
+}
+
+# tabele de relatii -> capetele au aceeasi eticheta? (FRIEND: User-User)
+NEO4J_REL_TABLES = {
+    "MovieGenres": False,
+    "ActedIn": False,
+    "Directed": False,
+    "Friends": True,
+    "Ratings": False,
+}
+
+
+def _node_group(v, k: int) -> int:
+    return (v if isinstance(v, int) else zlib.crc32(str(v).encode())) % k
+
+
+def partition_rounds(rows, k: int, same_label: bool):
+    """Imparte relatiile in runde de celule care nu ating aceleasi noduri.
+
+    Nodurile sunt impartite in k grupuri; o relatie (a, b) ajunge in celula (grup(a), grup(b)).
+    Intr-o runda fiecare grup apare o singura data, deci workerii din aceeasi runda nu se
+    blocheaza pe aceleasi noduri. Pentru User-User (same_label) k trebuie sa fie par.
+    """
+    cells = {}
+    if isinstance(rows, EdgeTable):
+        # capetele sunt id-uri intregi -> grupurile se calculeaza vectorizat, celulele raman EdgeTable
+        a, b = rows.cols[0] % k, rows.cols[1] % k
+        if same_label:
+            a, b = np.minimum(a, b), np.maximum(a, b)
+        cell = a.astype(np.int64) * k + b
+        order = np.argsort(cell, kind="stable")
+        ids, starts = np.unique(cell[order], return_index=True)
+        for c, idx in zip(ids.tolist(), np.split(order, starts[1:])):
+            cells[divmod(c, k)] = rows.take(idx)
+    else:
+        for r in rows:
+            a, b = _node_group(r[0], k), _node_group(r[1], k)
+            key = (min(a, b), max(a, b)) if same_label else (a, b)
+            cells.setdefault(key, []).append(r)
+
+    if same_label:
+        # diagonala + round-robin (metoda cercului): fiecare runda e o potrivire perfecta a grupurilor
+        rounds = [[(i, i) for i in range(k)]]
+        ids = list(range(k))
+        for _ in range(k - 1):
+            rounds.append([(min(ids[i], ids[k - 1 - i]), max(ids[i], ids[k - 1 - i])) for i in range(k // 2)])
+            ids = [ids[0], ids[-1]] + ids[1:-1]
+    else:
+        rounds = [[(i, (i + r) % k) for i in range(k)] for r in range(k)]
+
+    return [[cells[c] for c in rnd if c in cells] for rnd in rounds]
+
+
+def load_neo4j_fast(users, movies, genres, movie_genres, friends, ratings, people, acted_in, directed,
+                    workers: int = NEO4J_WORKERS):
+    rows = table_rows(users, movies, genres, movie_genres, friends, ratings, people, acted_in, directed)
+
+    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
+    with driver.session() as s:
+        print("Neo4j(fast): reset...")
+        neo4j_reset(s)
+
+        for table in TABLE_ORDER:
+            if table in NEO4J_REL_TABLES:
+                continue
+            print(f"Neo4j(fast): create {table}...")
+            for batch in tqdm(chunked(rows[table], BATCH), total=-(-len(rows[table]) // BATCH), desc=f"Neo4j {table}"):
+                s.run(NEO4J_CREATE[table], rows=neo4j_params(table, batch)).consume()
+
+    def load_cell(table: str, cell_rows):
+        with driver.session() as ws:
+            for batch in chunked(cell_rows, BATCH):
+                ws.run(NEO4J_CREATE[table], rows=neo4j_params(table, batch)).consume()
+
+    total_rels, total_sec = 0, 0.0
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        for table in TABLE_ORDER:
+            if table not in NEO4J_REL_TABLES:
+                continue
+            same_label = NEO4J_REL_TABLES[table]
+            k = 2 * workers if same_label else workers
+            t0 = time.perf_counter()
+            for cells in partition_rounds(rows[table], k, same_label):
+                list(ex.map(lambda c: load_cell(table, c), cells))
+            sec = time.perf_counter() - t0
+            n = len(rows[table])
+            total_rels += n
+            total_sec += sec
+            print(f"Neo4j(fast): {table}: {n} rels in {sec:.2f}s ({n / max(sec, 1e-9):,.0f} rels/s, {workers} workers)")
+
+    print(f"Neo4j(fast): relationships total {total_rels / max(total_sec, 1e-9):,.0f} rels/s")
+    with driver.session() as s:
+        neo4j_post_load(s)
+    driver.close()
+
+
+# ---------------- Neo4j: CSV pentru neo4j-admin database import ----------------
+# Importul offline nu ruleaza neo4j_post_load, deci datele derivate (u.genreMask, g.bit, CO_ACTED,
+# :DataVersion) sunt calculate aici din acelasi dataset si scrise direct in CSV-uri.
+# tabel -> (fisier, eticheta / tip, header, (rand, derivate) -> coloane)
+NEO4J_ADMIN_NODES = {
+    "Users": ("users.csv", "User", [":ID(User)", "userId:int", "name", "age:int", "city", "genreMask:long"],
+              lambda r, d: (r[0],) + tuple(r) + (int(d["genreMask"][r[0]]),)),
+    "Movies": ("movies.csv", "Movie", [":ID(Movie)", "movieId:int", "title", "year:int"], lambda r, d: (r[0],) + tuple(r)),
+    "People": ("people.csv", "Person", [":ID(Person)", "personId:int", "name"], lambda r, d: (r[0],) + tuple(r)),
+    "Genres": ("genres.csv", "Genre", [":ID(Genre)", "name", "bit:int"], lambda r, d: (r[0], r[0], d["genreBit"][r[0]])),
+}
+NEO4J_ADMIN_RELS = {
+    "MovieGenres": ("in_genre.csv", "IN_GENRE", [":START_ID(Movie)", ":END_ID(Genre)"]),
+    "ActedIn": ("acted_in.csv", "ACTED_IN", [":START_ID(Person)", ":END_ID(Movie)"]),
+    "Directed": ("directed.csv", "DIRECTED", [":START_ID(Person)", ":END_ID(Movie)"]),
+    "Friends": ("friend.csv", "FRIEND", [":START_ID(User)", ":END_ID(User)", "since_year:int"]),
+    "Ratings": ("rated.csv", "RATED", [":START_ID(User)", ":END_ID(Movie)", "rating:float"]),
+}
+NEO4J_ADMIN_CO_ACTED = ("co_acted.csv", "CO_ACTED", [":START_ID(Person)", ":END_ID(Person)", "together:int"])
+NEO4J_ADMIN_VERSION = ("data_version.csv", "DataVersion", [":ID(DataVersion)", "id:int", "updatedAt:long"])
+NEO4J_GENRE_MASK_BITS = 63   # u.genreMask e Integer Neo4j (int64 cu semn)
+
+
+def coactor_pairs(acted_in) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(personId1, personId2, together) cu personId1 < personId2, ca rebuild_coactors_*."""
+    p, m = (c.astype(np.int64) for c in acted_in.cols)
+    if not p.size:
+        return p, p, p
+    base = int(p.max()) + 1
+    key = np.unique(m * base + p)              # (film, persoana) distincte, sortate pe film apoi persoana
+    m, p = key // base, key % base
+    lo, hi = [], []
+    k = 1
+    while k < m.size:
+        same = m[k:] == m[:-k]                 # randurile i si i+k din acelasi film -> p[i] < p[i+k]
+        if not same.any():
+            break
+        lo.append(p[:-k][same])
+        hi.append(p[k:][same])
+        k += 1
+    if not lo:
+        return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.int64)
+    pairs, together = np.unique(np.concatenate(lo) * base + np.concatenate(hi), return_counts=True)
+    return pairs // base, pairs % base, together
+
+
+def user_genre_masks(users, genres, movie_genres, ratings) -> Tuple[np.ndarray, Dict[str, int]]:
+    """Masca de genuri per userId (index = userId) si bitul fiecarui gen, ca rebuild_genre_masks_*."""
+    if len(genres) > NEO4J_GENRE_MASK_BITS:
+        raise ValueError(f"{len(genres)} genres do not fit in a {NEO4J_GENRE_MASK_BITS}-bit genreMask")
+    bit = {g: i for i, g in enumerate(sorted(genres))}
+    r_user, r_movie = (c.astype(np.int64) for c in ratings.cols[:2])
+    n_movies = max([mid for mid, _ in movie_genres] + [int(r_movie.max()) if r_movie.size else 0]) + 1
+    movie_mask = np.zeros(n_movies, dtype=np.int64)
+    for mid, g in movie_genres:
+        movie_mask[mid] |= 1 << bit[g]
+    mask = np.zeros(max(u[0] for u in users) + 1, dtype=np.int64)
+    np.bitwise_or.at(mask, r_user, movie_mask[r_movie])
+    return mask, bit
+
+
+def export_neo4j_admin_csv(out_dir: str, users, movies, genres, movie_genres, friends, ratings, people,
+                           acted_in, directed, database: str = "neo4j"):
+    """Scrie CSV-uri pentru import offline; intoarce comanda neo4j-admin de rulat (cu serverul oprit)."""
+    rows = table_rows(users, movies, genres, movie_genres, friends, ratings, people, acted_in, directed)
+    os.makedirs(out_dir, exist_ok=True)
+
+    t0 = time.perf_counter()
+    genre_mask, genre_bit = user_genre_masks(users, genres, movie_genres, ratings)
+    derived = {"genreMask": genre_mask, "genreBit": genre_bit}
+    co_acted = coactor_pairs(acted_in)
+    print(f"Neo4j(csv): genreMask, CO_ACTED computed in {time.perf_counter() - t0:.2f}s")
+
+    args = []
+    for table in TABLE_ORDER:
+        t0 = time.perf_counter()
+        if table in NEO4J_ADMIN_NODES:
+            fname, label, header, conv = NEO4J_ADMIN_NODES[table]
+            out_rows = (conv(r, derived) for r in rows[table])
+            args.append(f"--nodes={label}={os.path.join(out_dir, fname)}")
+        else:
+            fname, rel_type, header = NEO4J_ADMIN_RELS[table]
+            out_rows = rows[table]
+            args.append(f"--relationships={rel_type}={os.path.join(out_dir, fname)}")
+        write_csv(os.path.join(out_dir, fname), header, out_rows)
+        sec = time.perf_counter() - t0
+        n = len(rows[table])
+        kind = "rels" if table in NEO4J_ADMIN_RELS else "nodes"
+        print(f"Neo4j(csv): {fname}: {n} {kind} in {sec:.2f}s ({n / max(sec, 1e-9):,.0f} {kind}/s)")
+
+    fname, rel_type, header = NEO4J_ADMIN_CO_ACTED
+    write_csv(os.path.join(out_dir, fname), header, zip(*(c.tolist() for c in co_acted)))
+    args.append(f"--relationships={rel_type}={os.path.join(out_dir, fname)}")
+    print(f"Neo4j(csv): {fname}: {co_acted[0].size} rels")
+    # un import nou = date noi pentru cache-ul din neo4j_cli.py (ca neo4j_bump_data_version)
+    fname, label, header = NEO4J_ADMIN_VERSION
+    write_csv(os.path.join(out_dir, fname), header, [(1, 1, int(time.time() * 1000))])
+    args.append(f"--nodes={label}={os.path.join(out_dir, fname)}")
+
+    cmd = f"neo4j-admin database import full {database} --overwrite-destination " + " ".join(args)
+    print("\nNeo4j(csv): run with the server stopped, then create the constraints from neo4j_reset():")
+    print(cmd)
+    return cmd
+
+
+# ---------------- Tabele derivate (precalculate dupa load) ----------------
+# Se reconstruiesc la sfarsitul fiecarui mod de load (mysql_post_load / neo4j_post_load).
+# Q7: perechile de co-actori se schimba doar cand se schimba ActedIn, deci le materializam
+# o data dupa load (CoActors in MySQL, CO_ACTED in Neo4j) si apoi le actualizam incremental.
+def rebuild_coactors_mysql(cur):
+    cur.execute("TRUNCATE TABLE CoActors")
+    cur.execute("""
+        INSERT INTO CoActors(personId1, personId2, together)
+        SELECT a1.personId, a2.personId, COUNT(*)
+        FROM ActedIn a1
+        JOIN ActedIn a2 ON a1.movieId = a2.movieId AND a1.personId < a2.personId
+        GROUP BY a1.personId, a2.personId
+    """)
+
+
+def rebuild_coactors_neo4j(s):
+    s.run("""
+    MATCH ()-[c:CO_ACTED]->()
+    CALL { WITH c DELETE c } IN TRANSACTIONS OF 10000 ROWS
+    """).consume()
+    s.run("""
+    MATCH (p1:Person)-[:ACTED_IN]->(m:Movie)<-[:ACTED_IN]-(p2:Person)
+    WHERE p1.personId < p2.personId
+    WITH p1, p2, count(DISTINCT m) AS together
+    CALL { WITH p1, p2, together CREATE (p1)-[:CO_ACTED {together: together}]->(p2) } IN TRANSACTIONS OF 10000 ROWS
+    """).consume()
+
+
+def add_acted_in_mysql(conn, rows) -> int:
+    """Insereaza randuri ActedIn noi si actualizeaza doar perechile CoActors afectate (cateva statement-uri per batch)."""
+    cur = conn.cursor()
+    cur.execute("""
+        CREATE TEMPORARY TABLE IF NOT EXISTS NewActedIn (
+          personId INT NOT NULL, movieId INT NOT NULL, PRIMARY KEY (personId, movieId)
+        )
+    """)
+    cur.execute("DELETE FROM NewActedIn")
+    cur.executemany("INSERT IGNORE INTO NewActedIn(personId, movieId) VALUES(%s,%s)", list(rows))
+    # randurile care exista deja -> perechile lor sunt deja numarate
+    cur.execute("DELETE n FROM NewActedIn n JOIN ActedIn a ON a.personId = n.personId AND a.movieId = n.movieId")
+    cur.execute("SELECT personId, movieId FROM NewActedIn")
+    new = cur.fetchall()
+
+    # actor nou x actor existent in acelasi film (ActedIn inca nu contine randurile noi)
+    cur.execute("""
+        INSERT INTO CoActors(personId1, personId2, together)
+        SELECT p1, p2, cnt FROM (
+          SELECT LEAST(n.personId, a.personId) AS p1, GREATEST(n.personId, a.personId) AS p2, COUNT(*) AS cnt
+          FROM NewActedIn n
+          JOIN ActedIn a ON a.movieId = n.movieId
+          GROUP BY p1, p2
+        ) x
+        ON DUPLICATE KEY UPDATE together = together + x.cnt
+    """)
+    # actor nou x actor nou: tabela temporara nu poate aparea de doua ori intr-un query MySQL -> in Python
+    cast: Dict[int, List[int]] = {}
+    for pid, mid in new:
+        cast.setdefault(mid, []).append(pid)
+    pairs: Dict[Tuple[int, int], int] = {}
+    for pids in cast.values():
+        pids.sort()
+        for i, a in enumerate(pids):
+            for b in pids[i + 1:]:
+                pairs[(a, b)] = pairs.get((a, b), 0) + 1
+    cur.executemany(
+        "INSERT INTO CoActors(personId1, personId2, together) VALUES(%s,%s,%s) "
+        "ON DUPLICATE KEY UPDATE together = together + VALUES(together)",
+        [(a, b, n) for (a, b), n in pairs.items()],
+    )
+    cur.execute("INSERT INTO ActedIn(personId, movieId) SELECT personId, movieId FROM NewActedIn")
+    conn.commit()
+    cur.close()
+    return len(new)
+
+
+def _add_acted_in_neo4j_tx(tx, rows) -> int:
+    new = tx.run("""
+    UNWIND $rows AS r
+    MATCH (p:Person {personId: r[0]}), (m:Movie {movieId: r[1]})
+    WHERE NOT (p)-[:ACTED_IN]->(m)
+    CREATE (p)-[:ACTED_IN]->(m)
+    RETURN r AS row
+    """, rows=rows).value("row")
+    if not new:
+        return 0
+    # fiecare rol nou cu toti actorii filmului; o pereche de doi actori noi se numara o singura data
+    tx.run("""
+    UNWIND $new AS r
+    MATCH (p:Person {personId: r[0]})-[:ACTED_IN]->(:Movie {movieId: r[1]})<-[:ACTED_IN]-(o:Person)
+    WHERE NOT [o.personId, r[1]] IN $new OR o.personId > p.personId
+    WITH CASE WHEN p.personId < o.personId THEN p ELSE o END AS a,
+         CASE WHEN p.personId < o.personId THEN o ELSE p END AS b, count(*) AS n
+    MERGE (a)-[c:CO_ACTED]->(b)
+    ON CREATE SET c.together = n
+    ON MATCH SET c.together = c.together + n
+    """, new=new).consume()
+    return len(new)
+
+
+def add_acted_in_neo4j(s, rows) -> int:
+    """Echivalentul Neo4j al add_acted_in_mysql, intr-o singura tranzactie."""
+    rows = [[int(p), int(m)] for p, m in dict.fromkeys((p, m) for p, m in rows)]   # fara duplicate in batch
+    added = s.execute_write(_add_acted_in_neo4j_tx, rows)
+    neo4j_bump_data_version(s)
+    return added
+
+
+# Q4: cu N_GENRES mic, multimea de genuri a unui user incape intr-un intreg.
+# Bitul unui gen = pozitia lui in Genres ordonat dupa nume (acelasi pe ambele backend-uri).
+MYSQL_GENRE_BITS = "SELECT name, ROW_NUMBER() OVER (ORDER BY name) - 1 AS bit FROM Genres"
+
+
+def rebuild_genre_masks_mysql(cur):
+    cur.execute("TRUNCATE TABLE UserGenreMask")
+    cur.execute(f"""
+        INSERT INTO UserGenreMask(userId, genreMask)
+        SELECT r.userId, BIT_OR(1 << gb.bit)
+        FROM Ratings r
+        JOIN MovieGenres mg ON mg.movieId = r.movieId
+        JOIN ({MYSQL_GENRE_BITS}) gb ON gb.name = mg.genre
+        GROUP BY r.userId
+    """)
+
+
+def rebuild_genre_masks_neo4j(s):
+    # Cypher nu are operatori pe biti: OR peste biti distincti = suma puterilor lui 2
+    s.run("""
+    MATCH (g:Genre)
+    WITH g ORDER BY g.name
+    WITH collect(g) AS gs
+    UNWIND range(0, size(gs) - 1) AS i
+    WITH gs[i] AS g, i
+    SET g.bit = i
+    """).consume()
+    s.run("""
+    MATCH (u:User)
+    CALL {
+      WITH u
+      OPTIONAL MATCH (u)-[:RATED]->(:Movie)-[:IN_GENRE]->(g:Genre)
+      WITH DISTINCT g.bit AS bit
+      RETURN sum(CASE WHEN bit IS NULL THEN 0 ELSE toInteger(2 ^ bit) END) AS mask
+    }
+    SET u.genreMask = mask
+    """).consume()
+
+
+def add_ratings_mysql(conn, rows) -> int:
+    """Insereaza/actualizeaza ratinguri si adauga genurile filmelor in masca userilor."""
+    rows = list(rows)
+    cur = conn.cursor()
+    cur.executemany(
+        "INSERT INTO Ratings(userId, movieId, rating) VALUES(%s,%s,%s) "
+        "ON DUPLICATE KEY UPDATE rating = VALUES(rating)",
+        rows,
+    )
+    # un rating nou poate doar adauga genuri -> OR cu genurile filmelor noi e suficient
+    pairs = sorted({(uid, mid) for uid, mid, _ in rows})
+    for batch in chunked(pairs, 1000):
+        cur.execute(f"""
+            INSERT INTO UserGenreMask(userId, genreMask)
+            SELECT r.userId, BIT_OR(COALESCE(1 << gb.bit, 0))
+            FROM Ratings r
+            LEFT JOIN MovieGenres mg ON mg.movieId = r.movieId
+            LEFT JOIN ({MYSQL_GENRE_BITS}) gb ON gb.name = mg.genre
+            WHERE (r.userId, r.movieId) IN ({", ".join(["(%s,%s)"] * len(batch))})
+            GROUP BY r.userId
+            ON DUPLICATE KEY UPDATE genreMask = genreMask | VALUES(genreMask)
+        """, [v for p in batch for v in p])
+    conn.commit()
+    cur.close()
+    return len(rows)
+
+
+def _add_ratings_neo4j_tx(tx, rows):
+    tx.run(NEO4J_MERGE["Ratings"][0], rows=neo4j_params("Ratings", rows)).consume()
+    tx.run("""
+    UNWIND $rows AS r
+    MATCH (u:User {userId: r.userId})-[:RATED]->(:Movie {movieId: r.movieId})-[:IN_GENRE]->(g:Genre)
+    WITH u, collect(DISTINCT toInteger(2 ^ g.bit)) AS bits
+    SET u.genreMask = reduce(m = coalesce(u.genreMask, 0), b IN bits |
+                             CASE WHEN (m / b) % 2 = 1 THEN m ELSE m + b END)
+    """, rows=neo4j_params("Ratings", rows)).consume()
+
+
+def add_ratings_neo4j(s, rows) -> int:
+    """Echivalentul Neo4j al add_ratings_mysql, intr-o singura tranzactie."""
+    rows = list(rows)
+    s.execute_write(_add_ratings_neo4j_tx, rows)
+    neo4j_bump_data_version(s)
+    return len(rows)
+
+
+def mysql_post_load(conn):
+    cur = conn.cursor()
+    mysql_ensure_derived_tables(cur)   # --resume poate sari peste mysql_reset
+    t0 = time.perf_counter()
+    rebuild_coactors_mysql(cur)
+    rebuild_genre_masks_mysql(cur)
+    conn.commit()
+    print(f"MySQL: CoActors, UserGenreMask rebuilt in {time.perf_counter() - t0:.2f}s")
+    cur.close()
+
+
+def neo4j_post_load(s):
+    t0 = time.perf_counter()
+    rebuild_coactors_neo4j(s)
+    rebuild_genre_masks_neo4j(s)
+    print(f"Neo4j: CO_ACTED, genreMask rebuilt in {time.perf_counter() - t0:.2f}s")
+    neo4j_bump_data_version(s)
+
+
+# ---------------- Pipeline: generare -> cozi -> loadere ----------------
+# Generatorul NumPy pune batch-uri in cate o coada marginita per backend; workerii incarca in paralel
+# cu generarea. Memoria ramane ~PIPELINE_QUEUE batch-uri, nu tot datasetul.
+PIPELINE_QUEUE = 8
+PIPELINE_ABORT = object()   # pus in cozi cand producatorul esueaza: loaderele se opresc fara post-load
+
+
+def _mysql_consumer(items, stats: dict):
+    conn = mysql_connect()
+    cur = conn.cursor()
+    mysql_reset(cur)
+    conn.commit()
+    current = None
+    for table, batch in items:
+        if table != current:
+            conn.commit()
+            current = table
+        cur.executemany(MYSQL_INSERT[table], batch)
+        stats[table] = stats.get(table, 0) + len(batch)
+    conn.commit()
+    mysql_post_load(conn)
+    cur.close()
+    conn.close()
+
+
+def _neo4j_consumer(items, stats: dict):
+    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
+    try:
+        with driver.session() as s:
+            neo4j_reset(s)
+            for table, batch in items:
+                s.run(NEO4J_MERGE[table][0], rows=neo4j_params(table, batch)).consume()
+                stats[table] = stats.get(table, 0) + len(batch)
+            neo4j_post_load(s)
+    finally:
+        driver.close()
+
+
+def _run_consumer(name: str, fn, q: "queue.Queue", report: dict):
+    stats: dict = {}
+    report[name] = {"rows": stats, "error": None, "seconds": 0.0}
+    finished = False
+
+    def items():
+        nonlocal finished
+        while True:
+            item = q.get()
+            if item is None:
+                finished = True
+                return
+            if item is PIPELINE_ABORT:
+                finished = True
+                raise RuntimeError("pipeline aborted: the generator failed")
+            yield item
+
+    t0 = time.perf_counter()
+    try:
+        fn(items(), stats)
+    except BaseException as e:  # raportam, dar golim coada ca producatorul sa nu se blocheze
+        report[name]["error"] = e
+        # q.get() direct: items() ar ridica la PIPELINE_ABORT si eroarea reala s-ar pierde
+        while not finished:
+            item = q.get()
+            finished = item is None or item is PIPELINE_ABORT
+    finally:
+        report[name]["seconds"] = time.perf_counter() - t0
 
-def main():
-    print("Generating data...")
+
+def run_pipeline(seed: int = SEED, chunk: int = GEN_CHUNK, backends=("mysql", "neo4j")):
+    consumers = {"mysql": _mysql_consumer, "neo4j": _neo4j_consumer}
+    queues = {b: queue.Queue(maxsize=PIPELINE_QUEUE) for b in backends}
+    report: dict = {}
+    workers = [
+        threading.Thread(target=_run_consumer, args=(b, consumers[b], queues[b], report), name=f"load-{b}")
+        for b in backends
+    ]
+    for w in workers:
+        w.start()
+
+    t0 = time.perf_counter()
+    gen_seconds = 0.0
+    end = None
+    try:
+        chunks = gen_dataset_chunks(seed, chunk)
+        while True:
+            tg = time.perf_counter()
+            item = next(chunks, None)
+            if item is None:
+                break
+            table, cols = item
+            n = len(cols[0])
+            batches = [chunk_rows([c[i:i + BATCH] for c in cols]) for i in range(0, n, BATCH)]
+            gen_seconds += time.perf_counter() - tg
+            for batch in batches:
+                for q in queues.values():
+                    q.put((table, batch))      # blocheaza cand loaderul e in urma (backpressure)
+    except BaseException:
+        end = PIPELINE_ABORT
+        # batch-urile ramase in coada nu mai conteaza; loaderele se opresc la PIPELINE_ABORT
+        for q in queues.values():
+            while True:
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    break
+        raise
+    finally:
+        # altfel thread-urile (non-daemon) raman blocate in q.get() si procesul nu se mai termina
+        for q in queues.values():
+            q.put(end)
+        for w in workers:
+            w.join()
+    wall = time.perf_counter() - t0
+
+    print(f"\nPipeline: generate={gen_seconds:.2f}s wall={wall:.2f}s")
+    for b in backends:
+        r = report[b]
+        status = "OK" if r["error"] is None else f"FAILED: {r['error']}"
+        print(f"  {b}: load={r['seconds']:.2f}s rows={sum(r['rows'].values())} {status}")
+    for b in backends:
+        if report[b]["error"] is not None:
+            raise RuntimeError(f"pipeline: {b} loader failed") from report[b]["error"]
+    return report
+
+
+@dataclass
+class Dataset:
+    users: List[Tuple[int, str, int, str]]
+    movies: List[Tuple[int, str, int]]
+    genres: List[str]
+    movie_genres: List[Tuple[int, str]]
+    friends: EdgeTable      # (userId1, userId2, since_year)
+    ratings: EdgeTable      # (userId, movieId, rating)
+    people: List[Tuple[int, str]]
+    acted_in: EdgeTable     # (personId, movieId)
+    directed: EdgeTable     # (personId, movieId)
+
+    def tables(self):
+        # aceeasi ordine ca parametrii lui load_mysql / load_neo4j
+        return (
+            self.users, self.movies, self.genres, self.movie_genres,
+            self.friends, self.ratings, self.people, self.acted_in, self.directed,
+        )
+
+
+def generate_dataset(seed: int = SEED) -> Dataset:
+    """Genereaza tot datasetul; acelasi seed -> exact aceleasi randuri (si in benchmark)."""
+    random.seed(seed)
 
     users = gen_users(N_USERS)
     movies = gen_movies(N_MOVIES)
     genres = gen_genres(N_GENRES)
     movie_genres = gen_movie_genres(N_MOVIES, genres)
 
-    friends = gen_friend_edges(N_USERS, AVG_FRIENDS)
-    ratings = gen_ratings(N_USERS, N_MOVIES, RATINGS_PER_USER)
+    if GRAPH_MODEL == "powerlaw":
+        friends = EdgeTable.from_chunks(gen_friend_edges_powerlaw(N_USERS, AVG_FRIENDS, seed), EDGE_DTYPES["Friends"])
+        ratings = EdgeTable.from_chunks(gen_ratings_powerlaw(N_USERS, N_MOVIES, RATINGS_PER_USER, seed),
+                                        EDGE_DTYPES["Ratings"])
+    else:
+        friends = gen_friend_edges(N_USERS, AVG_FRIENDS)
+        ratings = gen_ratings(N_USERS, N_MOVIES, RATINGS_PER_USER)
 
     people = gen_people(N_PEOPLE)
     acted_in = gen_acted_in(N_MOVIES, N_PEOPLE)
     directed = gen_directed(N_MOVIES, N_PEOPLE)
 
+    return Dataset(users, movies, genres, movie_genres, friends, ratings, people, acted_in, directed)
+
+
+def generate_dataset_np(seed: int = SEED, chunk: int = GEN_CHUNK) -> Dataset:
+    """Dataset complet din generatorul NumPy (pentru loaderele care primesc liste)."""
+    tables = {t: [] for t in TABLE_ORDER}
+    for table, cols in gen_dataset_chunks(seed, chunk):
+        if table in EDGE_DTYPES:
+            tables[table].append([c.astype(dt, copy=False) for c, dt in zip(cols, EDGE_DTYPES[table])])
+        else:
+            tables[table].extend(chunk_rows(cols))
+    for table in EDGE_DTYPES:
+        tables[table] = EdgeTable.from_chunks(tables[table], EDGE_DTYPES[table])
+    genres = [g for (g,) in tables["Genres"]]
+    return Dataset(
+        tables["Users"], tables["Movies"], genres, tables["MovieGenres"],
+        tables["Friends"], tables["Ratings"], tables["People"], tables["ActedIn"], tables["Directed"],
+    )
+
+
+def build_dataset(generator: str = "python", seed: int = SEED) -> Dataset:
+    """Datasetul pentru --generator python | numpy (modelul de graf vine din GRAPH_MODEL)."""
+    return generate_dataset_np(seed) if generator == "numpy" else generate_dataset(seed)
+
+
+# ---------------- Delta load (peste datele existente, fara reset) ----------------
+# Useri noi + prietenii + ratinguri aplicate peste ce e deja in baze: upsert in MySQL,
+# MERGE in Neo4j, apoi count + checksum per tabel ca sa confirmam ca bazele inca se potrivesc.
+DELTA_USERS = 1000
+DELTA_FRIENDS = 5000      # muchii neorientate noi (cate 2 randuri fiecare, ca gen_friend_edges)
+DELTA_RATINGS = 10000
+DELTA_ACTED_IN = 500      # roluri noi (person, movie existente) -> CoActors / CO_ACTED incremental
+
+MYSQL_UPSERT = {
+    "Users": MYSQL_INSERT["Users"] + " ON DUPLICATE KEY UPDATE name=VALUES(name), age=VALUES(age), city=VALUES(city)",
+    "Friends": MYSQL_INSERT["Friends"] + " ON DUPLICATE KEY UPDATE since_year=VALUES(since_year)",
+    # Ratings: prin add_ratings_mysql (upsert + UserGenreMask); ActedIn: prin add_acted_in_mysql (+ CoActors)
+}
+
+# suma cheilor codate (id * 1000003 + id) modulo un prim: la ~1M useri suma bruta depaseste int64 in Cypher
+DELTA_MOD = 1_000_000_007
+# (sql, cypher) -> acelasi tuplu (count, suma cheilor codate mod DELTA_MOD, suma valorilor) pe ambele backend-uri
+DELTA_CHECKS = {
+    "Users": (
+        "SELECT COUNT(*), COALESCE(SUM(userId), 0), COALESCE(SUM(age), 0) FROM Users",
+        "MATCH (u:User) RETURN count(u), coalesce(sum(u.userId), 0), coalesce(sum(u.age), 0)",
+    ),
+    "Friends": (
+        f"SELECT COUNT(*), COALESCE(SUM((userId1 * 1000003 + userId2) % {DELTA_MOD}), 0) % {DELTA_MOD}, "
+        "COALESCE(SUM(since_year), 0) FROM Friends",
+        "MATCH (a:User)-[f:FRIEND]->(b:User) "
+        f"RETURN count(f), coalesce(sum((a.userId * 1000003 + b.userId) % {DELTA_MOD}), 0) % {DELTA_MOD}, "
+        "coalesce(sum(f.since_year), 0)",
+    ),
+    "Ratings": (
+        f"SELECT COUNT(*), COALESCE(SUM((userId * 1000003 + movieId) % {DELTA_MOD}), 0) % {DELTA_MOD}, "
+        "COALESCE(SUM(ROUND(rating * 2)), 0) FROM Ratings",
+        "MATCH (u:User)-[r:RATED]->(m:Movie) "
+        f"RETURN count(r), coalesce(sum((u.userId * 1000003 + m.movieId) % {DELTA_MOD}), 0) % {DELTA_MOD}, "
+        "coalesce(sum(round(r.rating * 2)), 0)",
+    ),
+    "ActedIn": (
+        f"SELECT COUNT(*), COALESCE(SUM((personId * 1000003 + movieId) % {DELTA_MOD}), 0) % {DELTA_MOD}, 0 "
+        "FROM ActedIn",
+        "MATCH (p:Person)-[:ACTED_IN]->(m:Movie) "
+        f"RETURN count(*), coalesce(sum((p.personId * 1000003 + m.movieId) % {DELTA_MOD}), 0) % {DELTA_MOD}, 0",
+    ),
+    "CoActors": (
+        f"SELECT COUNT(*), COALESCE(SUM((personId1 * 1000003 + personId2) % {DELTA_MOD}), 0) % {DELTA_MOD}, "
+        "COALESCE(SUM(together), 0) FROM CoActors",
+        "MATCH (a:Person)-[c:CO_ACTED]->(b:Person) "
+        f"RETURN count(c), coalesce(sum((a.personId * 1000003 + b.personId) % {DELTA_MOD}), 0) % {DELTA_MOD}, "
+        "coalesce(sum(c.together), 0)",
+    ),
+}
+
+# tabelele derivate actualizate incremental vs. recalculate complet din ActedIn (acelasi tuplu ca DELTA_CHECKS);
+# MySQL si Neo4j pot gresi la fel, deci fiecare e comparat si cu propriul rebuild
+DELTA_REBUILD_CHECKS = {
+    "CoActors": (
+        f"SELECT COUNT(*), COALESCE(SUM((p1 * 1000003 + p2) % {DELTA_MOD}), 0) % {DELTA_MOD}, "
+        "COALESCE(SUM(together), 0) FROM ("
+        " SELECT a1.personId AS p1, a2.personId AS p2, COUNT(*) AS together"
+        " FROM ActedIn a1 JOIN ActedIn a2 ON a1.movieId = a2.movieId AND a1.personId < a2.personId"
+        " GROUP BY a1.personId, a2.personId) x",
+        "MATCH (p1:Person)-[:ACTED_IN]->(m:Movie)<-[:ACTED_IN]-(p2:Person) WHERE p1.personId < p2.personId "
+        "WITH p1, p2, count(DISTINCT m) AS together "
+        f"RETURN count(*), coalesce(sum((p1.personId * 1000003 + p2.personId) % {DELTA_MOD}), 0) % {DELTA_MOD}, "
+        "coalesce(sum(together), 0)",
+    ),
+}
+
+
+def gen_delta(first_uid: int, n_movies: int, n_users: int = DELTA_USERS, n_friends: int = DELTA_FRIENDS,
+              n_ratings: int = DELTA_RATINGS, seed: int = SEED, n_people: int = 0,
+              n_acted_in: int = DELTA_ACTED_IN) -> Dict[str, list]:
+    """Un delta seeded: useri first_uid.., prietenii si ratinguri intre toti userii (vechi + noi),
+    plus roluri noi intre persoanele si filmele existente (n_people = 0 -> fara ActedIn).
+
+    Seed-ul include first_uid, deci delta-uri succesive difera dar sunt reproductibile.
+    Prieteniile / ratingurile care exista deja devin update-uri (since_year / rating).
+    """
+    cities = ["Bucharest", "Cluj", "Iasi", "Brasov", "Timisoara", "Constanta", "Oradea"]
+    rng = np.random.default_rng([seed, first_uid])
+    last_uid = first_uid + n_users - 1
+
+    uid = np.arange(first_uid, last_uid + 1)
+    ages = rng.integers(18, 56, size=n_users)
+    city = rng.integers(0, len(cities), size=n_users)
+    users = [(int(u), f"User{u}", int(a), cities[c]) for u, a, c in zip(uid, ages, city)]
+
+    a = rng.integers(1, last_uid + 1, size=n_friends)
+    b = rng.integers(1, last_uid + 1, size=n_friends)
+    keep = a != b
+    lo, hi = np.minimum(a[keep], b[keep]), np.maximum(a[keep], b[keep])
+    pairs = np.unique(lo * (last_uid + 1) + hi)
+    lo, hi = pairs // (last_uid + 1), pairs % (last_uid + 1)
+    since = rng.integers(2015, 2026, size=pairs.size)
+    friends = []
+    for x, y, s in zip(lo.tolist(), hi.tolist(), since.tolist()):
+        friends.append((x, y, s))
+        friends.append((y, x, s))
+
+    ru = rng.integers(1, last_uid + 1, size=n_ratings)
+    rm = rng.integers(1, n_movies + 1, size=n_ratings)
+    _, first = np.unique(ru * (n_movies + 1) + rm, return_index=True)
+    rv = rng.integers(1, 6, size=n_ratings).astype(float)
+    ratings = [(int(ru[i]), int(rm[i]), float(rv[i])) for i in np.sort(first)]
+
+    acted_in = []
+    if n_people and n_acted_in:
+        ap = rng.integers(1, n_people + 1, size=n_acted_in)
+        am = rng.integers(1, n_movies + 1, size=n_acted_in)
+        _, first = np.unique(ap * (n_movies + 1) + am, return_index=True)
+        acted_in = [(int(ap[i]), int(am[i])) for i in np.sort(first)]
+
+    return {"Users": users, "Friends": friends, "Ratings": ratings, "ActedIn": acted_in}
+
+
+def apply_delta_mysql(delta: Dict[str, list]):
+    conn = mysql_connect()
+    cur = conn.cursor()
+    mysql_ensure_derived_tables(cur)
+    for table in ("Users", "Friends"):
+        for batch in chunked(delta[table], BATCH):
+            cur.executemany(MYSQL_UPSERT[table], batch)
+        conn.commit()
+    for batch in chunked(delta["Ratings"], BATCH):
+        add_ratings_mysql(conn, batch)
+    for batch in chunked(delta["ActedIn"], BATCH):
+        add_acted_in_mysql(conn, batch)
+    cur.close()
+    conn.close()
+
+
+def apply_delta_neo4j(delta: Dict[str, list]):
+    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
+    with driver.session() as s:
+        for table in ("Users", "Friends"):
+            query, _, size = NEO4J_MERGE[table]
+            for batch in chunked(delta[table], size):
+                s.run(query, rows=neo4j_params(table, batch)).consume()
+        for batch in chunked(delta["Ratings"], NEO4J_MERGE["Ratings"][2]):
+            add_ratings_neo4j(s, batch)
+        for batch in chunked(delta["ActedIn"], NEO4J_MERGE["ActedIn"][2]):
+            add_acted_in_neo4j(s, batch)
+    driver.close()
+
+
+def delta_checksums() -> Dict[str, Dict[str, Tuple[int, ...]]]:
+    out: Dict[str, Dict[str, Tuple[int, ...]]] = {"mysql": {}, "neo4j": {}}
+    conn = mysql_connect()
+    cur = conn.cursor()
+    for table, (sql, _) in DELTA_CHECKS.items():
+        cur.execute(sql)
+        out["mysql"][table] = tuple(int(v) for v in cur.fetchone())
+    for table, (sql, _) in DELTA_REBUILD_CHECKS.items():
+        cur.execute(sql)
+        out["mysql"][f"{table}_rebuild"] = tuple(int(v) for v in cur.fetchone())
+    cur.close()
+    conn.close()
+
+    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
+    with driver.session() as s:
+        for table, (_, cypher) in DELTA_CHECKS.items():
+            out["neo4j"][table] = tuple(int(v) for v in s.run(cypher).single().values())
+        for table, (_, cypher) in DELTA_REBUILD_CHECKS.items():
+            out["neo4j"][f"{table}_rebuild"] = tuple(int(v) for v in s.run(cypher).single().values())
+    driver.close()
+    return out
+
+
+def run_delta(rounds: int, n_users: int, n_friends: int, n_ratings: int, seed: int = SEED,
+              n_acted_in: int = DELTA_ACTED_IN) -> bool:
+    """Aplica `rounds` delta-uri pe ambele baze; dupa fiecare, compara count + checksum per tabel
+    intre baze si, pentru tabelele derivate, versiunea incrementala cu un rebuild complet."""
+    ok = True
+    for i in range(1, rounds + 1):
+        conn = mysql_connect()
+        cur = conn.cursor()
+        cur.execute("SELECT COALESCE(MAX(userId), 0) FROM Users")
+        first_uid = cur.fetchone()[0] + 1
+        cur.execute("SELECT COALESCE(MAX(movieId), 0) FROM Movies")
+        n_movies = cur.fetchone()[0]
+        cur.execute("SELECT COALESCE(MAX(personId), 0) FROM People")
+        n_people = cur.fetchone()[0]
+        cur.close()
+        conn.close()
+
+        delta = gen_delta(first_uid, n_movies, n_users, n_friends, n_ratings, seed, n_people, n_acted_in)
+        print(f"Delta {i}/{rounds}: users {first_uid}..{first_uid + n_users - 1}, "
+              f"Friends(dir)={len(delta['Friends'])} Ratings={len(delta['Ratings'])} ActedIn={len(delta['ActedIn'])}")
+
+        for name, fn in (("MySQL", apply_delta_mysql), ("Neo4j", apply_delta_neo4j)):
+            t0 = time.perf_counter()
+            fn(delta)
+            print(f"  {name}: applied in {time.perf_counter() - t0:.2f}s")
+
+        sums = delta_checksums()
+        for table in DELTA_CHECKS:
+            m, n = sums["mysql"][table], sums["neo4j"][table]
+            status = "OK" if m == n else "MISMATCH"
+            ok &= m == n
+            print(f"  {table:8s} mysql={m} neo4j={n} {status}")
+        for table in DELTA_REBUILD_CHECKS:
+            for db in ("mysql", "neo4j"):
+                inc, full = sums[db][table], sums[db][f"{table}_rebuild"]
+                status = "OK" if inc == full else "MISMATCH"
+                ok &= inc == full
+                print(f"  {table:8s} {db} incremental={inc} rebuild={full} {status}")
+    return ok
+
+
+# ---------------- Incarcare concurenta MySQL + Neo4j ----------------
+def load_concurrently(jobs: Dict[str, Callable[[], Any]]) -> Dict[str, dict]:
+    """Ruleaza loaderele (servere independente) in paralel; o eroare intr-unul nu-l opreste pe celalalt."""
+    report: Dict[str, dict] = {}
+
+    def timed(name: str, job: Callable[[], Any]):
+        t0 = time.perf_counter()
+        try:
+            job()
+            report[name] = {"seconds": time.perf_counter() - t0, "error": None}
+        except Exception as e:
+            report[name] = {"seconds": time.perf_counter() - t0, "error": e}
+            traceback.print_exc()
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(jobs)) as ex:
+        for name, job in jobs.items():
+            ex.submit(timed, name, job)
+    wall = time.perf_counter() - t0
+
+    print(f"\nConcurrent load: wall={wall:.2f}s")
+    for name in jobs:
+        r = report[name]
+        status = "OK" if r["error"] is None else f"FAILED: {r['error']}"
+        print(f"  {name}: {r['seconds']:.2f}s {status}")
+    return report
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Generate the synthetic dataset and load it into MySQL and Neo4j.")
+    ap.add_argument("--generator", choices=["python", "numpy"], default="python",
+                    help="python = gen_* originale (random); numpy = generatorul vectorizat pe chunk-uri")
+    ap.add_argument("--mysql-mode", choices=["insert", "bulk"], default="insert",
+                    help="insert = executemany pe batch-uri; bulk = TSV + LOAD DATA LOCAL INFILE, indexuri refacute la final")
+    ap.add_argument("--neo4j-mode", choices=["merge", "fast", "admin-csv"], default="merge",
+                    help="merge = MERGE pe batch-uri; fast = CREATE + relatii pe workeri paraleli; "
+                         "admin-csv = doar scrie CSV-uri pentru neo4j-admin database import")
+    ap.add_argument("--neo4j-workers", type=int, default=NEO4J_WORKERS)
+    ap.add_argument("--csv-dir", default="neo4j_import")
+    ap.add_argument("--concurrent", action="store_true",
+                    help="incarca MySQL si Neo4j in acelasi timp (thread separat per backend)")
+    ap.add_argument("--graph", choices=["uniform", "powerlaw"], default=GRAPH_MODEL,
+                    help="uniform = perechi aleatoare; powerlaw = Barabasi-Albert + comunitati, filme Zipf")
+    ap.add_argument("--pipeline", action="store_true",
+                    help="genereaza (numpy) si incarca in paralel prin cozi marginite, fara liste intregi in memorie")
+    ap.add_argument("--delta", type=int, default=0, metavar="ROUNDS",
+                    help="fara reset: aplica ROUNDS delta-uri (useri/prietenii/ratinguri noi) peste datele existente "
+                         "si verifica count + checksum dupa fiecare")
+    ap.add_argument("--delta-users", type=int, default=DELTA_USERS)
+    ap.add_argument("--delta-friends", type=int, default=DELTA_FRIENDS)
+    ap.add_argument("--delta-ratings", type=int, default=DELTA_RATINGS)
+    ap.add_argument("--delta-acted-in", type=int, default=DELTA_ACTED_IN,
+                    help="roluri noi per delta, aplicate cu add_acted_in_* (CoActors / CO_ACTED incremental)")
+    ap.add_argument("--seed", type=int, default=SEED, help="seed pentru delta-uri")
+    ap.add_argument("--resume", action="store_true",
+                    help="reia un load MySQL (insert) / Neo4j (merge) intrerupt: regenereaza aceleasi date "
+                         "si sare batch-urile notate in fisierele de checkpoint")
+    ap.add_argument("--checkpoint-dir", default=".", help="unde se scriu load_checkpoint_<backend>.json")
+    ap.add_argument("--mem", action="store_true",
+                    help="tracemalloc + RSS dupa fiecare faza (generare, load MySQL, load Neo4j); incetineste generarea")
+    return ap.parse_args()
+
+
+def main():
+    global GRAPH_MODEL
+    args = parse_args()
+    GRAPH_MODEL = args.graph
+    phase_done = report_memory if args.mem else (lambda phase: None)
+    if args.mem:
+        tracemalloc.start()
+    if args.resume and (args.delta or args.pipeline or args.mysql_mode != "insert" or args.neo4j_mode != "merge"):
+        sys.exit("--resume works with the default load (--mysql-mode insert, --neo4j-mode merge)")
+    if args.delta:
+        ok = run_delta(args.delta, args.delta_users, args.delta_friends, args.delta_ratings, args.seed,
+                       args.delta_acted_in)
+        print("\nDone." if ok else "\nDone, but MySQL and Neo4j differ (see MISMATCH above).")
+        sys.exit(0 if ok else 1)
+    if args.pipeline:
+        print("Generating + loading (pipeline)...")
+        run_pipeline()
+        phase_done("pipeline (generate + MySQL + Neo4j)")
+        print("\nDone.")
+        return
+
+    # checkpoint-urile se deschid inainte de generare: un fingerprint diferit opreste reluarea imediat
+    ckpts: Dict[str, LoadCheckpoint] = {}
+    fingerprint = load_fingerprint(args.generator)
+    for name, resumable in (("mysql", args.mysql_mode == "insert"), ("neo4j", args.neo4j_mode == "merge")):
+        if resumable:
+            path = os.path.join(args.checkpoint_dir, CHECKPOINT_FILE.format(backend=name))
+            ckpts[name] = LoadCheckpoint(path, fingerprint, args.resume)
+            if args.resume:
+                print(f"{name}: " + (f"resuming ({ckpts[name].describe()})" if ckpts[name].resumed
+                                     else f"no {path}, loading from scratch"))
+
+    print("Generating data...")
+
+    t0 = time.perf_counter()
+    data = build_dataset(args.generator)
+    print(f"Generated in {time.perf_counter() - t0:.2f}s ({args.generator}, graph={args.graph})")
+    phase_done("generate")
+    users, movies, genres, movie_genres, friends, ratings, people, acted_in, directed = data.tables()
+
     print(
         f"Users={len(users)} "
         f"Movies={len(movies)} "
@@ -342,32 +1878,45 @@ def main():
         f"ActedIn={len(acted_in)} "
         f"Directed={len(directed)}"
     )
+    print_degree_stats(data)
 
-    print("\nLoading MySQL...")
-    load_mysql(
-        users,
-        movies,
-        genres,
-        movie_genres,
-        friends,
-        ratings,
-        people,
-        acted_in,
-        directed
-    )
+    jobs: Dict[str, Callable[[], Any]] = {}
+    if args.mysql_mode == "bulk":
+        jobs["mysql"] = lambda: load_mysql_bulk(*data.tables())
+    else:
+        jobs["mysql"] = lambda: load_mysql(*data.tables(), checkpoint=ckpts["mysql"])
+    if args.neo4j_mode == "admin-csv":
+        jobs["neo4j"] = lambda: export_neo4j_admin_csv(args.csv_dir, *data.tables())
+    elif args.neo4j_mode == "fast":
+        jobs["neo4j"] = lambda: load_neo4j_fast(*data.tables(), workers=args.neo4j_workers)
+    else:
+        jobs["neo4j"] = lambda: load_neo4j(*data.tables(), checkpoint=ckpts["neo4j"])
 
-    print("\nLoading Neo4j...")
-    load_neo4j(
-        users,
-        movies,
-        genres,
-        movie_genres,
-        friends,
-        ratings,
-        people,
-        acted_in,
-        directed
-    )
+    labels = {"mysql": f"MySQL ({args.mysql_mode})", "neo4j": f"Neo4j ({args.neo4j_mode})"}
+
+    def resume_hint(name: str):
+        if name in ckpts:
+            print(f"{labels[name]} stopped at {ckpts[name].describe()}; "
+                  f"rerun with --resume to continue from {ckpts[name].path}")
+
+    if args.concurrent:
+        print("\nLoading MySQL + Neo4j concurrently...")
+        report = load_concurrently(jobs)
+        phase_done("MySQL + Neo4j load (concurrent)")
+        failed = [name for name, r in report.items() if r["error"] is not None]
+        for name in failed:
+            resume_hint(name)
+        if failed:
+            sys.exit(1)
+    else:
+        for name, job in jobs.items():
+            print(f"\nLoading {labels[name]}...")
+            try:
+                job()
+            except BaseException:
+                resume_hint(name)
+                raise
+            phase_done(f"{labels[name]} load")
 
     print("\nDone.")
     
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+
+from insert_generate import generate_dataset
+from inproc_engine import InprocGraph, top_k
+
+
+# ----------------------------
+# CONFIG
+# ----------------------------
+MH_NUM_PERM = 64          # lungimea semnaturii
+MH_BANDS = 32             # benzi LSH (randuri per banda = MH_NUM_PERM / MH_BANDS)
+MH_SEED = 7
+MH_PRIME = (1 << 31) - 1  # a * movieId < 2^63 -> fara overflow in uint64
+MH_EMPTY = np.uint64(MH_PRIME)   # semnatura unui user fara ratinguri
+
+
+# ----------------------------
+# INDEX
+# ----------------------------
+class MinHashIndex:
+    """MinHash pe filmele evaluate de fiecare user + LSH pe benzi, pentru Q5 aproximativ.
+
+    Candidatii sunt userii care cad in aceeasi galeata cu mine in cel putin o banda; apoi sunt
+    reordonati exact dupa numarul de filme comune (ca Q5), deci pierderile sunt doar de recall.
+    Mai multe benzi (mai putine randuri per banda) -> mai multi candidati, recall mai mare, mai lent.
+    """
+
+    def __init__(self, n_users: int, num_perm: int = MH_NUM_PERM, bands: int = MH_BANDS,
+                 seed: int = MH_SEED):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, MH_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, MH_PRIME, size=num_perm, dtype=np.uint64)
+        self.mix = rng.integers(1, 1 << 63, size=self.rows, dtype=np.uint64) | np.uint64(1)
+
+        self.sig = np.full((n_users, num_perm), MH_EMPTY, dtype=np.uint64)
+        self.movies: List[set] = [set() for _ in range(n_users)]
+        self.buckets: List[Dict[int, List[int]]] = [{} for _ in range(bands)]
+
+    # ---------- hashing ----------
+    def movie_hashes(self, movie_ids: np.ndarray) -> np.ndarray:
+        """(len(movie_ids), num_perm): h_i(m) = (a_i * m + b_i) mod p."""
+        m = np.asarray(movie_ids, dtype=np.uint64)[:, None]
+        return (self.a * m + self.b) % np.uint64(MH_PRIME)
+
+    def band_keys(self, sig: np.ndarray) -> np.ndarray:
+        """(n, bands) chei uint64: randurile unei benzi amestecate intr-un singur intreg."""
+        with np.errstate(over="ignore"):
+            return (sig.reshape(-1, self.bands, self.rows) * self.mix).sum(axis=2)
+
+    # ---------- build ----------
+    @classmethod
+    def from_graph(cls, graph: InprocGraph, **kw) -> "MinHashIndex":
+        idx = cls(graph.n_users, **kw)
+        ratings = graph.ratings
+        users = np.flatnonzero(np.diff(ratings.indptr))
+        hashes = idx.movie_hashes(ratings.indices)
+        # min pe segmentele CSR ale fiecarui user (doar userii cu ratinguri)
+        idx.sig[users] = np.minimum.reduceat(hashes, ratings.indptr[users], axis=0)
+        for u in users:
+            idx.movies[u] = set(ratings.row(u).tolist())
+
+        keys = idx.band_keys(idx.sig[users])
+        for band in range(idx.bands):
+            order = np.argsort(keys[:, band], kind="stable")
+            k_sorted = keys[order, band]
+            starts = np.flatnonzero(np.r_[True, k_sorted[1:] != k_sorted[:-1]])
+            groups = np.split(users[order], starts[1:])
+            idx.buckets[band] = {int(k_sorted[s]): g.tolist() for s, g in zip(starts, groups)}
+        return idx
+
+    # ---------- incremental ----------
+    def add_rating(self, uid: int, movie_id: int):
+        """Adauga un rating nou; muta userul doar in benzile a caror cheie s-a schimbat."""
+        if movie_id in self.movies[uid]:
+            return
+        self.movies[uid].add(movie_id)
+        old = self.sig[uid].copy()
+        self.sig[uid] = np.minimum(old, self.movie_hashes(np.array([movie_id]))[0])
+        if np.array_equal(old, self.sig[uid]):
+            return
+        had_ratings = len(self.movies[uid]) > 1    # altfel userul nu era inca in nicio galeata
+        old_keys = self.band_keys(old[None, :])[0]
+        new_keys = self.band_keys(self.sig[uid][None, :])[0]
+        changed = np.flatnonzero(old_keys != new_keys) if had_ratings else range(self.bands)
+        for band in changed:
+            if had_ratings:
+                self.buckets[band][int(old_keys[band])].remove(uid)
+            self.buckets[band].setdefault(int(new_keys[band]), []).append(uid)
+
+    # ---------- query ----------
+    def candidates(self, uid: int) -> np.ndarray:
+        if not self.movies[uid]:
+            return np.empty(0, dtype=np.int64)
+        keys = self.band_keys(self.sig[uid][None, :])[0]
+        found = set()
+        for band, key in enumerate(keys.tolist()):
+            found.update(self.buckets[band].get(key, ()))
+        found.discard(uid)
+        return np.fromiter(found, dtype=np.int64, count=len(found))
+
+    def query(self, uid: int, limit: int = 10) -> List[Dict[str, Any]]:
+        """Q5 aproximativ: candidatii LSH ordonati dupa filmele comune (common DESC, id)."""
+        cand = self.candidates(uid)
+        mine = self.movies[uid]
+        common = np.fromiter((len(mine & self.movies[v]) for v in cand.tolist()),
+                             dtype=np.int64, count=cand.size)
+        keep = common > 0
+        cand, common = cand[keep], common[keep]
+        return [{"id": int(cand[i]), "common": int(common[i])} for i in top_k(cand, common, limit)]
+
+
+# ----------------------------
+# RECALL / LATENTA
+# ----------------------------
+def recall_at_k(approx: List[Dict[str, Any]], exact: List[Dict[str, Any]]) -> float:
+    """Recall@k cu egalitati: un rezultat aproximativ e corect daca are cel putin
+    cate filme comune are ultimul rezultat exact (Q5 nu are tie-break)."""
+    if not exact:
+        return 1.0
+    cutoff = exact[-1]["common"]
+    hits = sum(1 for r in approx if r["common"] >= cutoff)
+    return min(hits, len(exact)) / len(exact)
+
+
+def evaluate(graph: InprocGraph, index: MinHashIndex, uids: Iterable[int], k: int = 10) -> Dict[str, float]:
+    recalls, approx_ms, exact_ms, n_cand = [], [], [], []
+    for uid in uids:
+        t0 = time.perf_counter()
+        approx = index.query(uid, k)
+        t1 = time.perf_counter()
+        exact = graph.q5_movie_sim(uid, k)
+        t2 = time.perf_counter()
+        approx_ms.append((t1 - t0) * 1000.0)
+        exact_ms.append((t2 - t1) * 1000.0)
+        recalls.append(recall_at_k(approx, exact))
+        n_cand.append(index.candidates(uid).size)
+    return {
+        "num_perm": index.num_perm,
+        "bands": index.bands,
+        "rows": index.rows,
+        "recall_at_k": statistics.fmean(recalls),
+        "candidates": statistics.fmean(n_cand),
+        "approx_median_ms": statistics.median(approx_ms),
+        "exact_median_ms": statistics.median(exact_ms),
+    }
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="MinHash/LSH index for approximate Q5 (recall@10 vs latency).")
+    ap.add_argument("--seed", type=int, default=42, help="dataset seed (same as insert_generate.py)")
+    ap.add_argument("--num-perm", type=int, default=MH_NUM_PERM)
+    ap.add_argument("--bands", default=f"8,16,{MH_BANDS},64",
+                    help="comma-separated band counts to compare (each must divide --num-perm)")
+    ap.add_argument("--users", type=int, default=500, help="random users to evaluate")
+    ap.add_argument("--k", type=int, default=10)
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+    graph = InprocGraph(generate_dataset(args.seed))
+    rng = np.random.default_rng(args.seed)
+    users = np.flatnonzero(np.diff(graph.ratings.indptr))
+    sample = rng.choice(users, size=min(args.users, users.size), replace=False).tolist()
+
+    print(f"{'bands':>5} {'rows':>4} {'build_s':>8} {'recall@' + str(args.k):>9} {'cand':>8} "
+          f"{'approx_ms':>9} {'exact_ms':>9}")
+    for bands in [int(b) for b in args.bands.split(",") if b]:
+        t0 = time.perf_counter()
+        index = MinHashIndex.from_graph(graph, num_perm=args.num_perm, bands=bands)
+        build_s = time.perf_counter() - t0
+        r = evaluate(graph, index, sample, args.k)
+        print(f"{bands:>5} {r['rows']:>4} {build_s:>8.2f} {r['recall_at_k']:>9.3f} {r['candidates']:>8.1f} "
+              f"{r['approx_median_ms']:>9.3f} {r['exact_median_ms']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
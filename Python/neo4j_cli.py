@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import argparse
+import json
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 from neo4j import GraphDatabase
 import sys
+import time
 
 
 # ----------------------------
@@ -13,6 +20,24 @@ NEO4J_URI = "bolt://localhost:7687"
 NEO4J_USER = "neo4j"
 NEO4J_PASS = "parola23"
 
+# Cache de rezultate (LRU + TTL per query)
+CACHE_MAX_ENTRIES = 256
+CACHE_DEFAULT_TTL_S = 60.0
+CACHE_TTL_S: Dict[str, float] = {
+    "Q2_SHORTEST": 300.0,
+    "Q4_GENRE_SIM": 600.0,
+    "Q7_COACTORS": 3600.0,   # nu depinde de user, se schimba doar cu ActedIn
+}
+# cat de des verificam nodul :DataVersion scris de loader (insert_generate.py)
+CACHE_VERSION_CHECK_S = 2.0
+DATA_VERSION_QUERY = "OPTIONAL MATCH (v:DataVersion {id: 1}) RETURN v.updatedAt AS version"
+
+# Q3/Q6 cu fan-out limitat (--fanout): cel mult FANOUT_CAP vecini per hop, vezi FANOUT_QUERIES
+FANOUT_MODES = ("exact", "topn", "sample")
+FANOUT_CAP = 20
+FANOUT_SEED = 1
+FANOUT_EXACT_LIMIT = 1_000_000   # referinta pentru recall: toate filmele din rezultatul exact
+
 
 # ----------------------------
 # QUERIES
@@ -88,6 +113,366 @@ NEO4J_QUERIES: Dict[str, str] = {
 }
 
 
+# Singura definitie Cypher a variantelor; benchmark.py le ruleaza ca neo4j_topn / neo4j_sample:
+#   topn   - vecinii cu cele mai multe legaturi comune (Q3: prieteni comuni, Q6: filme comune)
+#   sample - cel mult $cap vecini per nod si hop, alesi dupa un hash al userId cu $seed
+FANOUT_QUERIES: Dict[str, Dict[str, str]] = {
+    "topn": {
+        "Q3_FOF_RECS": """
+        MATCH (u:User {userId: $uid})-[:FRIEND]->(:User)-[:FRIEND]->(x:User)
+        WHERE u <> x
+        WITH u, x, count(*) AS paths
+        ORDER BY paths DESC, x.userId
+        LIMIT $cap
+        MATCH (x)-[r:RATED]->(m:Movie)
+        WHERE r.rating >= $minRating
+          AND NOT (u)-[:RATED]->(m)
+        RETURN m.title AS title, m.year AS year,
+               sum(r.rating * paths) / sum(paths) AS score, sum(paths) AS votes
+        ORDER BY score DESC, votes DESC
+        LIMIT $limit
+        """,
+
+        "Q6_COLLAB_RECS": """
+        MATCH (u:User {userId: $uid})-[:RATED]->(m:Movie)<-[:RATED]-(v:User)
+        WHERE v <> u
+        WITH u, v, count(DISTINCT m) AS commonCount
+        WHERE commonCount >= $minCommon
+        ORDER BY commonCount DESC, v.userId
+        LIMIT $cap
+        MATCH (v)-[r:RATED]->(rec:Movie)
+        WHERE r.rating >= $minRating
+          AND NOT (u)-[:RATED]->(rec)
+        RETURN rec.title AS title, rec.year AS year, avg(r.rating) AS score, count(*) AS votes
+        ORDER BY score DESC, votes DESC
+        LIMIT $limit
+        """,
+    },
+    "sample": {
+        "Q3_FOF_RECS": """
+        MATCH (u:User {userId: $uid})-[:FRIEND]->(f:User)
+        WITH u, f
+        ORDER BY ((f.userId + $seed) * 2654435761) % 4294967291, f.userId
+        LIMIT $cap
+        CALL {
+          WITH u, f
+          MATCH (f)-[:FRIEND]->(x:User)
+          WHERE x <> u
+          WITH x
+          ORDER BY ((x.userId + $seed) * 2654435761) % 4294967291, x.userId
+          LIMIT $cap
+          RETURN x
+        }
+        MATCH (x)-[r:RATED]->(m:Movie)
+        WHERE r.rating >= $minRating
+          AND NOT (u)-[:RATED]->(m)
+        RETURN m.title AS title, m.year AS year, avg(r.rating) AS score, count(*) AS votes
+        ORDER BY score DESC, votes DESC
+        LIMIT $limit
+        """,
+
+        "Q6_COLLAB_RECS": """
+        MATCH (u:User {userId: $uid})-[:RATED]->(m:Movie)
+        CALL {
+          WITH u, m
+          MATCH (v:User)-[:RATED]->(m)
+          WHERE v <> u
+          WITH v
+          ORDER BY ((v.userId + $seed) * 2654435761) % 4294967291, v.userId
+          LIMIT $cap
+          RETURN v
+        }
+        WITH u, v, count(DISTINCT m) AS commonCount
+        WHERE commonCount >= $minCommon
+        MATCH (v)-[r:RATED]->(rec:Movie)
+        WHERE r.rating >= $minRating
+          AND NOT (u)-[:RATED]->(rec)
+        RETURN rec.title AS title, rec.year AS year, avg(r.rating) AS score, count(*) AS votes
+        ORDER BY score DESC, votes DESC
+        LIMIT $limit
+        """,
+    },
+}
+
+
+def query_text(qid: str, fanout: str = "exact") -> str:
+    return FANOUT_QUERIES.get(fanout, {}).get(qid, NEO4J_QUERIES[qid])
+
+
+def fanout_recall(titles: List[str], exact: List[Dict[str, Any]], k: int) -> float:
+    """Recall@k fata de lista exacta completa (ORDER BY score DESC, votes DESC).
+
+    Fara tie-break in query, deci un titlu e corect daca (score, votes) exacte ale lui sunt cel
+    putin cele ale celui de-al k-lea rezultat exact.
+    """
+    if not exact:
+        return 1.0
+    key = {r["title"]: (round(r["score"], 6), r["votes"]) for r in exact}
+    top = exact[:k]
+    cutoff = key[top[-1]["title"]]
+    hits = sum(1 for t in titles[:k] if t in key and key[t] >= cutoff)
+    return min(hits, len(top)) / len(top)
+
+
+# ----------------------------
+# RESULT CACHE
+# ----------------------------
+@dataclass
+class CacheEntry:
+    rows: List[Dict[str, Any]]
+    expires_at: float
+
+
+class ResultCache:
+    """LRU marginit, cu TTL per query si invalidare cand loader-ul schimba :DataVersion."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Tuple, CacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.version: Any = None
+        self.version_checked_at = 0.0
+
+    @staticmethod
+    def key(qid: str, params: Dict[str, Any]) -> Tuple:
+        # 4 si 4.0 sunt acelasi minRating; ordinea cheilor nu conteaza
+        norm = tuple(sorted((k, float(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else v)
+                            for k, v in params.items()))
+        return qid, norm
+
+    def get(self, qid: str, params: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        k = self.key(qid, params)
+        entry = self.entries.get(k)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at < time.monotonic():
+            del self.entries[k]
+            self.expired += 1
+            self.misses += 1
+            return None
+        self.entries.move_to_end(k)
+        self.hits += 1
+        return entry.rows
+
+    def put(self, qid: str, params: Dict[str, Any], rows: List[Dict[str, Any]]) -> None:
+        ttl = CACHE_TTL_S.get(qid, CACHE_DEFAULT_TTL_S)
+        self.entries[self.key(qid, params)] = CacheEntry(rows, time.monotonic() + ttl)
+        self.entries.move_to_end(self.key(qid, params))
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, qid: Optional[str] = None) -> int:
+        if qid is None:
+            n = len(self.entries)
+            self.entries.clear()
+            return n
+        stale = [k for k in self.entries if k[0] == qid]
+        for k in stale:
+            del self.entries[k]
+        return len(stale)
+
+    def check_version(self, driver) -> None:
+        """Goleste cache-ul daca datele s-au schimbat; intreaba serverul cel mult o data la CACHE_VERSION_CHECK_S."""
+        now = time.monotonic()
+        if now - self.version_checked_at < CACHE_VERSION_CHECK_S:
+            return
+        self.version_checked_at = now
+        with driver.session() as s:
+            version = s.run(DATA_VERSION_QUERY).single()["version"]
+        if version != self.version:
+            self.invalidate()
+            self.version = version
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions,
+        }
+
+
+def run_query(driver, cache: Optional[ResultCache], qid: str, params: Dict[str, Any],
+              fanout: str = "exact"):
+    """Intoarce (rows, ms, hit)."""
+    text = query_text(qid, fanout)
+    # variantele fan-out au intrari separate in cache (aceiasi parametri, alt rezultat)
+    cache_qid = qid if fanout == "exact" else f"{qid}:{fanout}"
+    t0 = time.perf_counter()
+    if cache is not None:
+        cache.check_version(driver)
+        rows = cache.get(cache_qid, params)
+        if rows is not None:
+            return rows, (time.perf_counter() - t0) * 1000.0, True
+
+    with driver.session() as session:
+        result = session.run(text, params)
+        rows = [dict(r) for r in result]
+    if cache is not None:
+        cache.put(cache_qid, params, rows)
+    return rows, (time.perf_counter() - t0) * 1000.0, False
+
+
+# ----------------------------
+# BATCH MODE (UNWIND $uids)
+# ----------------------------
+BATCH_CHUNK = 500
+BATCH_WORKERS = 4
+BATCH_DEFAULTS: Dict[str, Any] = {"limit": 20, "minRating": 4.0, "minCommon": 1}
+
+# coloanele returnate de fiecare query per-user, adunate intr-o lista per uid
+BATCH_COLUMNS: Dict[str, List[str]] = {
+    "Q1_FOF": ["id", "name"],
+    "Q3_FOF_RECS": ["title", "year", "score", "votes"],
+    "Q5_MOVIE_SIM": ["id", "name", "common"],
+    "Q6_COLLAB_RECS": ["title", "year", "score", "votes"],
+}
+
+
+def unwind_query(qid: str) -> str:
+    """Versiunea UNWIND a query-ului per-user: acelasi corp, rulat per uid intr-un CALL (LIMIT ramane per user)."""
+    body = re.sub(r"\$uid\b", "uid", NEO4J_QUERIES[qid])
+    fields = ", ".join(f"{c}: {c}" for c in BATCH_COLUMNS[qid])
+    return f"""
+    UNWIND $uids AS uid
+    CALL {{
+      WITH uid
+      {body}
+    }}
+    RETURN uid, collect({{{fields}}}) AS results
+    """
+
+
+def read_uids(src: TextIO) -> Iterator[int]:
+    for line in src:
+        line = line.split("#", 1)[0].strip()
+        if line:
+            yield int(line)
+
+
+def chunks_of(it: Iterable[int], n: int) -> Iterator[List[int]]:
+    chunk: List[int] = []
+    for x in it:
+        chunk.append(x)
+        if len(chunk) == n:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch_chunk(driver, qid: str, uids: List[int], params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    with driver.session() as session:
+        got = {r["uid"]: r["results"] for r in session.run(unwind_query(qid), params, uids=uids)}
+    # CALL fara rezultate elimina uid-ul; il intoarcem cu lista goala
+    return [{"query": qid, "uid": u, "results": got.get(u, [])} for u in uids]
+
+
+def run_batch(driver, qids: List[str], uids: Iterable[int], out: TextIO, params: Dict[str, Any],
+              chunk: int = BATCH_CHUNK, workers: int = BATCH_WORKERS) -> Tuple[int, float]:
+    """Scrie JSON Lines in ordinea input-ului, in timp ce chunk-urile urmatoare ruleaza inca.
+
+    Cel mult 2 * workers chunk-uri sunt in zbor, deci input-ul (fisier / stdin) e citit lazy.
+    """
+    n_users = 0
+    t0 = time.perf_counter()
+    pending = []
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        def drain(keep: int):
+            nonlocal n_users
+            while len(pending) > keep:
+                rows = pending.pop(0).result()
+                for row in rows:
+                    out.write(json.dumps(row) + "\n")
+                out.flush()
+                n_users += len(rows)
+
+        for uid_chunk in chunks_of(uids, chunk):
+            for qid in qids:
+                pending.append(ex.submit(run_batch_chunk, driver, qid, uid_chunk, params))
+            drain(2 * workers)
+        drain(0)
+    return n_users, time.perf_counter() - t0
+
+
+def run_per_user(driver, qid: str, uids: List[int], params: Dict[str, Any]) -> float:
+    """Bucla veche (un query per user), pentru comparatie; intoarce secundele."""
+    t0 = time.perf_counter()
+    with driver.session() as session:
+        for u in uids:
+            list(session.run(NEO4J_QUERIES[qid], dict(params, uid=u)))
+    return time.perf_counter() - t0
+
+
+def batch_main(args, driver) -> None:
+    qids = [q for q in args.batch.split(",") if q]
+    for q in qids:
+        if q not in BATCH_COLUMNS:
+            print(f"Batch mode supports {', '.join(BATCH_COLUMNS)}; got {q}", file=sys.stderr)
+            sys.exit(2)
+    params = {"limit": args.limit, "minRating": args.min_rating, "minCommon": args.min_common}
+
+    src = sys.stdin if args.uids == "-" else open(args.uids, encoding="utf-8")
+    out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+    uids_seen: List[int] = []
+
+    def tee(it):
+        for u in it:
+            if len(uids_seen) < args.compare:
+                uids_seen.append(u)
+            yield u
+
+    try:
+        rows, sec = run_batch(driver, qids, tee(read_uids(src)), out, params, args.chunk, args.workers)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if out is not sys.stdout:
+            out.close()
+
+    users = rows / max(len(qids), 1)
+    print(f"batch: {users:.0f} users x {len(qids)} queries in {sec:.2f}s "
+          f"({users / max(sec, 1e-9):,.0f} users/s, chunk={args.chunk}, workers={args.workers})",
+          file=sys.stderr)
+
+    if args.compare and uids_seen:
+        for qid in qids:
+            loop_sec = run_per_user(driver, qid, uids_seen, params)
+            with open(os.devnull, "w") as sink:
+                _, batch_sec = run_batch(driver, [qid], uids_seen, sink, params, args.chunk, args.workers)
+            n = len(uids_seen)
+            print(f"{qid}: per-user loop {n / max(loop_sec, 1e-9):,.0f} users/s vs "
+                  f"UNWIND batch {n / max(batch_sec, 1e-9):,.0f} users/s on {n} users", file=sys.stderr)
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Interactive Neo4j query menu, or batch mode for many users.")
+    ap.add_argument("--batch", default="",
+                    help="query-uri per user separate prin virgula (Q1_FOF,Q3_FOF_RECS,Q5_MOVIE_SIM,Q6_COLLAB_RECS)")
+    ap.add_argument("--uids", default="-", help="fisier cu un uid pe linie; - = stdin")
+    ap.add_argument("--out", default="-", help="fisier JSON Lines; - = stdout")
+    ap.add_argument("--chunk", type=int, default=BATCH_CHUNK, help="uid-uri per UNWIND")
+    ap.add_argument("--workers", type=int, default=BATCH_WORKERS, help="chunk-uri rulate in paralel")
+    ap.add_argument("--limit", type=int, default=BATCH_DEFAULTS["limit"])
+    ap.add_argument("--min-rating", type=float, default=BATCH_DEFAULTS["minRating"])
+    ap.add_argument("--min-common", type=int, default=BATCH_DEFAULTS["minCommon"])
+    ap.add_argument("--compare", type=int, default=0,
+                    help="ruleaza si bucla per-user pe primii N uid si compara users/s")
+    ap.add_argument("--fanout", choices=FANOUT_MODES, default="exact",
+                    help="meniu: Q3/Q6 cu fan-out limitat; afiseaza si latenta + recall fata de varianta exacta")
+    ap.add_argument("--fanout-cap", type=int, default=FANOUT_CAP, help="max vecini pastrati per hop")
+    ap.add_argument("--fanout-seed", type=int, default=FANOUT_SEED, help="seed-ul esantionului (--fanout sample)")
+    return ap.parse_args()
+
+
 # ----------------------------
 # INPUT HELPERS
 # ----------------------------
@@ -145,6 +530,8 @@ def menu() -> str:
     print("5. Q5_MOVIE_SIM - Movie similarity")
     print("6. Q6_COLLAB_RECS - Collaborative filtering")
     print("7. Q7_COACTORS - Co-actors")
+    print("s. Cache stats")
+    print("c. Clear cache")
     print("0. Exit")
     return input("Choose option: ").strip()
 
@@ -153,16 +540,23 @@ def menu() -> str:
 # MAIN
 # ----------------------------
 def main():
+    args = parse_args()
     try:
         driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
         with driver.session() as s:
             s.run("RETURN 1").single()
     except Exception as e:
-        print("Could not connect to Neo4j.")
-        print(e)
+        print("Could not connect to Neo4j.", file=sys.stderr)
+        print(e, file=sys.stderr)
         sys.exit(1)
 
+    if args.batch:
+        batch_main(args, driver)
+        driver.close()
+        return
+
     print("Connected to Neo4j")
+    cache = ResultCache()
 
     mapping = {
         "1": "Q1_FOF",
@@ -178,6 +572,12 @@ def main():
         choice = menu()
         if choice == "0":
             break
+        if choice == "s":
+            print(cache.stats())
+            continue
+        if choice == "c":
+            print(f"Cleared {cache.invalidate()} cached results.")
+            continue
         if choice not in mapping:
             print("Invalid option.")
             continue
@@ -202,13 +602,24 @@ def main():
         if qid == "Q6_COLLAB_RECS":
             params["minCommon"] = ask_int("Min common movies", 1)
 
-        with driver.session() as session:
-            result = session.run(NEO4J_QUERIES[qid], params)
-            rows = [dict(r) for r in result]
+        fanout = args.fanout if qid in ("Q3_FOF_RECS", "Q6_COLLAB_RECS") else "exact"
+        if fanout != "exact":
+            params.update(cap=args.fanout_cap, seed=args.fanout_seed)
 
-        print("\nResults:")
+        rows, ms, hit = run_query(driver, cache, qid, params, fanout)
+
+        label = "cache hit" if hit else "neo4j" if fanout == "exact" else f"neo4j {fanout}, cap={args.fanout_cap}"
+        print(f"\nResults ({label}, {ms:.3f} ms):")
         print_table(rows)
 
+        if fanout != "exact":
+            # query-ul exact cu acelasi LIMIT (latenta), apoi cu toate filmele (egalitatile de la pozitia k)
+            _, exact_ms, _ = run_query(driver, None, qid, params)
+            exact, _, _ = run_query(driver, None, qid, dict(params, limit=FANOUT_EXACT_LIMIT))
+            recall = fanout_recall([r["title"] for r in rows], exact, params["limit"])
+            print(f"Exact {qid}: {exact_ms:.3f} ms; {fanout}: {ms:.3f} ms; "
+                  f"recall@{params['limit']} = {recall:.3f}")
+
     driver.close()
     print("Program finished.")
 
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import os
+import shlex
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import insert_generate as ig
+
+
+# ----------------------------
+# CONFIG
+# ----------------------------
+SWEEP_SIZES = [1_000, 5_000, 20_000, 100_000, 1_000_000]
+SWEEP_DIR = "sweep"
+# ceilalti parametri scaleaza proportional cu N_USERS, ca in configuratia de baza (20k / 5k / 8k)
+MOVIES_PER_USER = ig.N_MOVIES / ig.N_USERS
+PEOPLE_PER_USER = ig.N_PEOPLE / ig.N_USERS
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# ruleaza main()-ul unui script cu N_USERS/N_MOVIES/... suprascrise (proces separat per marime,
+# ca memoria sa fie eliberata intre marimi si fiecare rulare sa aiba propriul director de output)
+BOOTSTRAP = """
+import sys
+import insert_generate as ig
+for k, v in {knobs!r}.items():
+    setattr(ig, k, v)
+import {module} as m
+for k, v in {extra!r}.items():
+    setattr(m, k, v)
+sys.argv = [{module!r}] + {argv!r}
+m.main()
+"""
+
+
+def size_knobs(n_users: int, avg_friends: int) -> Dict[str, int]:
+    return {
+        "N_USERS": n_users,
+        "N_MOVIES": max(1, round(n_users * MOVIES_PER_USER)),
+        "N_PEOPLE": max(ig.ACTORS_PER_MOVIE_MAX, round(n_users * PEOPLE_PER_USER)),
+        "AVG_FRIENDS": avg_friends,
+    }
+
+
+def run_step(module: str, argv: List[str], knobs: Dict[str, int], cwd: str,
+             extra: Optional[Dict[str, Any]] = None) -> float:
+    code = BOOTSTRAP.format(knobs=knobs, module=module, extra=extra or {}, argv=argv)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SCRIPT_DIR, os.environ.get("PYTHONPATH")])))
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, check=True)
+    return time.perf_counter() - t0
+
+
+# ----------------------------
+# ANALIZA
+# ----------------------------
+def collect(out_dir: str) -> pd.DataFrame:
+    frames = []
+    for name in sorted(os.listdir(out_dir)):
+        path = os.path.join(out_dir, name, "benchmark_summary.csv")
+        if name.startswith("users_") and os.path.exists(path):
+            df = pd.read_csv(path)
+            df.insert(0, "n_users", int(name.split("_", 1)[1]))
+            frames.append(df)
+    if not frames:
+        raise SystemExit(f"no users_*/benchmark_summary.csv under {out_dir}")
+    return pd.concat(frames, ignore_index=True).sort_values(["query_id", "db", "n_users"])
+
+
+def fit_growth(df: pd.DataFrame) -> pd.DataFrame:
+    """median_ms ~ a * n^b per (query, db): regresie liniara in log-log; b = exponentul de crestere."""
+    rows = []
+    for (qid, db), g in df.groupby(["query_id", "db"]):
+        g = g[g["median_ms"] > 0]
+        if len(g) < 2:
+            continue
+        x, y = np.log(g["n_users"].to_numpy(float)), np.log(g["median_ms"].to_numpy(float))
+        b, log_a = np.polyfit(x, y, 1)
+        pred = log_a + b * x
+        ss_tot = ((y - y.mean()) ** 2).sum()
+        r2 = 1.0 - ((y - pred) ** 2).sum() / ss_tot if ss_tot > 0 else 1.0
+        rows.append({"query_id": qid, "db": db, "a": float(np.exp(log_a)), "exponent": float(b),
+                     "r2": float(r2), "sizes": len(g)})
+    return pd.DataFrame(rows)
+
+
+def find_crossovers(df: pd.DataFrame, fits: pd.DataFrame) -> pd.DataFrame:
+    """Pentru fiecare query si pereche de backend-uri: prima marime masurata la care castigatorul
+    se schimba, plus punctul de intersectie al curbelor fitate (poate fi si in afara intervalului)."""
+    rows = []
+    fit = {(r.query_id, r.db): r for r in fits.itertuples()}
+    for qid, g in df.groupby("query_id"):
+        wide = g.pivot_table(index="n_users", columns="db", values="median_ms").sort_index()
+        for a, b in itertools.combinations(sorted(wide.columns), 2):
+            both = wide[[a, b]].dropna()
+            if both.empty:
+                continue
+            a_faster = (both[a] < both[b]).to_numpy()
+            flips = np.flatnonzero(a_faster[1:] != a_faster[:-1])
+            measured = None
+            if flips.size:
+                i = flips[0] + 1
+                winner, loser = (a, b) if a_faster[i] else (b, a)
+                measured = f"{winner} overtakes {loser} at {int(both.index[i])} users"
+
+            predicted = np.nan
+            fa, fb = fit.get((qid, a)), fit.get((qid, b))
+            if fa is not None and fb is not None and abs(fa.exponent - fb.exponent) > 1e-9:
+                # a_A * n^b_A = a_B * n^b_B
+                predicted = float((fa.a / fb.a) ** (1.0 / (fb.exponent - fa.exponent)))
+
+            rows.append({
+                "query_id": qid, "db_a": a, "db_b": b,
+                "faster_at_smallest": a if a_faster[0] else b,
+                "faster_at_largest": a if a_faster[-1] else b,
+                "measured_crossover": measured or "",
+                "fitted_crossover_users": predicted,
+            })
+    return pd.DataFrame(rows)
+
+
+def analyze(out_dir: str):
+    df = collect(out_dir)
+    fits = fit_growth(df)
+    cross = find_crossovers(df, fits)
+    df.to_csv(os.path.join(out_dir, "scaling_summary.csv"), index=False)
+    fits.to_csv(os.path.join(out_dir, "scaling_fits.csv"), index=False)
+    cross.to_csv(os.path.join(out_dir, "scaling_crossovers.csv"), index=False)
+
+    print("\n=== MEDIAN ms BY SIZE ===")
+    print(df.pivot_table(index=["query_id", "db"], columns="n_users", values="median_ms").to_string())
+    print("\n=== GROWTH FIT (median_ms ~ a * n^exponent) ===")
+    print(fits.to_string(index=False))
+    flagged = cross[cross["measured_crossover"] != ""]
+    print("\n=== CROSSOVERS ===")
+    print(flagged.to_string(index=False) if not flagged.empty else "none in the measured range")
+    print(f"\nSaved: {out_dir}/scaling_summary.csv, scaling_fits.csv, scaling_crossovers.csv")
+
+
+# ----------------------------
+# MAIN
+# ----------------------------
+def parse_args():
+    ap = argparse.ArgumentParser(description="Generate -> load -> benchmark at several dataset sizes, then fit growth curves.")
+    ap.add_argument("--sizes", default=",".join(map(str, SWEEP_SIZES)), help="N_USERS values, comma-separated")
+    ap.add_argument("--avg-friends", type=int, default=ig.AVG_FRIENDS)
+    ap.add_argument("--out", default=SWEEP_DIR, help="one users_<N>/ subdirectory per size")
+    ap.add_argument("--load-args", default="", help="extra args for insert_generate.py, e.g. '--mysql-mode bulk'")
+    ap.add_argument("--generator", choices=["python", "numpy"], default="python",
+                    help="passed to both scripts so benchmark.py rebuilds the rows that were loaded "
+                         "(forced to numpy when --load-args has --pipeline)")
+    ap.add_argument("--bench-args", default="", help="extra args for benchmark.py, e.g. '--backends inproc,duckdb'")
+    ap.add_argument("--runs", type=int, default=0, help="override benchmark.RUNS (0 = keep)")
+    ap.add_argument("--no-load", action="store_true",
+                    help="skip insert_generate.py (enough for the inproc/duckdb/sqlite backends)")
+    ap.add_argument("--analyze-only", action="store_true", help="only re-run the analysis on --out")
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+    load_args, bench_args = shlex.split(args.load_args), shlex.split(args.bench_args)
+    # --pipeline incarca mereu din generatorul NumPy
+    generator = "numpy" if "--pipeline" in load_args else args.generator
+    load_args += ["--generator", generator]
+    bench_args += ["--generator", generator]
+    if not args.analyze_only:
+        sizes = [int(s) for s in args.sizes.split(",") if s]
+        for n in sizes:
+            knobs = size_knobs(n, args.avg_friends)
+            size_dir = os.path.join(args.out, f"users_{n}")
+            os.makedirs(size_dir, exist_ok=True)
+            print(f"\n##### {n} users ({knobs}) #####")
+            if not args.no_load:
+                sec = run_step("insert_generate", load_args, knobs, size_dir)
+                print(f"sweep: load {n} users in {sec:.1f}s")
+            extra = {"RUNS": args.runs} if args.runs else {}
+            sec = run_step("benchmark", bench_args, knobs, size_dir, extra)
+            print(f"sweep: benchmark {n} users in {sec:.1f}s")
+    analyze(args.out)
+
+
+if __name__ == "__main__":
+    main()
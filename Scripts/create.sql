@@ -93,6 +93,50 @@ CREATE TABLE Directed (
     ON DELETE CASCADE ON UPDATE CASCADE
 ) ENGINE=InnoDB;
 
+-- Perechi de co-actori (derivat din ActedIn, pentru Q7; personId1 < personId2)
+CREATE TABLE CoActors (
+  personId1 INT NOT NULL,
+  personId2 INT NOT NULL,
+  together  INT NOT NULL,
+  PRIMARY KEY (personId1, personId2),
+  CONSTRAINT fk_coact_p1 FOREIGN KEY (personId1) REFERENCES People(personId)
+    ON DELETE CASCADE ON UPDATE CASCADE,
+  CONSTRAINT fk_coact_p2 FOREIGN KEY (personId2) REFERENCES People(personId)
+    ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB;
+
+-- Masca de genuri per user (bit i = al i-lea gen dupa nume; derivat din Ratings+MovieGenres, pentru Q4)
+CREATE TABLE UserGenreMask (
+  userId    INT PRIMARY KEY,
+  genreMask BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  CONSTRAINT fk_ugm_user FOREIGN KEY (userId) REFERENCES Users(userId)
+    ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB;
+
+-- Rezultatele jobului offline Python/cf_batch.py (top 10 Q5 / Q6 per user)
+CREATE TABLE SimilarUsers (
+  userId  INT NOT NULL,
+  otherId INT NOT NULL,
+  common  INT NOT NULL,
+  PRIMARY KEY (userId, otherId),
+  CONSTRAINT fk_sim_user FOREIGN KEY (userId) REFERENCES Users(userId)
+    ON DELETE CASCADE ON UPDATE CASCADE,
+  CONSTRAINT fk_sim_other FOREIGN KEY (otherId) REFERENCES Users(userId)
+    ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB;
+
+CREATE TABLE Recommendations (
+  userId  INT NOT NULL,
+  movieId INT NOT NULL,
+  score   DOUBLE NOT NULL,
+  votes   INT NOT NULL,
+  PRIMARY KEY (userId, movieId),
+  CONSTRAINT fk_rec_user FOREIGN KEY (userId) REFERENCES Users(userId)
+    ON DELETE CASCADE ON UPDATE CASCADE,
+  CONSTRAINT fk_rec_movie FOREIGN KEY (movieId) REFERENCES Movies(movieId)
+    ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB;
+
 -- 4) Indexuri utile
 CREATE INDEX idx_users_city ON Users(city);
 CREATE INDEX idx_movies_title ON Movies(title);
@@ -102,4 +146,5 @@ CREATE INDEX idx_ratings_movie ON Ratings(movieId);
 CREATE INDEX idx_mg_genre ON MovieGenres(genre);
 
 CREATE INDEX idx_people_name ON People(name);
+CREATE INDEX idx_coactors_together ON CoActors(together);
 